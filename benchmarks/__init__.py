@@ -0,0 +1 @@
+"""Mesures de performance de l'application CoinAfrique"""
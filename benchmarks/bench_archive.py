@@ -0,0 +1,108 @@
+"""Archive historique : requête "30 derniers jours, une catégorie" selon la durée de l'historique
+
+Simule un scraping quotidien des quatre catégories (--rows annonces par
+catégorie et par jour, tirées d'un même stock d'annonces pour que les
+annonces reviennent d'un jour à l'autre) pendant --days jours, puis compare :
+
+- archive : ListingArchive.read sur la période (partitions de la catégorie
+  et des jours demandés seulement) ;
+- csv : un seul CSV qui grossit à chaque scraping, relu en entier puis
+  filtré (ce que donnerait un historique gardé dans les CSV de l'app).
+
+Le temps d'ajout d'un scraping (écriture des partitions et mise à jour des
+index first_seen / last_seen) est indiqué à part.
+
+Usage : python -m benchmarks.bench_archive [--days 30 90 365] [--rows 1000] [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from coinafrique.archive import TIME_COLUMN, ListingArchive, last_days
+from coinafrique.cleaning import clean_scraped_data
+from coinafrique.settings import URLS
+
+from .bench_pipeline import as_text, load_data, synthetic
+
+CATEGORY = 'Chaussures Homme'
+PERIOD_DAYS = 30
+
+
+def stock(rows):
+    """Annonces nettoyées de chaque catégorie (stock dans lequel chaque scraping puise)"""
+    data = clean_scraped_data(as_text(synthetic(load_data(), rows * 2 * len(URLS))))
+    names = np.resize(np.array(list(URLS), dtype=object), len(data))
+    return data.assign(categorie=pd.Categorical(names, categories=list(URLS)))
+
+
+def build_history(directory, listings, days, rows, today):
+    """Remplir une archive et un CSV cumulé avec days scrapings quotidiens"""
+    archive = ListingArchive(os.path.join(directory, 'archive'))
+    csv_path = os.path.join(directory, 'historique.csv')
+    rng = np.random.default_rng(0)
+    codes = listings['categorie'].cat.codes.to_numpy()
+    groups = [np.flatnonzero(codes == code) for code in range(len(URLS))]
+    append_times = []
+    for offset in range(days, 0, -1):
+        scraped_at = pd.Timestamp(today - timedelta(days=offset - 1)) + pd.Timedelta(hours=8)
+        scrape = listings.iloc[np.concatenate([
+            rng.choice(group, size=min(rows, len(group)), replace=False) for group in groups
+        ])]
+        start = time.perf_counter()
+        archive.append(scrape, scraped_at=scraped_at)
+        append_times.append(time.perf_counter() - start)
+        scrape.assign(**{TIME_COLUMN: scraped_at}).to_csv(
+            csv_path, mode='a', header=not os.path.exists(csv_path), index=False
+        )
+    return archive, csv_path, float(np.median(append_times))
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', nargs='+', type=int, default=[30, 90, 365])
+    parser.add_argument('--rows', type=int, default=1000, help='annonces par catégorie et par scraping')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if not ListingArchive().enabled:
+        raise SystemExit("pyarrow n'est pas installé : archive désactivée")
+
+    listings = stock(args.rows)
+    today = date.today()
+    start, end = last_days(PERIOD_DAYS, today)
+    for days in args.days:
+        with tempfile.TemporaryDirectory() as directory:
+            archive, csv_path, append_time = build_history(directory, listings, days, args.rows, today)
+            files = archive.partitions([CATEGORY], start, end)
+
+            def read_csv():
+                df = pd.read_csv(csv_path, parse_dates=[TIME_COLUMN])
+                in_period = df[TIME_COLUMN].dt.date.between(start, end) & (df['categorie'] == CATEGORY)
+                return df[in_period]
+
+            archive_time, result = best_time(lambda: archive.read([CATEGORY], start, end), args.repeat)
+            csv_time, expected = best_time(read_csv, args.repeat)
+            assert len(result) == len(expected), (len(result), len(expected))
+            csv_size = os.path.getsize(csv_path) / 1024 ** 2
+            print(f"{days} jours d'historique ({days * args.rows * len(URLS)} lignes, CSV {csv_size:.0f} Mo)")
+            print(f"  ajout d'un scraping {1000 * append_time:8.1f} ms")
+            print(f"  archive  {1000 * archive_time:8.1f} ms  ({len(files)} fichiers, {len(result)} lignes)")
+            print(f"  csv      {1000 * csv_time:8.1f} ms  (x{csv_time / archive_time:.1f})")
+
+
+if __name__ == '__main__':
+    main()
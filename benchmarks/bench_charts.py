@@ -0,0 +1,92 @@
+"""Taille et temps de préparation des graphiques de prix du dashboard
+
+Compare, pour des jeux de données de taille croissante, les figures d'origine
+(px.box et px.histogram sur tous les prix) et celles de charts.py (tous les
+prix jusqu'à DETAIL_MAX_ROWS, puis quartiles précalculés, points aberrants
+sous-échantillonnés en WebGL et histogramme à classes fixes).
+
+Mesures par jeu de données :
+- JSON envoyé au navigateur (fig.to_json(), ce que st.plotly_chart transmet) ;
+- temps de construction + sérialisation côté serveur.
+
+Le navigateur ne peut rien dessiner avant d'avoir reçu et décodé ce JSON :
+sa taille, avec le temps serveur, sert d'indicateur du délai de premier
+affichage (non mesurable ici sans navigateur).
+
+Le calcul des tables agrégées (summarize) est indiqué à part : il est fait
+une fois par version du jeu de données puis servi depuis le cache.
+
+Usage : python -m benchmarks.bench_charts [--sizes 1k data 10k 100k 1M] [--repeat 3]
+"""
+import argparse
+import time
+
+import plotly.express as px
+
+from coinafrique import charts
+from coinafrique.cleaning import clean_scraped_data
+from coinafrique.summary import summarize
+
+from .bench_pipeline import SIZES, as_text, load_data, synthetic
+
+CHART_SIZES = {'1k': 1_000, **SIZES}
+
+
+def legacy_figures(df):
+    """Graphiques de prix d'origine : tous les points envoyés au navigateur"""
+    prix_valides = df.dropna(subset=['prix_numerique'])
+    fig_box = px.box(prix_valides, x='categorie', y='prix_numerique', title='Distribution des prix par catégorie')
+    fig_hist = px.histogram(prix_valides, x='prix_numerique', nbins=30, title='Distribution des prix')
+    return [fig_box, fig_hist]
+
+
+def summary_figures(df, summary):
+    prices = df[['categorie', 'prix_numerique']] if charts.detailed_mode(summary) else None
+    return [charts.price_box(summary, prices), charts.price_histogram(summary)]
+
+
+def measure(build, repeat):
+    """(meilleur temps construction + sérialisation en s, taille JSON en octets, nombre de points)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        figures = build()
+        payloads = [fig.to_json() for fig in figures]
+        best = min(best, time.perf_counter() - start)
+    points = sum(
+        len(trace.y if trace.y is not None else trace.x if trace.x is not None else [])
+        for fig in figures for trace in fig.data
+    )
+    return best, sum(len(payload.encode('utf-8')) for payload in payloads), points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['1k', 'data', *SIZES], choices=['data', *CHART_SIZES])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = load_data()
+    for size in args.sizes:
+        df = data if size == 'data' else synthetic(data, CHART_SIZES[size])
+        cleaned = clean_scraped_data(as_text(df))
+        start = time.perf_counter()
+        summary = summarize(cleaned)
+        summary_time = time.perf_counter() - start
+
+        mode = 'détaillé' if charts.detailed_mode(summary) else 'agrégé'
+        print(f"{size} ({summary.price_count} prix, mode {mode}, summarize {1000 * summary_time:.0f} ms)")
+        results = {}
+        for label, build in (
+            ('origine', lambda: legacy_figures(cleaned)),
+            ('charts', lambda: summary_figures(cleaned, summary)),
+        ):
+            results[label] = measure(build, args.repeat)
+            elapsed, size_bytes, points = results[label]
+            print(f"  {label:<8} {1000 * elapsed:8.1f} ms  {size_bytes / 1024:10.1f} Ko  {points:>8} points")
+        (legacy_time, legacy_bytes, _), (new_time, new_bytes, _) = results['origine'], results['charts']
+        print(f"  gain : JSON x{legacy_bytes / new_bytes:.0f}, temps x{legacy_time / new_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
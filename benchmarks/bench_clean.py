@@ -0,0 +1,107 @@
+"""Comparer clean_scraped_data à l'implémentation d'origine sur les données fournies
+
+Usage : python -m benchmarks.bench_clean [--repeat 5] [--scale 10]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from coinafrique.address import LEVELS
+from coinafrique.cleaning import clean_scraped_data
+from coinafrique.loader import EXPORT_COLUMNS, sniff_format
+from coinafrique.schema import apply_schema
+
+from .fixtures import DATA_DIR
+
+def legacy_clean_scraped_data(df):
+    """Implémentation d'origine (référence pour les résultats et les temps, hors schéma typé)"""
+    if df.empty:
+        return df
+
+    df_clean = df.copy()
+
+    if 'prix' in df_clean.columns:
+        df_clean['prix_brut'] = df_clean['prix']
+        df_clean['prix_numerique'] = df_clean['prix'].str.replace(r'[^\d]', '', regex=True)
+        df_clean['prix_numerique'] = pd.to_numeric(df_clean['prix_numerique'], errors='coerce')
+        df_clean['a_prix'] = df_clean['prix_numerique'].notna()
+    else:
+        df_clean['prix_brut'] = "Inconnu"
+        df_clean['prix_numerique'] = np.nan
+        df_clean['a_prix'] = False
+
+    if 'adresse' in df_clean.columns:
+        df_clean['adresse'] = df_clean['adresse'].str.strip().str.title()
+    else:
+        df_clean['adresse'] = "Adresse inconnue"
+
+    if 'type' in df_clean.columns:
+        df_clean['type'] = df_clean['type'].str.strip().str.title()
+    else:
+        df_clean['type'] = "Type inconnu"
+
+    if 'image_lien' in df_clean.columns:
+        df_clean['a_image'] = df_clean['image_lien'] != "Image non disponible"
+    else:
+        df_clean['a_image'] = False
+
+    df_clean = df_clean.drop_duplicates(subset=['type', 'prix_brut', 'adresse'])
+
+    return df_clean
+
+
+def read_export(name):
+    """Lire un export Web Scraper brut, sans conversion au schéma typé"""
+    path = os.path.join(DATA_DIR, name)
+    fmt = sniff_format(path)
+    df = pd.read_csv(path, sep=fmt.sep, skiprows=fmt.skiprows, encoding='utf-8-sig')
+    df = df.rename(columns=EXPORT_COLUMNS)
+    return df[[column for column in ('type', 'prix', 'adresse', 'image_lien', 'lien_annonce') if column in df.columns]]
+
+
+def datasets(scale):
+    vetements = read_export('vetements_homme.csv')
+    chaussures = read_export('chaussures_hommes.csv')
+    scraped = pd.concat(
+        [pd.read_csv(os.path.join(DATA_DIR, name)) for name in os.listdir(DATA_DIR) if name.endswith('_raw.csv')],
+        ignore_index=True
+    )
+    merged = pd.concat([vetements, chaussures, scraped], ignore_index=True)
+    return {
+        'vetements_homme.csv': vetements,
+        'chaussures_hommes.csv': chaussures,
+        '*_raw.csv': scraped,
+        'fusion': merged,
+        f'fusion x{scale}': pd.concat([merged] * scale, ignore_index=True),
+    }
+
+
+def best_time(func, df, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=10)
+    args = parser.parse_args()
+
+    for name, df in datasets(args.scale).items():
+        legacy_time, expected = best_time(legacy_clean_scraped_data, df, args.repeat)
+        new_time, result = best_time(clean_scraped_data, df, args.repeat)
+        # Les colonnes quartier / ville / pays n'existent pas dans l'implémentation d'origine
+        pd.testing.assert_frame_equal(result.drop(columns=LEVELS), apply_schema(expected))
+        print(f"{name:<22} {len(df):>8} lignes : {1000 * legacy_time:8.1f} ms -> "
+              f"{1000 * new_time:7.1f} ms  x{legacy_time / new_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Détection des doublons sur des jeux fusionnés de taille croissante
+
+Les sources du dashboard combiné (exports et fichiers nettoyés de data/)
+sont fusionnées puis recopiées (prix, adresses et images décalés par copie
+pour que les copies restent des annonces distinctes). Une fraction des lignes est
+republiée avec un titre retouché et une nouvelle image : seules les
+signatures MinHash peuvent les retrouver. Le temps par ligne doit rester
+à peu près constant quand la taille augmente.
+
+Usage : python -m benchmarks.bench_dedup [--scales 1 4 16 32] [--republished 0.1]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from coinafrique.cleaning import clean_scraped_data
+from coinafrique.dedup import find_duplicates
+from coinafrique.loader import read_listings
+from coinafrique.schema import concat_listings
+
+from .fixtures import DATA_DIR
+
+
+def load_merged():
+    frames = [
+        read_listings(os.path.join(DATA_DIR, name))
+        for name in sorted(os.listdir(DATA_DIR)) if name.endswith('.csv') and not name.endswith('_raw.csv')
+    ]
+    return clean_scraped_data(concat_listings(frames)).reset_index(drop=True)
+
+
+def retouch(titles, rng):
+    """Variantes de titres : pluriel, casse, espace ou mot ajouté"""
+    edits = [
+        lambda title: title + 's',
+        lambda title: title.upper(),
+        lambda title: title.replace(' ', '  ', 1),
+        lambda title: title + ' neuf',
+    ]
+    choices = rng.integers(len(edits), size=len(titles))
+    return [edits[choice](title) for title, choice in zip(titles, choices)]
+
+
+def build_dataset(base, scale, republished, rng):
+    copies = []
+    for copy in range(scale):
+        df = base.copy()
+        df['prix_numerique'] = df['prix_numerique'] + copy
+        df['adresse'] = df['adresse'].astype(str) + f' #{copy}'
+        # Nouveaux ID d'image et d'annonce
+        for column in ('image_lien', 'lien_annonce'):
+            df[column] = df[column].str.replace(r'(thumb_|-)(\d+)', rf'\g<1>{copy}0\2', regex=True)
+        copies.append(df)
+    df = pd.concat(copies, ignore_index=True)
+
+    picked = rng.choice(len(df), size=int(len(df) * republished), replace=False)
+    reposts = df.iloc[picked].copy()
+    reposts['type'] = retouch(reposts['type'].astype(str).tolist(), rng)
+    for column in ('image_lien', 'lien_annonce'):
+        reposts[column] = reposts[column].str.replace(r'(thumb_|-)(\d+)', r'\g<1>9\2', regex=True)
+    return pd.concat([df, reposts], ignore_index=True), picked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--republished', type=float, default=0.1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = load_merged()
+    for scale in args.scales:
+        df, picked = build_dataset(base, scale, args.republished, rng)
+        injected = len(picked)
+        start = time.perf_counter()
+        exact = find_duplicates(df, near=False)
+        exact_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = find_duplicates(df)
+        total_time = time.perf_counter() - start
+        # Republications retrouvées : rattachées au groupe de l'annonce d'origine
+        labels = result.labels
+        found = int((labels[len(df) - injected:] == labels[picked]).sum())
+        print(f"{len(df):>8} lignes : exacts {exact_time:6.2f} s, exacts + quasi {total_time:6.2f} s "
+              f"({1e6 * total_time / len(df):5.1f} µs/ligne), {len(result.clusters)} groupes, "
+              f"{len(df) - int(result.keep.sum())} retirées ({len(df) - int(exact.keep.sum())} par clé exacte), "
+              f"republications retrouvées {found}/{injected}")
+
+
+if __name__ == '__main__':
+    main()
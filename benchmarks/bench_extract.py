@@ -0,0 +1,41 @@
+"""Comparer les moteurs d'extraction ad__card sur les pages de test
+
+Usage : python -m benchmarks.bench_extract [--repeat 5]
+"""
+import argparse
+import time
+
+from coinafrique.extract import EXTRACTORS
+
+from .fixtures import build_pages
+
+REFERENCE = 'html.parser'
+
+
+def time_extractor(extract, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        records = [record for html in pages for record in extract(html, 'Fixtures')]
+        best = min(best, time.perf_counter() - start)
+    return best, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = build_pages()
+    reference_time, reference = time_extractor(EXTRACTORS[REFERENCE], pages, args.repeat)
+    print(f"{len(pages)} pages, {len(reference)} annonces (meilleur de {args.repeat})")
+
+    for name, extract in EXTRACTORS.items():
+        elapsed, records = (reference_time, reference) if name == REFERENCE else \
+            time_extractor(extract, pages, args.repeat)
+        assert records == reference, f"{name} ne produit pas les mêmes annonces que {REFERENCE}"
+        print(f"{name:<12} : {1000 * elapsed / len(pages):7.2f} ms/page  x{reference_time / elapsed:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Comparer le scraping séquentiel et concurrent sur un serveur local
+
+Usage : python -m benchmarks.bench_fetch [--pages 20] [--latency 0.2] [--workers 8]
+"""
+import argparse
+import time
+
+from coinafrique.scraper import scrape_category
+
+from .fixtures import FixtureServer, build_pages
+
+
+def run(url, pages, workers, rate):
+    start = time.perf_counter()
+    data, errors = scrape_category(url, 'Fixtures', pages, workers=workers, rate=rate)
+    return time.perf_counter() - start, data, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.2, help="latence simulée par requête (s)")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=0, help="requêtes/s par hôte (0 = illimité)")
+    args = parser.parse_args()
+
+    with FixtureServer(build_pages(args.pages), latency=args.latency) as server:
+        seq_time, seq_data, seq_errors = run(server.url, args.pages, 1, args.rate)
+        conc_time, conc_data, conc_errors = run(server.url, args.pages, args.workers, args.rate)
+
+    assert not seq_errors and not conc_errors, (seq_errors, conc_errors)
+    assert conc_data == seq_data, "les annonces doivent rester dans l'ordre des pages"
+
+    print(f"{args.pages} pages, {len(seq_data)} annonces, latence {args.latency}s")
+    print(f"séquentiel (1 requête)      : {seq_time:7.2f} s")
+    print(f"concurrent ({args.workers} requêtes)    : {conc_time:7.2f} s")
+    print(f"accélération                : x{seq_time / conc_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
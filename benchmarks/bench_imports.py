@@ -0,0 +1,179 @@
+"""Temps d'import au démarrage de l'application et de la ligne de commande
+
+Chaque cible est importée dans un interpréteur neuf lancé avec
+-X importtime ; le temps retenu est la somme des temps propres ("self")
+des modules importés, meilleur résultat sur --repeat lancements.
+
+Cibles :
+- app : imports de premier niveau de projet3-app-zagre.py (extraits du
+  script sans l'exécuter), payés au premier chargement de la page ;
+- app+vues : imports différés dans les fonctions des vues (scraping,
+  graphiques, doublons), mesurés en plus des précédents ;
+- cli : python -m coinafrique.
+
+Certains modules ne doivent pas être chargés par une cible (FORBIDDEN) :
+seaborn, matplotlib, scipy, requests ou BeautifulSoup au démarrage de
+l'application, streamlit et plotly pour la ligne de commande. Cette
+vérification est aussi un test (tests/test_imports.py).
+
+Les résultats sont comparés à benchmarks/import_baseline.json. Les temps
+d'import sont bruités (cache disque, machine partagée) : un temps n'est
+une régression qu'au-delà de la tolérance et de MIN_TIME_DELTA, alors que
+le nombre de modules importés, déterministe, l'est dès qu'il dépasse la
+référence de plus de MODULE_TOLERANCE. Une régression ou un module
+interdit donne un code de sortie 1.
+
+Usage : python -m benchmarks.bench_imports [--targets app app+vues cli] [--repeat 5]
+        [--tolerance 0.5] [--top 10] [--save-baseline]
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+from .bench_pipeline import environment, load_baseline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'projet3-app-zagre.py')
+BASELINE = os.path.join(os.path.dirname(__file__), 'import_baseline.json')
+TARGETS = ['app', 'app+vues', 'cli']
+MARKER = '--- bench_imports ---'
+# Écart absolu (s) en dessous duquel une différence de temps d'import est du bruit
+MIN_TIME_DELTA = 0.1
+MODULE_TOLERANCE = 0.1
+
+FORBIDDEN = {
+    'app': ['seaborn', 'matplotlib', 'scipy', 'requests', 'bs4', 'lxml', 'plotly.express'],
+    'cli': ['streamlit', 'plotly', 'seaborn', 'matplotlib'],
+}
+
+
+def app_imports():
+    """Instructions d'import du script : (premier niveau, différées dans les fonctions)"""
+    with open(APP, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    top_level = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    nested = [
+        node for node in ast.walk(tree)
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and node not in top_level
+    ]
+    return [ast.unparse(node) for node in top_level], sorted({ast.unparse(node) for node in nested})
+
+
+def target_code(target):
+    """(imports non mesurés, imports mesurés) d'une cible"""
+    top_level, nested = app_imports()
+    if target == 'app':
+        return [], top_level
+    if target == 'app+vues':
+        return top_level, nested
+    if target == 'cli':
+        return [], ['import coinafrique.cli']
+    raise ValueError(f"Cible inconnue : {target}")
+
+
+def parse_importtime(stderr):
+    """Modules importés après le marqueur : liste de (module, self µs, cumul µs, profondeur)"""
+    modules = []
+    measuring = False
+    for line in stderr.splitlines():
+        if line == MARKER:
+            measuring = True
+            continue
+        if not measuring or not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        # "import time:   self |   cumul |   paquet.module" (2 espaces par niveau d'imbrication)
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def run_target(target):
+    """Un lancement : (temps d'import en s, modules importés, modules chargés au total)"""
+    setup, measured = target_code(target)
+    code = '\n'.join([
+        'import json, sys',
+        *setup,
+        f"sys.stderr.write({MARKER!r} + '\\n'); sys.stderr.flush()",
+        *measured,
+        'print(json.dumps(sorted(sys.modules)))',
+    ])
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, encoding='utf-8'
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{target} : échec de l'import\n{result.stderr[-2000:]}")
+    modules = parse_importtime(result.stderr)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return sum(self_us for _, self_us, _, _ in modules) / 1e6, modules, loaded
+
+
+def forbidden_modules(target, loaded):
+    """Modules de FORBIDDEN[target] chargés (sous-modules compris)"""
+    prefixes = FORBIDDEN.get(target, [])
+    return sorted({
+        prefix for prefix in prefixes
+        for name in loaded if name == prefix or name.startswith(prefix + '.')
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--targets', nargs='+', default=TARGETS, choices=TARGETS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    parser.add_argument('--top', type=int, default=10, help='modules les plus lents affichés')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None and not args.save_baseline:
+        print(f"Pas de référence ({args.baseline}) : lancer avec --save-baseline pour en créer une")
+    reference = (baseline or {}).get('results', {})
+
+    results = {}
+    regressions = []
+    for target in args.targets:
+        runs = [run_target(target) for _ in range(args.repeat)]
+        elapsed, modules, loaded = min(runs, key=lambda run: run[0])
+        results[target] = {'time': elapsed, 'modules': len(modules)}
+
+        text = ''
+        ref = reference.get(target)
+        if ref is not None:
+            ratio = elapsed / ref['time'] if ref['time'] else 1.0
+            slower = ratio > 1 + args.tolerance and elapsed - ref['time'] > MIN_TIME_DELTA
+            heavier = len(modules) > ref['modules'] * (1 + MODULE_TOLERANCE)
+            flag = ' << RÉGRESSION' if slower or heavier else ''
+            text = f"  temps x{ratio:.2f}, modules {len(modules) - ref['modules']:+d}{flag}"
+            if slower or heavier:
+                regressions.append(target)
+        print(f"{target:<9} {1000 * elapsed:8.1f} ms  {len(modules):>5} modules{text}")
+
+        forbidden = forbidden_modules(target, loaded)
+        if forbidden:
+            print(f"  modules interdits chargés : {', '.join(forbidden)} << RÉGRESSION")
+            regressions.append(f"{target} (modules)")
+
+        top = sorted((m for m in modules if m[3] == 0), key=lambda m: m[2], reverse=True)[:args.top]
+        for name, _, cumulative_us, _ in top:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if args.save_baseline:
+        merged = {**reference, **results}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': merged}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Référence enregistrée : {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} régression(s) : {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
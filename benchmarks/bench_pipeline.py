@@ -0,0 +1,228 @@
+"""Temps et mémoire des étapes du pipeline scraping -> nettoyage -> chargement -> dashboard
+
+Étapes mesurées :
+- extract : analyse des pages ad__card de test (moteur d'extraction par défaut),
+  limitée aux EXTRACT_MAX_ROWS premières annonces
+- clean : clean_scraped_data
+- load_csv : chargement d'un CSV comme load_data_from_csv, copie binaire absente
+  (lecture par blocs du CSV puis écriture de la copie Feather)
+- load_feather : même chargement, copie binaire à jour
+- concat : fusion de quatre fichiers chargés (concat_listings)
+- dashboard : agrégats du dashboard (summarize, ListingIndex, PriceStats)
+
+Jeux de données : les fichiers de data/ fusionnés ("data") et des jeux
+synthétiques de 10k / 100k / 1M lignes tirés des annonces réelles (titres
+et images rendus distincts). Pour chaque étape : meilleur temps sur
+--repeat exécutions, puis pic mémoire Python (tracemalloc) sur une
+exécution séparée.
+
+Les résultats sont comparés à benchmarks/baseline.json : une étape plus
+lente ou plus gourmande que la référence au-delà de la tolérance est
+signalée et le code de sortie vaut 1. --save-baseline enregistre les
+mesures comme nouvelle référence (à refaire sur la machine de déploiement).
+
+Usage : python -m benchmarks.bench_pipeline [--sizes data 10k 100k 1M] [--stages clean dashboard]
+        [--repeat 3] [--tolerance 0.25] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from coinafrique.cleaning import clean_scraped_data
+from coinafrique.extract import get_extractor
+from coinafrique.index import ListingIndex
+from coinafrique.loader import LISTING_COLUMNS, read_listings
+from coinafrique.schema import concat_listings
+from coinafrique.stats import PriceStats
+from coinafrique.store import DatasetStore
+from coinafrique.summary import summarize
+
+from .fixtures import CARDS_PER_PAGE, DATA_DIR, render_page
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+SIZES = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+STAGES = ['extract', 'clean', 'load_csv', 'load_feather', 'concat', 'dashboard']
+# Écart absolu en dessous duquel une différence de temps est du bruit de mesure
+MIN_TIME_DELTA = 0.02
+# Rendu et analyse HTML : ~0.1 ms par annonce, 1M lignes prendraient plusieurs minutes
+EXTRACT_MAX_ROWS = 100_000
+
+
+def load_data():
+    """Annonces brutes de tous les CSV de data/ (exports et fichiers scrapés)"""
+    frames = [
+        read_listings(os.path.join(DATA_DIR, name))
+        for name in sorted(os.listdir(DATA_DIR)) if name.endswith('.csv')
+    ]
+    df = concat_listings(frames)
+    return df[[column for column in LISTING_COLUMNS if column in df.columns]].reset_index(drop=True)
+
+
+def synthetic(data, rows, seed=0):
+    """Jeu de rows annonces tirées des annonces réelles, titres et images distincts"""
+    rng = np.random.default_rng(seed)
+    df = data.iloc[rng.integers(len(data), size=rows)].reset_index(drop=True)
+    variant = rng.integers(max(rows // 10, 1), size=rows).astype(str)
+    df['type'] = df['type'].astype(str) + ' ' + variant
+    df['image_lien'] = [f"https://images.coinafrique.com/thumb_{i}_uploaded_image1.jpg" for i in range(rows)]
+    return df
+
+
+def datasets(sizes):
+    data = load_data()
+    for size in sizes:
+        yield size, data if size == 'data' else synthetic(data, SIZES[size])
+
+
+def as_text(df):
+    """Colonnes catégorielles remises en texte, comme à la sortie du scraping"""
+    return df.astype({column: str for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)})
+
+
+def build_pages(df):
+    rows = as_text(df).fillna('').to_dict('records')
+    return [
+        render_page(rows[start:start + CARDS_PER_PAGE], page=start // CARDS_PER_PAGE + 1)
+        for start in range(0, len(rows), CARDS_PER_PAGE)
+    ]
+
+
+def prepare(stage, df, workdir):
+    """Entrées d'une étape (non mesurées) : retourne la fonction à mesurer"""
+    if stage == 'extract':
+        pages = build_pages(df.iloc[:EXTRACT_MAX_ROWS])
+        extract = get_extractor()
+        return lambda: [record for html in pages for record in extract(html, 'Benchmark')]
+
+    if stage == 'clean':
+        raw = as_text(df)
+        return lambda: clean_scraped_data(raw)
+
+    if stage in ('load_csv', 'load_feather', 'concat'):
+        paths = []
+        for part, chunk in enumerate(np.array_split(np.arange(len(df)), 4)):
+            path = os.path.join(workdir, f"part{part}.csv")
+            as_text(df.iloc[chunk]).to_csv(path, index=False)
+            paths.append(path)
+        store = DatasetStore(os.path.join(workdir, '.store'))
+        if stage == 'load_csv':
+            def load_cold():
+                for path in paths:
+                    store.invalidate(path)
+                return [store.load(path) for path in paths]
+            return load_cold
+        frames = [store.load(path) for path in paths]
+        if stage == 'load_feather':
+            return lambda: [store.load(path) for path in paths]
+        return lambda: concat_listings(frames)
+
+    if stage == 'dashboard':
+        cleaned = clean_scraped_data(as_text(df))
+
+        def aggregate():
+            stats = PriceStats()
+            stats.update(cleaned)
+            return summarize(cleaned), ListingIndex(cleaned), stats.metrics()
+        return aggregate
+
+    raise ValueError(f"Étape inconnue : {stage}")
+
+
+def measure(func, repeat):
+    """(meilleur temps en s, pic mémoire Python en octets)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compare(result, reference, tolerance):
+    """Écarts à la référence d'une mesure : texte à afficher et régression ou non"""
+    if reference is None:
+        return '', False
+    time_ratio = result['time'] / reference['time'] if reference['time'] else 1.0
+    memory_ratio = result['memory'] / reference['memory'] if reference['memory'] else 1.0
+    slower = time_ratio > 1 + tolerance and result['time'] - reference['time'] > MIN_TIME_DELTA
+    heavier = memory_ratio > 1 + tolerance
+    flag = ' << RÉGRESSION' if slower or heavier else ''
+    return f"  temps x{time_ratio:.2f}, mémoire x{memory_ratio:.2f}{flag}", slower or heavier
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['data', *SIZES], choices=['data', *SIZES])
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None and not args.save_baseline:
+        print(f"Pas de référence ({args.baseline}) : lancer avec --save-baseline pour en créer une")
+    reference = (baseline or {}).get('results', {})
+
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size, df in datasets(args.sizes):
+            print(f"{size} ({len(df)} lignes)")
+            for stage in args.stages:
+                elapsed, peak = measure(prepare(stage, df, workdir), args.repeat)
+                key = f"{size}/{stage}"
+                rows = min(len(df), EXTRACT_MAX_ROWS) if stage == 'extract' else len(df)
+                results[key] = {'rows': rows, 'time': elapsed, 'memory': peak}
+                text, regressed = compare(results[key], reference.get(key), args.tolerance)
+                if regressed:
+                    regressions.append(key)
+                print(f"  {stage:<13} {1000 * elapsed:9.1f} ms  {peak / 1024 ** 2:8.1f} Mo  {rows:>8} lignes{text}")
+
+    if args.save_baseline:
+        merged = {**reference, **results}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': merged}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Référence enregistrée : {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} régression(s) : {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
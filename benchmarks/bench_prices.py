@@ -0,0 +1,75 @@
+"""Analyse des prix : exactitude sur la table de prix réels et temps d'exécution
+
+price_fixtures.csv contient tous les prix distincts des CSV de data/ et des
+variantes de format (fourchettes, k / mille, décimales, euros, "sur
+demande", tailles et quantités devant un prix, mesures) avec le prix
+attendu en FCFA (vide : pas de prix).
+
+Usage : python -m benchmarks.bench_prices [--repeat 5] [--rows 1000000]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from coinafrique.prices import parse_prices
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'price_fixtures.csv')
+
+
+def legacy_parse_prices(series):
+    """Implémentation d'origine : tous les chiffres de la chaîne mis bout à bout"""
+    return pd.to_numeric(series.str.replace(r'[^\d]', '', regex=True), errors='coerce')
+
+
+def load_fixtures():
+    fixtures = pd.read_csv(FIXTURES, dtype=str, keep_default_na=False, encoding='utf-8')
+    fixtures['attendu'] = pd.to_numeric(fixtures['attendu']).astype('Int64')
+    return fixtures
+
+
+def accuracy(parsed, expected):
+    parsed = pd.Series(parsed).astype('Float64').round()
+    expected = expected.astype('Float64')
+    same = (parsed == expected).fillna(False) | (parsed.isna() & expected.isna())
+    return same.to_numpy(dtype=bool)
+
+
+def best_time(func, series, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(series)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    for label, func in (('origine', legacy_parse_prices), ('prices', parse_prices)):
+        correct = accuracy(func(fixtures['prix']), fixtures['attendu'])
+        by_source = pd.Series(correct).groupby(fixtures['source'] == 'variante').mean()
+        print(f"{label:<8} exacts : {correct.sum()}/{len(correct)} "
+              f"(prix réels {by_source.get(False, np.nan):.0%}, variantes {by_source.get(True, np.nan):.0%})")
+        if label == 'prices':
+            for row in fixtures[~correct].itertuples():
+                print(f"  échec : {row.prix!r} -> attendu {row.attendu}")
+
+    # Colonne de prix à la distribution des données : les prix réels reviennent très souvent
+    rng = np.random.default_rng(0)
+    series = pd.Series(fixtures['prix'].to_numpy()[rng.integers(len(fixtures), size=args.rows)])
+    legacy_time = best_time(legacy_parse_prices, series, args.repeat)
+    new_time = best_time(parse_prices, series, args.repeat)
+    print(f"{len(series)} lignes : origine {1000 * legacy_time:.1f} ms, prices {1000 * new_time:.1f} ms "
+          f"(x{legacy_time / new_time:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Mémoire et temps value_counts / nunique : colonnes texte vs schéma typé
+
+Usage : python -m benchmarks.bench_schema [--repeat 5] [--scale 50]
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from coinafrique.schema import CATEGORY_COLUMNS, apply_schema, concat_listings
+
+from .fixtures import DATA_DIR
+
+
+def load_cleaned(typed):
+    """Charger les fichiers *_cleaned.csv comme le dashboard (un fichier par catégorie)"""
+    frames = []
+    for name in sorted(os.listdir(DATA_DIR)):
+        if name.endswith('_cleaned.csv'):
+            df = pd.read_csv(os.path.join(DATA_DIR, name), encoding='utf-8')
+            frames.append(apply_schema(df) if typed else df)
+    return concat_listings(frames) if typed else pd.concat(frames, ignore_index=True)
+
+
+def dashboard_counts(df):
+    # Les *_cleaned.csv antérieurs au découpage des adresses n'ont pas quartier / ville / pays
+    for column in [column for column in CATEGORY_COLUMNS if column in df.columns]:
+        df[column].nunique()
+        df[column].value_counts().head(10)
+
+
+def best_time(func, df, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=50)
+    args = parser.parse_args()
+
+    results = {}
+    for label, typed in (('texte', False), ('typé', True)):
+        df = load_cleaned(typed)
+        if typed:
+            df = concat_listings([df] * args.scale)
+        else:
+            df = pd.concat([df] * args.scale, ignore_index=True)
+        memory = df.memory_usage(deep=True).sum() / 1024 ** 2
+        results[label] = (memory, best_time(dashboard_counts, df, args.repeat))
+        print(f"{label:<6} {len(df):>8} lignes : {memory:7.1f} Mo, "
+              f"value_counts/nunique {1000 * results[label][1]:7.1f} ms")
+
+    (memory_before, time_before), (memory_after, time_after) = results['texte'], results['typé']
+    print(f"gain : mémoire x{memory_before / memory_after:.1f}, comptages x{time_before / time_after:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Temps de chargement des fichiers de data/ : analyse CSV vs copie binaire mappée
+
+Usage : python -m benchmarks.bench_store [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from coinafrique.loader import read_listings
+from coinafrique.store import DatasetStore
+
+from .fixtures import DATA_DIR
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = DatasetStore(directory)
+        if not store.enabled:
+            raise SystemExit("pyarrow n'est pas installé : stockage binaire désactivé")
+
+        total_csv = total_store = 0
+        for name in sorted(os.listdir(DATA_DIR)):
+            path = os.path.join(DATA_DIR, name)
+            if not name.endswith('.csv'):
+                continue
+            try:
+                csv_time, expected = best_time(lambda: read_listings(path), args.repeat)
+            except pd.errors.ParserError:
+                continue
+            build_start = time.perf_counter()
+            store.load(path)
+            build_time = time.perf_counter() - build_start
+            store_time, result = best_time(lambda: store.load(path), args.repeat)
+            pd.testing.assert_frame_equal(result, expected)
+            total_csv += csv_time
+            total_store += store_time
+            print(f"{name:<32} {len(expected):>6} lignes : CSV {1000 * csv_time:7.1f} ms, "
+                  f"construction {1000 * build_time:7.1f} ms, binaire {1000 * store_time:6.1f} ms")
+        print(f"{'total':<32} {'':>6}          CSV {1000 * total_csv:7.1f} ms -> binaire "
+              f"{1000 * total_store:6.1f} ms  x{total_csv / total_store:.1f}")
+
+
+if __name__ == '__main__':
+    main()
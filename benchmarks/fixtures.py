@@ -0,0 +1,146 @@
+"""Pages ad__card de test construites à partir des CSV bruts de data/"""
+import csv
+import hashlib
+import html
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+RAW_FILES = [
+    'chaussures_homme_raw.csv',
+    'vetements_enfants_raw.csv',
+    'chaussures_enfants_raw.csv',
+]
+CARDS_PER_PAGE = 84
+
+CARD_TEMPLATE = """
+<div class="col s6 m4 l3">
+  <div class="card ad__card round small hoverable">
+    <div class="card-image ad__card-image waves-block waves-light">
+      <a href="/annonce/{slug}" class="card-image ad__card-image waves-block waves-light">
+        <img class="ad__card-img" src="{image}" alt="{type}">
+      </a>
+    </div>
+    <div class="card-content ad__card-content">
+      <p class="ad__card-price"><a href="/annonce/{slug}">{prix}</a></p>
+      <p class="ad__card-description"><a href="/annonce/{slug}">{type}</a></p>
+      <p class="ad__card-location">
+        <i class="material-icons">location_on</i>
+        <span class="valign-wrapper">{adresse}</span>
+      </p>
+    </div>
+  </div>
+</div>"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+  <meta charset="utf-8">
+  <title>{title} | CoinAfrique Sénégal</title>
+  <link rel="stylesheet" href="/static/css/app.css">
+  <script>window.__STATE__ = {{"page": {page}, "category": "{title}"}};</script>
+</head>
+<body>
+  <nav class="navbar"><ul>{menu}</ul></nav>
+  <div class="container"><div class="row adcard__listing">{cards}</div></div>
+  <footer class="page-footer">{menu}</footer>
+</body>
+</html>"""
+
+MENU = ''.join(f'<li><a href="/categorie/rubrique-{i}">Rubrique {i}</a></li>' for i in range(60))
+
+
+def load_raw_rows():
+    """Lire les annonces brutes fournies avec le dépôt"""
+    rows = []
+    for name in RAW_FILES:
+        with open(os.path.join(DATA_DIR, name), encoding='utf-8') as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def render_page(rows, page=1, title='Annonces'):
+    """Rendre une page HTML contenant une carte ad__card par annonce"""
+    cards = []
+    for i, row in enumerate(rows):
+        cards.append(CARD_TEMPLATE.format(
+            slug=f"annonce-{page}-{i}",
+            image=html.escape(row['image_lien']),
+            prix=html.escape(row['prix']),
+            type=html.escape(row['type']),
+            adresse=html.escape(row['adresse']),
+        ))
+    return PAGE_TEMPLATE.format(title=html.escape(title), page=page, menu=MENU, cards=''.join(cards))
+
+
+def build_pages(count=None, per_page=CARDS_PER_PAGE):
+    """Construire les pages de test (toutes les annonces brutes par défaut)"""
+    rows = load_raw_rows()
+    if count is None:
+        count = -(-len(rows) // per_page)
+    pages = []
+    for page in range(count):
+        start = (page * per_page) % len(rows)
+        chunk = (rows[start:] + rows[:start])[:per_page]
+        pages.append(render_page(chunk, page=page + 1))
+    return pages
+
+
+class FixtureServer:
+    """Serveur HTTP local servant les pages de test avec une latence simulée"""
+
+    LAST_MODIFIED = 'Wed, 16 Jul 2025 12:00:00 GMT'
+
+    def __init__(self, pages, latency=0.0):
+        self.pages = pages
+        self.latency = latency
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query)
+                page = int(query.get('page', ['1'])[0])
+                server.requests.append((page, self.headers.get('If-None-Match')))
+                if server.latency:
+                    time.sleep(server.latency)
+                if not 1 <= page <= len(server.pages):
+                    self.send_error(404)
+                    return
+                body = server.pages[page - 1].encode('utf-8')
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', server.LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/categorie/fixtures"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
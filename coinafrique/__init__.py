@@ -0,0 +1 @@
+"""Briques réutilisables de l'application d'analyse et de scraping CoinAfrique"""
@@ -0,0 +1,6 @@
+"""Point d'entrée : python -m coinafrique (voir coinafrique.cli)"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
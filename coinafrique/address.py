@@ -0,0 +1,140 @@
+"""Découpage des adresses en quartier / ville / pays
+
+Les adresses CoinAfrique vont du général au particulier à rebours :
+"Grand Dakar, Dakar, Sénégal", "Pikine, Sénégal" ou simplement "Sénégal".
+Chaque adresse distincte est analysée une seule fois (parse_address est
+mémoïsé, et address_levels ne l'appelle que sur les valeurs distinctes de
+la colonne), puis les niveaux sont redistribués aux lignes sous forme de
+colonnes catégorielles.
+
+Les variantes d'écriture d'un même lieu (accents, tirets, apostrophes,
+"Parcelle Assainies" / "Les Parcelles Assainies") sont ramenées à un seul
+nom : table de variantes connues, puis, pour les autres, orthographe la
+plus fréquente parmi celles qui partagent la même forme sans accents.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+LEVELS = ['quartier', 'ville', 'pays']
+LEVEL_LABELS = {'quartier': 'Quartier', 'ville': 'Ville', 'pays': 'Pays'}
+LEVEL_PLURALS = {'quartier': 'Quartiers', 'ville': 'Villes', 'pays': 'Pays'}
+
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+PARENT_RE = re.compile(r'^(.*?)\s*\(([^)]*)\)\s*$')
+
+# Adresses absentes (valeurs par défaut du scraping et du nettoyage)
+UNKNOWN_ADDRESSES = {'adresse non specifiee', 'adresse inconnue', 'nan', 'none'}
+COUNTRIES = {'senegal', 'benin', 'mali', 'cote d ivoire', 'guinee', 'burkina faso', 'togo', 'cameroun', 'gabon'}
+
+# Forme sans accents -> nom retenu
+PLACE_NAMES = {
+    'senegal': 'Sénégal',
+    'benin': 'Bénin',
+    'thies': 'Thiès',
+    'guediawaye': 'Guédiawaye',
+    'medina': 'Médina',
+    'kedougou': 'Kédougou',
+    'kebemer': 'Kébémer',
+    'camberene': 'Cambérène',
+    'saint louis': 'Saint-Louis',
+    'm bour': 'Mbour',
+    'mbour': 'Mbour',
+    'mbacke': 'Mbacké',
+    'goree': 'Gorée',
+    'dakar plateau': 'Dakar-Plateau',
+    'parcelle assainies': 'Parcelles Assainies',
+    'parcelles assainies': 'Parcelles Assainies',
+    'les parcelles assainies': 'Parcelles Assainies',
+    'geule tapee': 'Gueule Tapée',
+    'gueule tapee': 'Gueule Tapée',
+    'mermoz sacre coeur': 'Mermoz-Sacré-Cœur',
+    'sacre coeur': 'Sacré-Cœur',
+    'sicap liberte': 'Sicap-Liberté',
+    'hann bel air': 'Hann Bel-Air',
+    'ngor dakar': 'Dakar',
+}
+
+
+@lru_cache(maxsize=4096)
+def place_key(name):
+    """Forme de comparaison d'un nom de lieu : minuscules, sans accents ni ponctuation"""
+    text = unicodedata.normalize('NFKD', str(name).lower().replace('œ', 'oe'))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return NON_ALNUM_RE.sub(' ', text).strip()
+
+
+def place_name(name):
+    """Nom de lieu retenu pour une variante d'écriture"""
+    return PLACE_NAMES.get(place_key(name)) or ' '.join(str(name).split()).title()
+
+
+@lru_cache(maxsize=4096)
+def parse_address(raw):
+    """(quartier, ville, pays) d'une adresse brute, None pour un niveau absent
+
+    "Sam Notaire (Guédiawaye)" désigne le quartier Sam Notaire de la ville
+    indiquée entre parenthèses.
+    """
+    parts = [part.strip() for part in str(raw).split(',') if part.strip()]
+    if not parts or place_key(', '.join(parts)) in UNKNOWN_ADDRESSES:
+        return None, None, None
+
+    country = None
+    if len(parts) > 1 or place_key(parts[-1]) in COUNTRIES:
+        country = place_name(parts.pop())
+
+    district = city = None
+    if parts:
+        match = PARENT_RE.match(parts[-1])
+        if match and match.group(2).strip():
+            district, city = match.group(1), match.group(2)
+        else:
+            city = parts[-1]
+            if len(parts) > 1:
+                district = parts[-2]
+    district = place_name(district) if district else None
+    city = place_name(city) if city else None
+    if district is not None and place_key(district) == place_key(city):
+        district = None
+    return district, city, country
+
+
+def _codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Index(uniques)
+
+
+def address_levels(series):
+    """Colonnes catégorielles quartier / ville / pays d'une colonne d'adresses"""
+    codes, uniques = _codes(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    parsed = [parse_address(value) for value in uniques]
+
+    levels = {}
+    for position, level in enumerate(LEVELS):
+        names = [levels_of_value[position] for levels_of_value in parsed]
+
+        # Orthographe la plus fréquente parmi les noms de même forme sans accents
+        weights = {}
+        for name, count in zip(names, counts):
+            if name is not None:
+                weights[name] = weights.get(name, 0) + int(count)
+        spelling = {}
+        for name, _ in sorted(weights.items(), key=lambda item: (-item[1], item[0])):
+            spelling.setdefault(place_key(name), name)
+        names = [spelling[place_key(name)] if name is not None else None for name in names]
+
+        categories = sorted({name for name in names if name is not None})
+        position_of = {name: position for position, name in enumerate(categories)}
+        level_codes = np.array([position_of.get(name, -1) for name in names] + [-1], dtype=np.intp)
+        values = pd.Categorical.from_codes(
+            level_codes[codes], categories=pd.Index(categories, dtype=object).astype(str)
+        )
+        levels[level] = pd.Series(values, index=series.index, name=level)
+    return levels
@@ -0,0 +1,288 @@
+"""Archive historique des annonces, partitionnée par catégorie et par date
+
+Chaque scraping ajoute un fichier Parquet dans
+data/archive/categorie=<prefixe>/date=<AAAA-MM-JJ>/ ; les fichiers existants
+ne sont jamais réécrits. C'est le lot complet qui est archivé, y compris en
+mode incrémental les annonces déjà connues (non réécrites dans les CSV).
+Chaque ligne porte la clé stable de l'annonce (seen.listing_key, colonne
+cle) et l'instant du scraping (scraped_at).
+
+Un index par catégorie (categorie=<prefixe>/listings.parquet) donne pour
+chaque annonce first_seen, last_seen et le nombre de scrapings où elle a
+été vue. Il est dérivé des partitions : réécrit (atomiquement) à chaque
+ajout, il peut être reconstruit avec rebuild_index.
+
+Une requête ("30 derniers jours, Chaussures Homme") ne lit que les
+partitions des catégories et des dates demandées : son coût dépend de la
+période, pas de la taille de l'historique. Sans pyarrow, l'archive est
+désactivée.
+"""
+import os
+import re
+import threading
+import unicodedata
+import uuid
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .schema import apply_schema, concat_listings
+from .seen import listing_key
+from .settings import FILE_PREFIXES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow est optionnel
+    pa = pq = None
+
+ARCHIVE_DIR = os.path.join('data', 'archive')
+INDEX_FILE = 'listings.parquet'
+KEY_COLUMN = 'cle'
+TIME_COLUMN = 'scraped_at'
+INDEX_COLUMNS = [KEY_COLUMN, 'first_seen', 'last_seen', 'vues']
+CATEGORY_PREFIX = 'categorie='
+DATE_PREFIX = 'date='
+
+# Colonnes utiles pour construire la clé d'une annonce (voir seen.listing_key)
+KEY_SOURCE_COLUMNS = ['lien_annonce', 'image_lien', 'type', 'prix', 'adresse']
+
+
+def category_slug(category_name):
+    """Nom du dossier d'une catégorie : préfixe de fichier connu, sinon nom normalisé"""
+    if category_name in FILE_PREFIXES:
+        return FILE_PREFIXES[category_name]
+    text = unicodedata.normalize('NFKD', str(category_name)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_') or 'sans_categorie'
+
+
+def as_date(value):
+    """date d'une valeur (date, datetime, Timestamp ou chaîne AAAA-MM-JJ)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def last_days(days, today=None):
+    """Période (début, fin) des days derniers jours, aujourd'hui compris"""
+    today = as_date(today) or date.today()
+    return today - timedelta(days=days - 1), today
+
+
+def listing_keys(df):
+    """Clé stable de chaque annonce, calculée une fois par combinaison distincte de colonnes"""
+    columns = [column for column in KEY_SOURCE_COLUMNS if column in df.columns]
+    if not columns:
+        return pd.Series([listing_key({})] * len(df), index=df.index, dtype=object)
+    codes = df.groupby(columns, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+    _, first = np.unique(codes, return_index=True)
+    records = df[columns].iloc[first].astype(object)
+    records = records.where(records.notna(), None).to_dict('records')
+    keys = np.array([listing_key(record) for record in records], dtype=object)
+    return pd.Series(keys[codes], index=df.index, dtype=object)
+
+
+def empty_index():
+    """Index vide : [cle, first_seen, last_seen, vues]"""
+    return pd.DataFrame({
+        KEY_COLUMN: pd.Series(dtype=object),
+        'first_seen': pd.Series(dtype='datetime64[us]'),
+        'last_seen': pd.Series(dtype='datetime64[us]'),
+        'vues': pd.Series(dtype='int64'),
+    })
+
+
+class ListingArchive:
+    """Historique append-only des scrapings, une partition par catégorie et par jour"""
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return pq is not None
+
+    def _category_dir(self, category_name):
+        return os.path.join(self.directory, f"{CATEGORY_PREFIX}{category_slug(category_name)}")
+
+    def _index_path(self, category_name):
+        return os.path.join(self._category_dir(category_name), INDEX_FILE)
+
+    def append(self, df, scraped_at=None):
+        """Ajouter les annonces d'un scraping (une nouvelle partition par catégorie)
+
+        Retourne le nombre de lignes archivées.
+        """
+        if not self.enabled or df.empty or 'categorie' not in df.columns:
+            return 0
+        scraped_at = pd.Timestamp(scraped_at) if scraped_at is not None else pd.Timestamp.now().floor('s')
+        df = df.reset_index(drop=True).assign(**{
+            KEY_COLUMN: listing_keys(df).to_numpy(),
+            TIME_COLUMN: scraped_at,
+        })
+
+        written = 0
+        for category_name, part in df.groupby('categorie', observed=True, sort=False):
+            partition = os.path.join(
+                self._category_dir(category_name), f"{DATE_PREFIX}{scraped_at.date().isoformat()}"
+            )
+            os.makedirs(partition, exist_ok=True)
+            path = os.path.join(partition, f"{scraped_at:%H%M%S}-{uuid.uuid4().hex[:8]}.parquet")
+            tmp_path = f"{path}.tmp"
+            pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp_path)
+            os.replace(tmp_path, path)
+            self._update_index(category_name, part)
+            written += len(part)
+        return written
+
+    def _read_index(self, category_name):
+        path = self._index_path(category_name)
+        if not os.path.exists(path):
+            return empty_index()
+        return pq.read_table(path).to_pandas()
+
+    def _write_index(self, category_name, index):
+        path = self._index_path(category_name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        pq.write_table(pa.Table.from_pandas(index[INDEX_COLUMNS], preserve_index=False), tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _sightings(df):
+        """first_seen / last_seen / vues par clé d'un ensemble d'observations"""
+        # Une annonce répétée dans un même scraping ne compte qu'une fois
+        observations = df[[KEY_COLUMN, TIME_COLUMN]].drop_duplicates()
+        grouped = observations.groupby(KEY_COLUMN, sort=False)[TIME_COLUMN]
+        return pd.DataFrame({
+            'first_seen': grouped.min(),
+            'last_seen': grouped.max(),
+            'vues': grouped.size(),
+        }).rename_axis(KEY_COLUMN).reset_index()
+
+    def _update_index(self, category_name, part):
+        with self._lock:
+            index = pd.concat([self._read_index(category_name), self._sightings(part)], ignore_index=True)
+            grouped = index.groupby(KEY_COLUMN, sort=False)
+            index = pd.DataFrame({
+                'first_seen': grouped['first_seen'].min(),
+                'last_seen': grouped['last_seen'].max(),
+                'vues': grouped['vues'].sum(),
+            }).rename_axis(KEY_COLUMN).reset_index()
+            self._write_index(category_name, index)
+
+    def rebuild_index(self, category_name):
+        """Recalculer l'index d'une catégorie à partir de toutes ses partitions"""
+        frames = [
+            pq.read_table(path, columns=[KEY_COLUMN, TIME_COLUMN]).to_pandas()
+            for _, _, path in self.partitions([category_name])
+        ]
+        if not frames:
+            return
+        with self._lock:
+            self._write_index(category_name, self._sightings(pd.concat(frames, ignore_index=True)))
+
+    def categories(self):
+        """Catégories présentes dans l'archive (nom d'origine si connu, sinon dossier)"""
+        names = {prefix: name for name, prefix in FILE_PREFIXES.items()}
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            names.get(entry[len(CATEGORY_PREFIX):], entry[len(CATEGORY_PREFIX):])
+            for entry in os.listdir(self.directory) if entry.startswith(CATEGORY_PREFIX)
+        )
+
+    def partitions(self, categories=None, start=None, end=None):
+        """Fichiers des partitions retenues : liste de (catégorie, date, chemin), par date"""
+        start, end = as_date(start), as_date(end)
+        selected = []
+        for category_name in categories if categories is not None else self.categories():
+            category_dir = self._category_dir(category_name)
+            if not os.path.isdir(category_dir):
+                continue
+            for entry in os.listdir(category_dir):
+                if not entry.startswith(DATE_PREFIX):
+                    continue
+                try:
+                    day = date.fromisoformat(entry[len(DATE_PREFIX):])
+                except ValueError:
+                    continue
+                if (start is not None and day < start) or (end is not None and day > end):
+                    continue
+                partition = os.path.join(category_dir, entry)
+                selected.extend(
+                    (category_name, day, os.path.join(partition, name))
+                    for name in sorted(os.listdir(partition)) if name.endswith('.parquet')
+                )
+        return sorted(selected, key=lambda item: (item[1], item[2]))
+
+    def index_files(self, categories=None):
+        """Fichiers d'index des catégories (pour invalider un cache quand ils changent)"""
+        paths = [self._index_path(name) for name in (categories if categories is not None else self.categories())]
+        return [path for path in paths if os.path.exists(path)]
+
+    def listings(self, categories=None):
+        """Index des annonces des catégories : [categorie, cle, first_seen, last_seen, vues]"""
+        names = categories if categories is not None else self.categories()
+        frames = [self._read_index(name).assign(categorie=name) for name in names]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return empty_index().assign(categorie=pd.Series(dtype=object))[['categorie', *INDEX_COLUMNS]]
+        return pd.concat(frames, ignore_index=True)[['categorie', *INDEX_COLUMNS]]
+
+    def read(self, categories=None, start=None, end=None, latest=False, columns=None):
+        """Observations des catégories entre start et end (dates incluses)
+
+        Avec latest=True, seule la dernière observation de chaque annonce
+        sur la période est gardée (une ligne par annonce, pour le
+        dashboard). first_seen / last_seen (sur tout l'historique) sont
+        ajoutés à chaque ligne.
+        """
+        if not self.enabled:
+            return pd.DataFrame()
+        if columns is not None:
+            columns = list(dict.fromkeys([*columns, 'categorie', KEY_COLUMN, TIME_COLUMN]))
+        files_by_category = {}
+        for category_name, _, path in self.partitions(categories, start, end):
+            files_by_category.setdefault(category_name, []).append(path)
+
+        frames = []
+        for category_name, paths in files_by_category.items():
+            # Une seule conversion vers pandas par catégorie (dictionnaires unifiés par Arrow)
+            tables = [pq.read_table(path, columns=columns) for path in paths]
+            df = apply_schema(pa.concat_tables(tables, promote_options='permissive').to_pandas())
+            if df.empty:
+                continue
+            if latest:
+                df = latest_observations(df)
+            # Index de la catégorie : une même clé peut exister dans une autre catégorie
+            index = self._read_index(category_name).drop_duplicates(KEY_COLUMN).set_index(KEY_COLUMN)
+            sightings = index.reindex(df[KEY_COLUMN])
+            df = df.assign(first_seen=sightings['first_seen'].to_numpy(), last_seen=sightings['last_seen'].to_numpy())
+            frames.append(df)
+        return concat_listings(frames)
+
+
+def latest_observations(df):
+    """Dernière observation de chaque annonce (une ligne par catégorie et clé)"""
+    subset = ['categorie', KEY_COLUMN] if 'categorie' in df.columns else KEY_COLUMN
+    df = df.sort_values(TIME_COLUMN, kind='stable').drop_duplicates(subset, keep='last')
+    return df.reset_index(drop=True)
+
+
+def price_trend(df):
+    """Prix médian et nombre d'annonces par jour de scraping et par catégorie"""
+    if df.empty:
+        return pd.DataFrame(columns=['date', 'categorie', 'prix_median', 'annonces'])
+    grouped = df.groupby([df[TIME_COLUMN].dt.normalize().rename('date'), 'categorie'], observed=True)
+    trend = grouped.agg(
+        prix_median=('prix_numerique', 'median'),
+        annonces=(KEY_COLUMN, 'nunique'),
+    ).reset_index()
+    trend['categorie'] = trend['categorie'].astype(str)
+    return trend
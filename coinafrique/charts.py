@@ -0,0 +1,128 @@
+"""Figures Plotly du dashboard
+
+Les figures sont construites à partir des tables agrégées (summary.py) :
+leur taille ne dépend pas du nombre d'annonces. Seule exception, les
+boîtes à moustaches des petits jeux de données (DETAIL_MAX_ROWS prix au
+plus) reçoivent tous les prix, Plotly calculant lui-même quartiles et
+points aberrants comme px.box. Au-delà, les quartiles sont précalculés et
+les points aberrants, sous-échantillonnés, sont tracés en WebGL
+(Scattergl) pour rester fluides dans le navigateur.
+"""
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .address import LEVEL_PLURALS
+
+DETAIL_MAX_ROWS = 5_000
+CHART_HEIGHT = 400
+
+
+def category_pie(summary):
+    """Distribution par catégorie"""
+    fig = px.pie(
+        summary.category_counts,
+        names='categorie',
+        values='count',
+        title='Distribution par Catégorie',
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig.update_layout(height=CHART_HEIGHT)
+    return fig
+
+
+def top_places_bar(summary, level, label):
+    """Lieux les plus fréquents au niveau choisi (quartier, ville ou pays)"""
+    top_places = summary.top_places[level]
+    fig = px.bar(
+        x=top_places['count'],
+        y=top_places[level],
+        orientation='h',
+        title=f'Top 10 des {LEVEL_PLURALS[level]}',
+        labels={'x': 'Nombre d\'articles', 'y': label}
+    )
+    fig.update_layout(height=CHART_HEIGHT)
+    return fig
+
+
+def detailed_mode(summary):
+    """Vrai si la figure des prix peut recevoir tous les prix"""
+    return summary.price_count <= DETAIL_MAX_ROWS
+
+
+def price_box(summary, prices=None):
+    """Distribution des prix par catégorie
+
+    prices (table [categorie, prix_numerique] des annonces affichées) n'est
+    utilisé qu'en mode détaillé ; sinon la figure est construite à partir
+    des quartiles et des points aberrants précalculés.
+    """
+    if prices is not None and detailed_mode(summary):
+        prices = prices.dropna(subset=['prix_numerique'])
+        fig = go.Figure(go.Box(
+            x=prices['categorie'].astype(str),
+            y=prices['prix_numerique'].astype('float64'),
+            boxpoints='outliers',
+            name='prix_numerique'
+        ))
+    else:
+        box = summary.price_box
+        fig = go.Figure(go.Box(
+            x=box['categorie'],
+            q1=box['q1'],
+            median=box['median'],
+            q3=box['q3'],
+            lowerfence=box['lowerfence'],
+            upperfence=box['upperfence'],
+            mean=box['mean'],
+            name='prix_numerique'
+        ))
+        outliers = summary.price_outliers
+        if len(outliers):
+            fig.add_trace(go.Scattergl(
+                x=outliers['categorie'],
+                y=outliers['prix_numerique'],
+                mode='markers',
+                marker={'size': 4, 'opacity': 0.6},
+                name='valeurs extrêmes',
+                showlegend=False
+            ))
+    fig.update_layout(
+        height=CHART_HEIGHT,
+        title='Distribution des Prix par Catégorie',
+        xaxis_title='categorie',
+        yaxis_title='prix_numerique'
+    )
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+
+def price_histogram(summary):
+    """Histogramme des prix (classes fixes précalculées)"""
+    hist = summary.price_hist
+    fig = px.bar(
+        hist,
+        x='milieu',
+        y='count',
+        hover_data=['debut', 'fin'],
+        title='Distribution des Prix',
+        labels={'milieu': 'prix_numerique', 'count': 'count'}
+    )
+    fig.update_traces(width=float(hist['fin'].iloc[0] - hist['debut'].iloc[0]) or None)
+    fig.update_layout(height=CHART_HEIGHT, bargap=0)
+    return fig
+
+
+def price_trend(trend):
+    """Évolution du prix médian par jour de scraping (table archive.price_trend)"""
+    fig = px.line(
+        trend,
+        x='date',
+        y='prix_median',
+        color='categorie',
+        markers=True,
+        hover_data=['annonces'],
+        title='Évolution du Prix Médian',
+        labels={'date': 'Date de scraping', 'prix_median': 'Prix médian (FCFA)', 'categorie': 'Catégorie'}
+    )
+    fig.update_layout(height=CHART_HEIGHT)
+    return fig
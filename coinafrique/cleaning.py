@@ -0,0 +1,157 @@
+"""Nettoyage des annonces scrapées
+
+Les colonnes texte d'annonces répètent massivement les mêmes valeurs (une
+poignée de villes, de types, de prix). Le nettoyage travaille donc sur les
+valeurs distinctes : chaque colonne est factorisée (codes entiers +
+valeurs uniques), la normalisation est appliquée une seule fois par valeur
+unique puis redistribuée aux lignes via les codes. La détection des
+doublons se fait elle aussi sur les codes entiers, avant de construire
+les colonnes : les codes des lignes conservées servent directement à
+construire les colonnes catégorielles du schéma typé.
+
+L'adresse est enfin découpée en quartier / ville / pays (une analyse par
+adresse distincte, voir address.py).
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+from .address import address_levels
+from .prices import price_values
+from .schema import apply_schema
+
+NO_IMAGE = "Image non disponible"
+DEDUP_COLUMNS = ['type', 'prix_brut', 'adresse']
+
+
+def _as_text(values):
+    """Valeurs uniques sous forme de Series de texte"""
+    values = pd.Series(values)
+    if not (pd.api.types.is_string_dtype(values) or pd.api.types.is_object_dtype(values)):
+        values = values.astype(str)
+    return values
+
+
+def _normalise_text(series):
+    """strip().title() calculé une fois par valeur distincte
+
+    Retourne les codes entiers (alignés sur series, -1 pour les valeurs
+    manquantes) et les valeurs normalisées triées qu'ils désignent.
+    """
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return codes, pd.Index([], dtype=object)
+    cleaned = _as_text(uniques).str.strip().str.title()
+    canonical, categories = pd.factorize(cleaned, sort=True)
+    return np.where(codes < 0, -1, canonical[codes]), pd.Index(categories)
+
+
+def _categorical(codes, categories):
+    """Colonne catégorielle limitée aux catégories effectivement utilisées"""
+    used = np.bincount(codes[codes >= 0], minlength=len(categories)) > 0
+    if not used.all():
+        codes = np.where(codes < 0, -1, np.cumsum(used)[codes] - 1)
+        categories = categories[used]
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _duplicated(keys):
+    """Lignes en double sur les codes entiers de DEDUP_COLUMNS
+
+    Les codes sont combinés en une seule clé int64 tant qu'elle ne déborde
+    pas, ce qui évite de construire un DataFrame pour duplicated().
+    """
+    sizes = [int(keys[column].max(initial=-1)) + 2 for column in DEDUP_COLUMNS]
+    if np.prod(sizes, dtype=float) >= np.iinfo(np.int64).max:
+        return pd.DataFrame({column: keys[column] for column in DEDUP_COLUMNS}).duplicated().to_numpy()
+    combined = np.zeros(len(keys[DEDUP_COLUMNS[0]]), dtype=np.int64)
+    for column, size in zip(DEDUP_COLUMNS, sizes):
+        combined = combined * size + (keys[column] + 1)
+    return pd.Series(combined).duplicated().to_numpy()
+
+
+def clean_scraped_data(df):
+    """Nettoyer les données scrapées avec vérification des colonnes"""
+    if df.empty:
+        return df
+
+    n = len(df)
+    keys = {}
+    categories = {}
+
+    # Codes entiers des colonnes de doublons : prix brut, adresse et type normalisés
+    if 'prix' in df.columns:
+        keys['prix_brut'], prices = pd.factorize(df['prix'])
+    else:
+        keys['prix_brut'] = np.zeros(n, dtype=np.intp)
+    for column in ('adresse', 'type'):
+        if column in df.columns:
+            keys[column], categories[column] = _normalise_text(df[column])
+        else:
+            keys[column] = np.zeros(n, dtype=np.intp)
+
+    # Doublons sur (type, prix_brut, adresse), retirés avant de construire les colonnes
+    duplicated = _duplicated(keys)
+    if duplicated.any():
+        df = df[~duplicated]
+        keys = {column: codes[~duplicated] for column, codes in keys.items()}
+        n = len(df)
+
+    columns = {}
+    if 'prix' in df.columns:
+        # Prix numérique (Int64, voir prices.py) calculé une fois par prix distinct
+        numbers = price_values(prices) if len(prices) else pd.array([], dtype='Int64')
+        prix_numerique = take(numbers, keys['prix_brut'], allow_fill=True)
+        columns['prix_brut'] = df['prix'].array
+        columns['prix_numerique'] = prix_numerique
+        columns['a_prix'] = ~prix_numerique.isna()
+    else:
+        columns['prix_brut'] = np.full(n, "Inconnu", dtype=object)
+        columns['prix_numerique'] = pd.array([pd.NA] * n, dtype='Int64')
+        columns['a_prix'] = np.zeros(n, dtype=bool)
+
+    for column, default in (('adresse', "Adresse inconnue"), ('type', "Type inconnu")):
+        if column in categories:
+            columns[column] = _categorical(keys[column], categories[column])
+        else:
+            columns[column] = np.full(n, default, dtype=object)
+
+    if 'image_lien' in df.columns:
+        columns['a_image'] = (df['image_lien'] != NO_IMAGE).to_numpy()
+    else:
+        columns['a_image'] = np.zeros(n, dtype=bool)
+
+    for level, values in address_levels(pd.Series(columns['adresse'], index=df.index)).items():
+        columns[level] = values.array
+
+    # Table construite en une fois : colonnes d'origine (remplacées à leur place) puis nouvelles
+    data = {column: columns.pop(column) if column in columns else df[column].array for column in df.columns}
+    data.update(columns)
+    return apply_schema(pd.DataFrame(data, index=df.index, copy=False))
+
+
+def drop_existing_duplicates(df, existing):
+    """Retirer de df les doublons (type, prix_brut, adresse) des annonces de existing
+
+    Même règle que clean_scraped_data, appliquée à existing suivi de df :
+    à utiliser avant d'ajouter des annonces nettoyées à la fin d'un fichier
+    qui contient déjà existing.
+    """
+    if df.empty or existing.empty:
+        return df
+    if not (set(DEDUP_COLUMNS) <= set(df.columns) and set(DEDUP_COLUMNS) <= set(existing.columns)):
+        return df
+    merged = pd.concat(
+        [existing[DEDUP_COLUMNS].astype('string'), df[DEDUP_COLUMNS].astype('string')], ignore_index=True
+    )
+    keys = {column: _normalise_text(merged[column])[0] for column in ('type', 'adresse')}
+    keys['prix_brut'] = pd.factorize(merged['prix_brut'])[0]
+    duplicated = _duplicated(keys)
+    duplicated = duplicated[len(existing):]
+    if not duplicated.any():
+        return df
+    df = df[~duplicated]
+    for column in ('adresse', 'type'):
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].cat.remove_unused_categories()
+    return df
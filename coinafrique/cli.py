@@ -0,0 +1,409 @@
+"""Interface en ligne de commande : scraping, nettoyage et export sans Streamlit
+
+Commandes (python -m coinafrique <commande> --help pour le détail) :
+
+- scrape : scraper une ou plusieurs catégories et écrire un CSV par
+  catégorie (<prefixe>_cleaned.csv ou _raw.csv, comme l'application) ;
+- clean : nettoyer des fichiers d'annonces (CSV de l'app ou exports Web
+  Scraper), un fichier <nom>_cleaned.csv par fichier d'entrée ;
+- export : fusionner des fichiers, les nettoyer, retirer éventuellement les
+  doublons et écrire un seul fichier (CSV, Feather ou Parquet) ;
+- archive : extraire de l'archive historique les annonces d'une période
+  (voir coinafrique.archive), par exemple les 30 derniers jours d'une
+  catégorie.
+
+Comme dans l'application, chaque scraping est aussi ajouté à l'archive
+historique (--no-archive pour s'en passer).
+
+Les catégories (scrape) et les fichiers (clean) sont traités en parallèle,
+dans des threads ou, avec --processes, dans des processus séparés. La
+progression est écrite sur la sortie d'erreur, le bilan sur la sortie
+standard. Codes de sortie : EXIT_OK si tout a réussi, EXIT_PARTIAL si des
+pages ou des fichiers ont été perdus, EXIT_USAGE pour une commande
+invalide, EXIT_NO_DATA si aucune annonce n'a été produite.
+
+Seuls pandas, numpy, requests et l'extraction HTML sont importés : ni
+streamlit, ni plotly, ni seaborn.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from .archive import ARCHIVE_DIR, ListingArchive, last_days
+from .cleaning import DEDUP_COLUMNS, clean_scraped_data, drop_existing_duplicates
+from .dedup import drop_duplicate_listings
+from .httpcache import DEFAULT_TTL, ResponseCache
+from .journal import JOURNAL_DIR, ScrapeJournal
+from .loader import read_listings
+from .schema import concat_listings
+from .scraper import HostRateLimiter, scrape_category
+from .seen import SEEN_DIR, SeenIndex
+from .session import DEFAULT_RETRIES, shared_session
+from .settings import DEFAULT_RATE, DEFAULT_WORKERS, FILE_PREFIXES, URLS, category_file_name
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_NO_DATA = 3
+EXIT_INTERRUPTED = 130
+
+# Catégories désignées par leur préfixe de fichier (vetements_homme...)
+CATEGORIES = {prefix: name for name, prefix in FILE_PREFIXES.items()}
+EXPORT_FORMATS = ('csv', 'feather', 'parquet')
+
+_print_lock = threading.Lock()
+
+
+def report(message, quiet=False):
+    """Ligne de progression sur la sortie d'erreur"""
+    if not quiet:
+        with _print_lock:
+            print(message, file=sys.stderr, flush=True)
+
+
+def write_listings(df, path, append=False):
+    """Écrire des annonces en CSV (ajout en fin de fichier avec les colonnes existantes)
+
+    En ajout, les annonces nettoyées qui doublonnent une ligne du fichier
+    sont ignorées (voir cleaning.drop_existing_duplicates). Retourne le
+    nombre de lignes écrites.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if append and os.path.exists(path):
+        columns = pd.read_csv(path, nrows=0).columns
+        if set(DEDUP_COLUMNS) <= set(columns):
+            df = drop_existing_duplicates(df, pd.read_csv(path, usecols=DEDUP_COLUMNS, dtype=str))
+        df.reindex(columns=columns).to_csv(path, mode='a', header=False, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return len(df)
+
+
+def write_export(df, path, fmt=None):
+    """Écrire un export au format choisi (d'après l'extension par défaut)"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower() or 'csv'
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu : {fmt} ({', '.join(EXPORT_FORMATS)})")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    elif fmt == 'feather':
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_parquet(path, index=False)
+
+
+def scrape_job(category_name, options, session=None, limiter=None, cancel_event=None):
+    """Scraper, filtrer, nettoyer et sauvegarder une catégorie
+
+    options est un dictionnaire simple (transmissible à un autre processus).
+    Retourne le bilan de la catégorie : annonces écrites, fichier, pages
+    perdues. Si cancel_event est levé, le scraping s'arrête après la page en
+    cours et rien n'est écrit (le journal permet de reprendre avec --resume).
+    Le journal et l'index des annonces déjà vues sont rangés sous
+    <output_dir>/data/, à côté des CSV qu'ils accompagnent.
+    """
+    clean_data = not options['raw']
+    file_name = category_file_name(category_name, clean_data)
+    output = os.path.join(options['output_dir'], f'{file_name}.csv')
+    quiet = options['quiet']
+
+    journal_path = ScrapeJournal.path_for(file_name, directory=os.path.join(options['output_dir'], JOURNAL_DIR))
+    seen_dir = os.path.join(options['output_dir'], SEEN_DIR)
+    journal = ScrapeJournal.load(journal_path) if options['resume'] else None
+    if journal is None or journal.finished:
+        journal = ScrapeJournal.start(journal_path, URLS[category_name], category_name, options['pages'])
+    pages = journal.pages
+
+    seen_index = None
+    stop_when = None
+    if options['incremental']:
+        seen_index = SeenIndex.for_category(file_name, seed_files=[output], directory=seen_dir)
+        stop_when = seen_index.page_is_known
+
+    def progress(done, total):
+        report(f"[{category_name}] page {done}/{total}", quiet)
+
+    cache = None
+    if options['cache_ttl'] is not None or options['offline']:
+        ttl = options['cache_ttl'] * 60 if options['cache_ttl'] is not None else DEFAULT_TTL
+        cache = ResponseCache(ttl=ttl, offline=options['offline'])
+
+    start = time.perf_counter()
+    data, errors = scrape_category(
+        URLS[category_name], category_name, pages, workers=options['workers'], rate=options['rate'],
+        retries=options['retries'], session=session, limiter=limiter, progress_callback=progress,
+        cancel_event=cancel_event, stop_when=stop_when, journal=journal, cache=cache
+    )
+    for page, error in errors:
+        report(f"[{category_name}] page {page} perdue : {error}", quiet)
+    if cancel_event is not None and cancel_event.is_set():
+        return {'category': category_name, 'scraped': 0, 'rows': 0, 'output': None,
+                'errors': [page for page, _ in errors], 'seconds': time.perf_counter() - start}
+
+    data = list(data)
+    scraped = len(data)
+    if options['archive'] and data:
+        # Lot complet, avant le filtrage incrémental : last_seen avance aussi pour les annonces déjà connues
+        ListingArchive(options['archive_dir']).append(clean_scraped_data(pd.DataFrame.from_records(data)))
+    if seen_index is not None:
+        data = seen_index.new_records(data)
+        seen_index.add(data)
+
+    df = pd.DataFrame.from_records(data)
+    if clean_data and not df.empty:
+        df = clean_scraped_data(df)
+    rows = 0
+    if not df.empty:
+        rows = write_listings(df, output, append=options['incremental'])
+        if seen_index is None:
+            # Scraping complet : le CSV est réécrit, l'index des annonces déjà vues doit le suivre
+            SeenIndex.for_category(file_name, seed_files=[output], directory=seen_dir).add(data)
+
+    return {
+        'category': category_name,
+        'scraped': scraped,
+        'rows': rows,
+        'output': output if rows else None,
+        'errors': [page for page, _ in errors],
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def _run_scrape_job(category_name, options):
+    # Point d'entrée des processus : session et limiteur propres au processus
+    return scrape_job(category_name, options)
+
+
+def clean_job(path, options):
+    """Nettoyer un fichier d'annonces vers <output_dir>/<nom>_cleaned.csv"""
+    start = time.perf_counter()
+    df = read_listings(path)
+    if not df.empty:
+        df = clean_scraped_data(df)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    output = os.path.join(options['output_dir'], f'{stem}_cleaned.csv')
+    if not df.empty:
+        write_listings(df, output)
+    return {'path': path, 'rows': len(df), 'output': output if not df.empty else None,
+            'seconds': time.perf_counter() - start}
+
+
+def run_parallel(func, items, options, processes, cancel_event=None):
+    """Appliquer func(item, options) à chaque élément, dans des threads ou des processus
+
+    Les résultats sont produits au fil de l'eau sous forme de tuples
+    (élément, résultat, exception). Sur Ctrl-C (ou si l'appelant abandonne
+    la lecture), cancel_event est levé, les tâches en attente sont annulées
+    et la fonction rend la main sans attendre la fin des tâches en cours.
+    """
+    if processes > 1:
+        executor = ProcessPoolExecutor(max_workers=min(processes, len(items)))
+    else:
+        executor = ThreadPoolExecutor(max_workers=max(1, len(items)))
+    interrupted = False
+    try:
+        futures = {executor.submit(func, item, options): item for item in items}
+        for future in futures:
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+    except (KeyboardInterrupt, GeneratorExit):
+        interrupted = True
+        if cancel_event is not None:
+            cancel_event.set()
+        raise
+    finally:
+        executor.shutdown(wait=not interrupted, cancel_futures=interrupted)
+
+
+def cmd_scrape(args):
+    categories = [CATEGORIES[prefix] for prefix in args.categories or CATEGORIES]
+    options = {
+        'pages': args.pages, 'workers': args.workers, 'rate': args.rate, 'retries': args.retries,
+        'raw': args.raw, 'incremental': args.incremental, 'resume': args.resume,
+        'output_dir': args.output_dir, 'cache_ttl': args.cache_ttl, 'offline': args.offline,
+        'quiet': args.quiet, 'archive': not args.no_archive, 'archive_dir': args.archive_dir,
+    }
+    if args.processes > 1:
+        # Un limiteur par processus : le débit global par hôte est réparti entre eux
+        options['rate'] = args.rate / min(args.processes, len(categories))
+        results = run_parallel(_run_scrape_job, categories, options, args.processes)
+    else:
+        # Threads : session et limiteur partagés, débit global plafonné à --rate
+        session = shared_session(pool_size=args.workers * len(categories), retries=args.retries)
+        limiter = HostRateLimiter(args.rate)
+        cancel_event = threading.Event()
+        results = run_parallel(
+            lambda name, opts: scrape_job(name, opts, session=session, limiter=limiter, cancel_event=cancel_event),
+            categories, options, 1, cancel_event=cancel_event
+        )
+
+    status = EXIT_OK
+    total = 0
+    for category_name, result, error in results:
+        if error is not None:
+            print(f"{category_name} : échec ({error})")
+            status = EXIT_PARTIAL
+            continue
+        total += result['rows']
+        destination = result['output'] or 'rien à écrire'
+        print(f"{category_name} : {result['rows']} annonce(s) sur {result['scraped']} -> {destination} "
+              f"({result['seconds']:.1f} s)")
+        if result['errors']:
+            print(f"  {len(result['errors'])} page(s) perdue(s) : {', '.join(map(str, result['errors']))}")
+            status = EXIT_PARTIAL
+    if total == 0 and status == EXIT_OK:
+        return EXIT_NO_DATA
+    return status
+
+
+def cmd_clean(args):
+    options = {'output_dir': args.output_dir}
+    status = EXIT_OK
+    total = 0
+    for path, result, error in run_parallel(clean_job, args.files, options, args.processes):
+        if error is not None:
+            print(f"{path} : échec ({error})")
+            status = EXIT_PARTIAL
+            continue
+        total += result['rows']
+        print(f"{path} : {result['rows']} annonce(s) -> {result['output'] or 'rien à écrire'} "
+              f"({result['seconds']:.1f} s)")
+    if total == 0 and status == EXIT_OK:
+        return EXIT_NO_DATA
+    return status
+
+
+def cmd_export(args):
+    fmt = args.format or os.path.splitext(args.output)[1].lstrip('.').lower() or 'csv'
+    if fmt not in EXPORT_FORMATS:
+        print(f"Format d'export inconnu : {fmt} ({', '.join(EXPORT_FORMATS)})", file=sys.stderr)
+        return EXIT_USAGE
+    status = EXIT_OK
+    frames = []
+    for path in args.files:
+        try:
+            frames.append(read_listings(path))
+            report(f"{path} : {len(frames[-1])} ligne(s)", args.quiet)
+        except Exception as e:
+            print(f"{path} : échec ({e})")
+            status = EXIT_PARTIAL
+    df = concat_listings(frames) if frames else pd.DataFrame()
+    if df.empty:
+        print('Aucune annonce à exporter')
+        return EXIT_NO_DATA if status == EXIT_OK else status
+
+    if not args.raw:
+        df = clean_scraped_data(df)
+    if args.dedup:
+        df, clusters = drop_duplicate_listings(df, near=not args.exact)
+        report(f"{len(clusters)} groupe(s) de doublons retirés", args.quiet)
+    write_export(df, args.output, fmt)
+    print(f"{len(df)} annonce(s) -> {args.output}")
+    return status
+
+
+def cmd_archive(args):
+    archive = ListingArchive(args.archive_dir)
+    if not archive.enabled:
+        print('Archive indisponible : pyarrow n\'est pas installé', file=sys.stderr)
+        return EXIT_USAGE
+    fmt = args.format or os.path.splitext(args.output)[1].lstrip('.').lower() or 'csv'
+    if fmt not in EXPORT_FORMATS:
+        print(f"Format d'export inconnu : {fmt} ({', '.join(EXPORT_FORMATS)})", file=sys.stderr)
+        return EXIT_USAGE
+    categories = [CATEGORIES[prefix] for prefix in args.categories] if args.categories else None
+    start, end = last_days(args.days) if args.days else (args.start, args.end)
+    files = archive.partitions(categories, start, end)
+    report(f"{len(files)} fichier(s) d'archive retenus", args.quiet)
+    df = archive.read(categories, start, end, latest=args.latest)
+    if df.empty:
+        print('Aucune annonce archivée sur cette période')
+        return EXIT_NO_DATA
+    write_export(df, args.output, fmt)
+    print(f"{len(df)} ligne(s) -> {args.output}")
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m coinafrique', description='Scraping, nettoyage et export des annonces CoinAfrique'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scrape = commands.add_parser('scrape', help='scraper des catégories vers des CSV')
+    scrape.add_argument('categories', nargs='*', metavar='categorie',
+                        help=f"catégories à scraper ({', '.join(CATEGORIES)}), toutes par défaut")
+    scrape.add_argument('--pages', type=int, default=3, help='pages par catégorie (défaut : 3)')
+    scrape.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='requêtes simultanées par catégorie')
+    scrape.add_argument('--rate', type=float, default=DEFAULT_RATE, help='requêtes par seconde et par hôte')
+    scrape.add_argument('--retries', type=int, default=DEFAULT_RETRIES, help='relances par page')
+    scrape.add_argument('--raw', action='store_true', help='données brutes (sans nettoyage)')
+    scrape.add_argument('--incremental', action='store_true',
+                        help='nouvelles annonces seulement, ajoutées au fichier existant')
+    scrape.add_argument('--resume', action='store_true', help='reprendre un scraping interrompu')
+    scrape.add_argument('--cache-ttl', type=float, default=None, metavar='MINUTES',
+                        help='cache disque des pages (désactivé par défaut)')
+    scrape.add_argument('--offline', action='store_true', help='pages du cache uniquement, sans réseau')
+    scrape.add_argument('--processes', type=int, default=1, help='un processus par catégorie si > 1')
+    scrape.add_argument('--output-dir', default='.', help='dossier des CSV (défaut : dossier courant)')
+    scrape.add_argument('--no-archive', action='store_true', help='ne pas ajouter le scraping à l\'archive')
+    scrape.add_argument('--archive-dir', default=ARCHIVE_DIR, help='dossier de l\'archive historique')
+    scrape.add_argument('--quiet', action='store_true', help='sans progression')
+    scrape.set_defaults(func=cmd_scrape)
+
+    clean = commands.add_parser('clean', help='nettoyer des fichiers d\'annonces')
+    clean.add_argument('files', nargs='+', help='CSV de l\'application ou exports Web Scraper')
+    clean.add_argument('--processes', type=int, default=1, help='un processus par fichier si > 1')
+    clean.add_argument('--output-dir', default='.', help='dossier des CSV nettoyés')
+    clean.set_defaults(func=cmd_clean)
+
+    export = commands.add_parser('export', help='fusionner, nettoyer et exporter des fichiers')
+    export.add_argument('files', nargs='+', help='CSV de l\'application ou exports Web Scraper')
+    export.add_argument('-o', '--output', required=True, help='fichier de sortie')
+    export.add_argument('--format', choices=EXPORT_FORMATS, help='format (d\'après l\'extension par défaut)')
+    export.add_argument('--raw', action='store_true', help='sans nettoyage')
+    export.add_argument('--dedup', action='store_true', help='retirer les annonces en double')
+    export.add_argument('--exact', action='store_true', help='doublons exacts seulement (avec --dedup)')
+    export.add_argument('--quiet', action='store_true', help='sans progression')
+    export.set_defaults(func=cmd_export)
+
+    history = commands.add_parser('archive', help='extraire une période de l\'archive historique')
+    history.add_argument('categories', nargs='*', metavar='categorie',
+                         help=f"catégories ({', '.join(CATEGORIES)}), toutes par défaut")
+    history.add_argument('--days', type=int, help='les N derniers jours (aujourd\'hui compris)')
+    history.add_argument('--start', help='premier jour (AAAA-MM-JJ)')
+    history.add_argument('--end', help='dernier jour (AAAA-MM-JJ)')
+    history.add_argument('--latest', action='store_true', help='dernière observation de chaque annonce seulement')
+    history.add_argument('-o', '--output', required=True, help='fichier de sortie')
+    history.add_argument('--format', choices=EXPORT_FORMATS, help='format (d\'après l\'extension par défaut)')
+    history.add_argument('--archive-dir', default=ARCHIVE_DIR, help='dossier de l\'archive historique')
+    history.add_argument('--quiet', action='store_true', help='sans progression')
+    history.set_defaults(func=cmd_archive)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for name in ('pages', 'workers', 'processes', 'days'):
+        if getattr(args, name, None) is not None and getattr(args, name) < 1:
+            parser.error(f"--{name} doit être au moins 1")
+    unknown = [name for name in getattr(args, 'categories', []) if name not in CATEGORIES]
+    if unknown:
+        parser.error(f"catégorie(s) inconnue(s) : {', '.join(unknown)} (choix : {', '.join(CATEGORIES)})")
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print('Interrompu', file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return EXIT_PARTIAL
@@ -0,0 +1,93 @@
+"""Cache mémoire des jeux de données chargés et nettoyés (et de leurs agrégats)
+
+Les DataFrames sont indexés par la signature de leurs fichiers sources
+(chemin absolu, mtime, taille) : une modification du fichier produit une
+nouvelle clé, et l'ancienne entrée finit évincée. Le cache est borné en
+octets (LRU) et peut être invalidé explicitement pour un fichier, par
+exemple juste après la sauvegarde d'un scraping. Les DataFrames servis sont
+partagés entre les reruns et les sessions : ils ne doivent pas être
+modifiés sur place.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_signature(path):
+    """Signature (chemin absolu, mtime, taille) d'un fichier, ou None s'il n'existe pas"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def frame_size(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class DatasetCache:
+    """LRU de DataFrames borné en octets, partageable entre threads"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        return self._total
+
+    def get_or_compute(self, kind, paths, compute, sizeof=frame_size):
+        """Valeur en cache pour (kind, signatures des fichiers), sinon calculée puis stockée
+
+        sizeof estime la taille mémoire de la valeur (DataFrame par défaut).
+        """
+        signatures = tuple(file_signature(path) for path in paths)
+        key = (kind, signatures)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        self._put(key, value, sizeof(value))
+        return value
+
+    def load(self, path, loader):
+        """Charger un fichier via loader(path), une seule fois par version du fichier"""
+        return self.get_or_compute('load', [path], lambda: loader(path))
+
+    def _put(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total -= previous[1]
+            self._entries[key] = (value, size)
+            self._total += size
+            while self._total > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total -= evicted
+
+    def invalidate(self, path=None):
+        """Retirer les entrées construites à partir d'un fichier (ou tout le cache)"""
+        target = os.path.abspath(path) if path is not None else None
+        with self._lock:
+            for key in list(self._entries):
+                _, signatures = key
+                if target is None or any(sig is not None and sig[0] == target for sig in signatures):
+                    _, size = self._entries.pop(key)
+                    self._total -= size
@@ -0,0 +1,205 @@
+"""Détection des doublons d'annonces (exacts et quasi-doublons)
+
+- Doublons exacts : clés hachées communes à deux lignes, l'ID d'annonce
+  extrait du lien (/annonce/...-<id>) ou le nom de fichier de l'image.
+- Quasi-doublons : même annonce republiée avec un titre légèrement
+  modifié. Les titres normalisés (minuscules, sans accents) sont découpés
+  en trigrammes de caractères et résumés par une signature MinHash, calculée
+  une fois par titre distinct. Le LSH (bandes de la signature) propose des
+  candidats partageant aussi le même prix et la même adresse, ce qui évite
+  de regrouper des annonces différentes au titre banal ("Babouches").
+  Chaque candidat est confirmé par la similarité de Jaccard estimée.
+
+Les paires retenues forment un graphe dont les composantes connexes sont
+les groupes de doublons. Tout est en temps quasi linéaire (tris et
+np.unique), sans comparaison de toutes les paires.
+"""
+import re
+import unicodedata
+import zlib
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+NO_IMAGE = "Image non disponible"
+ANNONCE_ID_RE = r'/annonce/.*?-(\d+)(?:[/?#]|$)'
+IMAGE_FILE_RE = r'/([^/?#]+\.(?:jpe?g|png|gif|webp))(?:[?#]|$)'
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+DEFAULT_THRESHOLD = 0.8
+NUM_PERM = 64
+BANDS = 16
+SHINGLE = 3
+MERSENNE_PRIME = (1 << 31) - 1
+CHUNK_SHINGLES = 200_000
+HASH_MULTIPLIER = 0x100000001B3
+
+DuplicateResult = namedtuple('DuplicateResult', ['labels', 'keep', 'clusters'])
+
+
+def normalise_title(text):
+    """Titre en minuscules, sans accents ni ponctuation"""
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return NON_ALNUM_RE.sub(' ', text).strip()
+
+
+def _shingles(title):
+    padded = f" {title} "
+    return {zlib.crc32(padded[i:i + SHINGLE].encode('utf-8')) for i in range(len(padded) - SHINGLE + 1)}
+
+
+def minhash_signatures(titles, num_perm=NUM_PERM, seed=1):
+    """Signatures MinHash (num_perm x len(titles)) de titres normalisés
+
+    Les titres vides ont une signature de valeurs maximales (jamais candidats).
+    """
+    rng = np.random.default_rng(seed)
+    # h(x) = (a x + b) mod p, avec x < p et a, b < p : a x + b tient sur 64 bits
+    a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    shingle_sets = [sorted(_shingles(title)) if title else [] for title in titles]
+    signatures = np.full((num_perm, len(titles)), np.iinfo(np.uint64).max, dtype=np.uint64)
+
+    # Par blocs de titres pour borner la mémoire du calcul (num_perm x trigrammes)
+    start = 0
+    while start < len(titles):
+        end, total = start, 0
+        while end < len(titles) and (total == 0 or total + len(shingle_sets[end]) <= CHUNK_SHINGLES):
+            total += len(shingle_sets[end])
+            end += 1
+        chunk = [(position, values) for position, values in enumerate(shingle_sets[start:end], start) if values]
+        if chunk:
+            hashes = np.fromiter((value for _, values in chunk for value in values), dtype=np.uint64)
+            hashes %= np.uint64(MERSENNE_PRIME)
+            offsets = np.cumsum([0] + [len(values) for _, values in chunk[:-1]])
+            permuted = (a[:, None] * hashes[None, :] + b[:, None]) % MERSENNE_PRIME
+            signatures[:, [position for position, _ in chunk]] = np.minimum.reduceat(permuted, offsets, axis=1)
+        start = end
+    return signatures
+
+
+def _key_codes(values, pattern):
+    """Codes entiers d'une clé extraite par regex (calculée par valeur distincte), -1 si absente"""
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return codes
+    keys = pd.Series(uniques, dtype=object).astype(str).str.extract(pattern, expand=False)
+    key_codes, _ = pd.factorize(keys)
+    return np.append(key_codes, -1)[codes]
+
+
+def _edges_from_codes(codes):
+    """Relier chaque ligne à la première ligne portant le même code"""
+    positions = np.flatnonzero(codes >= 0)
+    if len(positions) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    _, first, inverse = np.unique(codes[positions], return_index=True, return_inverse=True)
+    return positions, positions[first][inverse]
+
+
+def _column(df, name):
+    if name in df.columns:
+        return df[name]
+    return pd.Series([np.nan] * len(df), index=df.index, dtype=object)
+
+
+def exact_duplicate_edges(df):
+    """Paires de lignes partageant un ID d'annonce ou un fichier image"""
+    links = pd.concat([_column(df, 'lien_annonce'), _column(df, 'image_lien')], ignore_index=True)
+    images = _column(df, 'image_lien').where(_column(df, 'image_lien') != NO_IMAGE)
+
+    n = len(df)
+    annonce_codes = _key_codes(links, ANNONCE_ID_RE)
+    # Une même annonce peut être repérée par son lien ou par son image_lien (fichiers dont la
+    # colonne image_lien contient le lien de l'annonce)
+    annonce_codes = np.where(annonce_codes[:n] >= 0, annonce_codes[:n], annonce_codes[n:])
+    image_codes = _key_codes(images, IMAGE_FILE_RE)
+
+    sources, targets = zip(*(_edges_from_codes(codes) for codes in (annonce_codes, image_codes)))
+    return np.concatenate(sources), np.concatenate(targets)
+
+
+def near_duplicate_edges(df, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """Paires de lignes de même prix et adresse dont les titres sont quasi identiques"""
+    n = len(df)
+    empty = np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if n == 0 or 'type' not in df.columns:
+        return empty
+
+    # Titres normalisés : une normalisation et une signature par valeur distincte
+    title_codes, raw_titles = pd.factorize(df['type'])
+    normalised = [normalise_title(title) for title in raw_titles]
+    title_codes_norm, titles = pd.factorize(pd.Series(normalised, dtype=object))
+    title_codes = np.where(title_codes >= 0, title_codes_norm[title_codes], -1)
+
+    price = _column(df, 'prix_numerique') if 'prix_numerique' in df.columns else _column(df, 'prix')
+    price_codes, _ = pd.factorize(price)
+    address_codes, _ = pd.factorize(_column(df, 'adresse'))
+    block_codes, _ = pd.factorize(pd.MultiIndex.from_arrays([price_codes, address_codes]))
+
+    # Entités : couples (titre, bloc) distincts, représentés par leur première ligne.
+    # Les lignes d'une même entité (titre normalisé identique) sont reliées entre elles.
+    valid = np.flatnonzero(title_codes >= 0)
+    pairs = np.stack([title_codes[valid], block_codes[valid]], axis=1)
+    entities, first, inverse = np.unique(pairs, axis=0, return_index=True, return_inverse=True)
+    representatives = valid[first]
+    entity_titles, entity_blocks = entities[:, 0], entities[:, 1]
+    sources, targets = [valid], [representatives[inverse.ravel()]]
+
+    signatures = minhash_signatures(list(titles), num_perm=num_perm)[:, entity_titles]
+    rows_per_band = num_perm // bands
+    for band in range(bands):
+        # Clé de seau : hachage (bloc, valeurs de la bande) ; une collision n'est
+        # qu'un candidat de plus, écarté par la vérification
+        keys = entity_blocks.astype(np.uint64)
+        for row in signatures[band * rows_per_band:(band + 1) * rows_per_band]:
+            keys = keys * np.uint64(HASH_MULTIPLIER) ^ row
+        _, bucket_first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        candidate = bucket_first[inverse]
+        others = np.flatnonzero(candidate != np.arange(len(entities)))
+        if len(others) == 0:
+            continue
+        similarity = (signatures[:, others] == signatures[:, candidate[others]]).mean(axis=0)
+        confirmed = others[similarity >= threshold]
+        sources.append(representatives[confirmed])
+        targets.append(representatives[candidate[confirmed]])
+    return np.concatenate(sources), np.concatenate(targets)
+
+
+def find_duplicates(df, threshold=DEFAULT_THRESHOLD, near=True):
+    """Groupes de doublons : numéro de groupe par ligne, lignes à garder et rapport des groupes"""
+    n = len(df)
+    sources, targets = exact_duplicate_edges(df)
+    if near:
+        near_sources, near_targets = near_duplicate_edges(df, threshold)
+        sources = np.concatenate([sources, near_sources])
+        targets = np.concatenate([targets, near_targets])
+
+    graph = coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+
+    _, first, sizes = np.unique(labels, return_index=True, return_counts=True)
+    keep = np.zeros(n, dtype=bool)
+    keep[first] = True
+
+    duplicated = first[sizes > 1]
+    clusters = pd.DataFrame({
+        'groupe': labels[duplicated],
+        'taille': sizes[sizes > 1],
+        **{
+            column: df[column].to_numpy()[duplicated]
+            for column in ('categorie', 'type', 'prix', 'adresse') if column in df.columns
+        },
+    }).sort_values('taille', ascending=False, kind='stable').reset_index(drop=True)
+    return DuplicateResult(labels, keep, clusters)
+
+
+def drop_duplicate_listings(df, threshold=DEFAULT_THRESHOLD, near=True):
+    """Garder une annonce par groupe de doublons ; retourne (annonces uniques, rapport des groupes)"""
+    result = find_duplicates(df, threshold, near)
+    return df[result.keep], result.clusters
@@ -0,0 +1,136 @@
+"""Extraction des annonces (ad__card) depuis les pages HTML
+
+Plusieurs moteurs produisent exactement les mêmes enregistrements :
+- 'html.parser' : analyse BeautifulSoup complète et .find() par carte (historique)
+- 'lxml' : arbre lxml et requêtes XPath compilées (le plus rapide, dépendance optionnelle)
+"""
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml est optionnel
+    lxml = None
+
+NO_TYPE = "Non spécifié"
+NO_PRICE = "Prix non spécifié"
+NO_ADDRESS = "Adresse non spécifiée"
+NO_IMAGE = "Image non disponible"
+
+EXTRACTORS = {}
+
+
+def register_extractor(name):
+    """Déclarer un moteur d'extraction sous un nom"""
+    def decorator(func):
+        EXTRACTORS[name] = func
+        return func
+    return decorator
+
+
+def default_extractor_name():
+    """Moteur le plus rapide disponible"""
+    return 'lxml' if lxml is not None else 'html.parser'
+
+
+def get_extractor(name=None):
+    """Retourner la fonction d'extraction extract(html, category_name)"""
+    if name is None:
+        name = default_extractor_name()
+    try:
+        return EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Moteur d'extraction inconnu : {name} (disponibles : {', '.join(EXTRACTORS)})")
+
+
+def make_record(category_name, type_item, prix, adresse, image_lien):
+    return {
+        "categorie": category_name,
+        "type": type_item,
+        "prix": prix,
+        "adresse": adresse,
+        "image_lien": image_lien
+    }
+
+
+@register_extractor('html.parser')
+def extract_with_html_parser(html, category_name):
+    """Extraire les annonces avec BeautifulSoup (arbre complet, html.parser)"""
+    data = []
+    soup = BeautifulSoup(html, 'html.parser')
+    annonces = soup.find_all('div', class_='ad__card')
+
+    for annonce in annonces:
+        try:
+            # Extraire le type (vêtement ou chaussure)
+            type_element = annonce.find('p', class_='ad__card-description')
+            type_item = type_element.get_text(strip=True) if type_element else NO_TYPE
+
+            # Extraire le prix
+            prix_element = annonce.find('p', class_='ad__card-price')
+            prix = prix_element.get_text(strip=True) if prix_element else NO_PRICE
+
+            # Extraire l'adresse
+            location_element = annonce.find('p', class_='ad__card-location')
+            if location_element:
+                span_element = location_element.find('span')
+                adresse = span_element.get_text(strip=True) if span_element else NO_ADDRESS
+            else:
+                adresse = NO_ADDRESS
+
+            # Extraire le lien de l'image
+            img_element = annonce.find('img', class_='ad__card-img')
+            image_lien = img_element['src'] if img_element and 'src' in img_element.attrs else NO_IMAGE
+
+            data.append(make_record(category_name, type_item, prix, adresse, image_lien))
+
+        except Exception:
+            continue
+
+    return data
+
+
+if lxml is not None:
+    def _has_class(name):
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    XPATH_CARDS = etree.XPath(f"//div[{_has_class('ad__card')}]")
+    XPATH_TYPE = etree.XPath(f"(.//p[{_has_class('ad__card-description')}])[1]")
+    XPATH_PRICE = etree.XPath(f"(.//p[{_has_class('ad__card-price')}])[1]")
+    XPATH_LOCATION = etree.XPath(f"(.//p[{_has_class('ad__card-location')}])[1]")
+    XPATH_SPAN = etree.XPath("(.//span)[1]")
+    XPATH_IMG = etree.XPath(f"(.//img[{_has_class('ad__card-img')}])[1]")
+
+    def _text(element):
+        # Équivalent de BeautifulSoup.get_text(strip=True)
+        return ''.join(part.strip() for part in element.itertext())
+
+    @register_extractor('lxml')
+    def extract_with_lxml(html, category_name):
+        """Extraire les annonces avec lxml et des requêtes XPath précompilées"""
+        if not html or not html.strip():
+            return []
+        try:
+            root = lxml.html.fromstring(html)
+        except ValueError:
+            # Déclaration d'encodage XML dans une chaîne Unicode
+            root = lxml.html.fromstring(html.encode('utf-8'))
+
+        data = []
+        for annonce in XPATH_CARDS(root):
+            type_element = XPATH_TYPE(annonce)
+            prix_element = XPATH_PRICE(annonce)
+            location_element = XPATH_LOCATION(annonce)
+            span_element = XPATH_SPAN(location_element[0]) if location_element else None
+            img_element = XPATH_IMG(annonce)
+            image_lien = img_element[0].get('src') if img_element else None
+
+            data.append(make_record(
+                category_name,
+                _text(type_element[0]) if type_element else NO_TYPE,
+                _text(prix_element[0]) if prix_element else NO_PRICE,
+                _text(span_element[0]) if span_element else NO_ADDRESS,
+                image_lien if image_lien is not None else NO_IMAGE,
+            ))
+
+        return data
@@ -0,0 +1,140 @@
+"""Cache disque des pages d'annonces (requêtes conditionnelles, TTL, LRU)
+
+Chaque URL est stockée dans un fichier JSON (corps, ETag, Last-Modified,
+date de stockage). Une entrée plus jeune que le TTL est servie sans
+requête ; au-delà, la page est redemandée avec If-None-Match /
+If-Modified-Since et un 304 réutilise le corps en cache. La taille totale
+est bornée : les entrées les moins récemment utilisées (mtime du fichier)
+sont supprimées en premier. En mode hors ligne, seules les pages en cache
+sont servies, ce qui permet de rejouer un scraping sans réseau.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+CACHE_DIR = os.path.join('data', '.http_cache')
+DEFAULT_TTL = 3600
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """Page absente du cache en mode hors ligne"""
+
+
+class ResponseCache:
+    """Cache de réponses HTTP sur disque, partageable entre threads"""
+
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, offline=False):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total = sum(size for _, _, size in self._entries())
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def get(self, url):
+        """Entrée en cache pour l'URL (et marquage comme récemment utilisée), ou None"""
+        path = self._path(url)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def is_fresh(self, entry):
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def store(self, url, text, headers):
+        """Enregistrer une réponse 200 avec ses validateurs"""
+        self._write({
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored_at': time.time(),
+            'text': text,
+        })
+
+    def revalidated(self, entry):
+        """Prolonger une entrée confirmée par un 304"""
+        entry = dict(entry, stored_at=time.time())
+        self._write(entry)
+        return entry
+
+    def _write(self, entry):
+        path = self._path(entry['url'])
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        with self._lock:
+            try:
+                previous = os.path.getsize(path)
+            except OSError:
+                previous = 0
+            os.replace(tmp_path, path)
+            self._total += len(data) - previous
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Supprimer les entrées les moins récemment utilisées jusqu'à 90 % de la limite
+        entries = sorted(self._entries(), key=lambda item: item[1])
+        self._total = sum(size for _, _, size in entries)
+        target = 0.9 * self.max_bytes
+        for path, _, size in entries:
+            if self._total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total -= size
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total = 0
+
+    def fetch(self, session, url, limiter=None, timeout=10):
+        """Télécharger une page en passant par le cache"""
+        entry = self.get(url)
+        if entry is not None and (self.offline or self.is_fresh(entry)):
+            return entry['text']
+        if self.offline:
+            raise CacheMiss(f"Page absente du cache hors ligne : {url}")
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        if limiter is not None:
+            limiter.wait(url)
+        response = session.get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            return self.revalidated(entry)['text']
+        response.raise_for_status()
+        self.store(url, response.text, response.headers)
+        return response.text
@@ -0,0 +1,169 @@
+"""Index en mémoire pour filtrer les annonces du dashboard
+
+- catégorie, quartier et ville : un bitmap compressé (np.packbits) par valeur
+- prix : tableau trié des prix et positions correspondantes (recherche
+  par dichotomie d'un intervalle)
+- type : index inversé des mots (sans accents, en minuscules) vers les
+  valeurs distinctes de type, puis listes de positions par valeur
+
+Un filtre ne parcourt donc jamais les colonnes texte : chaque critère
+produit un bitmap, les bitmaps sont combinés par ET binaire.
+"""
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Mots d'un texte, en minuscules et sans accents"""
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return TOKEN_RE.findall(text)
+
+
+def _codes(series):
+    """Codes entiers (-1 pour les manquantes) et valeurs distinctes d'une colonne"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Index(uniques)
+
+
+def _postings(codes, count):
+    """Positions des lignes regroupées par code : order[starts[c]:starts[c + 1]]"""
+    order = np.argsort(codes, kind='stable')
+    starts = np.searchsorted(codes[order], np.arange(count + 1))
+    return order, starts
+
+
+class ListingIndex:
+    """Index des annonces d'un DataFrame (positions 0..n-1 dans l'ordre des lignes)"""
+
+    BITMAP_COLUMNS = ('categorie', 'quartier', 'ville')
+
+    def __init__(self, df):
+        self.size = len(df)
+        self._bitmaps = {}
+        self._values = {}
+        for column in self.BITMAP_COLUMNS:
+            if column in df.columns:
+                self._build_bitmaps(column, df[column])
+
+        prices = np.full(self.size, np.nan)
+        if 'prix_numerique' in df.columns:
+            prices = df['prix_numerique'].astype('float64').to_numpy(na_value=np.nan)
+        valid = np.flatnonzero(~np.isnan(prices))
+        order = np.argsort(prices[valid], kind='stable')
+        self._price_positions = valid[order]
+        self._sorted_prices = prices[valid][order]
+
+        self._vocabulary = []
+        self._token_codes = {}
+        if 'type' in df.columns:
+            self._build_text_index(df['type'])
+
+    def _build_bitmaps(self, column, series):
+        codes, values = _codes(series)
+        order, starts = _postings(codes, len(values))
+        counts = np.diff(starts)
+        bitmaps = {}
+        for code, value in enumerate(values):
+            if counts[code] == 0:
+                continue
+            bits = np.zeros(self.size, dtype=bool)
+            bits[order[starts[code]:starts[code + 1]]] = True
+            bitmaps[value] = np.packbits(bits)
+        self._bitmaps[column] = bitmaps
+        # Valeurs proposées dans les filtres, des plus fréquentes aux plus rares
+        self._values[column] = [values[code] for code in np.argsort(-counts, kind='stable') if counts[code]]
+
+    def _build_text_index(self, series):
+        codes, values = _codes(series)
+        self._type_order, self._type_starts = _postings(codes, len(values))
+        token_codes = {}
+        for code, value in enumerate(values):
+            for token in set(tokenize(value)):
+                token_codes.setdefault(token, []).append(code)
+        self._token_codes = {token: np.array(found) for token, found in token_codes.items()}
+        self._vocabulary = sorted(token_codes)
+
+    @property
+    def nbytes(self):
+        arrays = [self._price_positions, self._sorted_prices]
+        arrays += [bits for bitmaps in self._bitmaps.values() for bits in bitmaps.values()]
+        arrays += list(self._token_codes.values())
+        if self._vocabulary:
+            arrays += [self._type_order, self._type_starts]
+        return sum(array.nbytes for array in arrays)
+
+    def values(self, column):
+        """Valeurs distinctes présentes d'une colonne indexée (catégorie, quartier, ville)"""
+        return self._values.get(column, [])
+
+    def price_bounds(self):
+        if len(self._sorted_prices) == 0:
+            return None
+        return self._sorted_prices[0], self._sorted_prices[-1]
+
+    def _empty(self):
+        return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def _from_positions(self, positions):
+        bits = np.zeros(self.size, dtype=bool)
+        bits[positions] = True
+        return np.packbits(bits)
+
+    def values_bitmap(self, column, values):
+        """Lignes dont la colonne vaut l'une des valeurs (OU des bitmaps)"""
+        bitmap = self._empty()
+        bitmaps = self._bitmaps.get(column, {})
+        for value in values:
+            if value in bitmaps:
+                bitmap |= bitmaps[value]
+        return bitmap
+
+    def price_bitmap(self, low, high):
+        """Lignes dont le prix est dans [low, high]"""
+        start = np.searchsorted(self._sorted_prices, low, side='left')
+        end = np.searchsorted(self._sorted_prices, high, side='right')
+        return self._from_positions(self._price_positions[start:end])
+
+    def text_bitmap(self, query):
+        """Lignes dont le type contient tous les mots de la recherche (préfixes acceptés)"""
+        matched = None
+        for token in tokenize(query):
+            # Mots du vocabulaire commençant par le mot recherché : intervalle de la liste triée
+            start = bisect.bisect_left(self._vocabulary, token)
+            end = bisect.bisect_left(self._vocabulary, token + '\uffff')
+            found = [self._token_codes[word] for word in self._vocabulary[start:end]]
+            codes = np.unique(np.concatenate(found)) if found else np.array([], dtype=np.intp)
+            matched = codes if matched is None else np.intersect1d(matched, codes)
+        if matched is None:
+            return ~self._empty()
+        slices = [self._type_order[self._type_starts[code]:self._type_starts[code + 1]] for code in matched]
+        return self._from_positions(np.concatenate(slices) if slices else np.array([], dtype=np.intp))
+
+    def filter(self, categories=None, cities=None, price_range=None, query=None, districts=None):
+        """Masque booléen des lignes retenues, ou None si aucun filtre n'est actif"""
+        bitmaps = []
+        if categories:
+            bitmaps.append(self.values_bitmap('categorie', categories))
+        if cities:
+            bitmaps.append(self.values_bitmap('ville', cities))
+        if districts:
+            bitmaps.append(self.values_bitmap('quartier', districts))
+        if price_range is not None:
+            bitmaps.append(self.price_bitmap(*price_range))
+        if query and tokenize(query):
+            bitmaps.append(self.text_bitmap(query))
+        if not bitmaps:
+            return None
+        bitmap = bitmaps[0].copy()
+        for other in bitmaps[1:]:
+            bitmap &= other
+        return np.unpackbits(bitmap, count=self.size).astype(bool)
@@ -0,0 +1,155 @@
+"""Tâches de scraping en arrière-plan, partagées entre les sessions Streamlit
+
+Les tâches tournent dans un pool de threads indépendant de l'exécution du
+script : un rerun ou une interaction ne les interrompt pas. Leur état
+(progression, annonces déjà récupérées, erreurs) est consultable à tout
+moment via JobManager.get() / JobManager.list_jobs().
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .scraper import scrape_categories
+from .session import DEFAULT_RETRIES
+from .settings import DEFAULT_RATE, DEFAULT_WORKERS
+
+PENDING = 'en attente'
+RUNNING = 'en cours'
+DONE = 'terminée'
+CANCELLED = 'annulée'
+FAILED = 'échec'
+FINISHED_STATUSES = (DONE, CANCELLED, FAILED)
+
+
+class ScrapeJob:
+    """État d'une tâche de scraping, lu et modifié sous verrou"""
+
+    def __init__(self, urls, pages, options):
+        self.id = uuid.uuid4().hex[:8]
+        self.urls = dict(urls)
+        self.pages = pages
+        self.options = options
+        self.status = PENDING
+        self.created_at = time.time()
+        self.finished_at = None
+        self.error = None
+        self.progress = {name: 0 for name in self.urls}
+        self.records = {name: [] for name in self.urls}
+        self.errors = {name: [] for name in self.urls}
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    def snapshot(self):
+        """Copie cohérente de l'état de la tâche (annonces comprises)"""
+        with self._lock:
+            return {
+                'id': self.id,
+                'status': self.status,
+                'pages': self.pages,
+                'options': {key: value for key, value in self.options.items() if key != 'cache'},
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+                'error': self.error,
+                'progress': dict(self.progress),
+                'records': {name: list(records) for name, records in self.records.items()},
+                'errors': {name: list(errors) for name, errors in self.errors.items()},
+            }
+
+    def _set_status(self, status, error=None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            if status in FINISHED_STATUSES:
+                self.finished_at = time.time()
+
+    def _add_page(self, category_name, page, records):
+        with self._lock:
+            self.records[category_name].extend(records)
+
+    def _set_progress(self, category_name, done, total):
+        with self._lock:
+            self.progress[category_name] = done
+
+
+class JobManager:
+    """File de tâches de scraping commune à toutes les sessions"""
+
+    def __init__(self, max_running=2, max_history=20):
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(max_workers=max_running, thread_name_prefix='scrape-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, urls, pages, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, retries=DEFAULT_RETRIES,
+               **options):
+        """Mettre en file un scraping des catégories urls et retourner son identifiant"""
+        options.update(workers=workers, rate=rate, retries=retries)
+        job = ScrapeJob(urls, pages, options)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job.id
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        """Tâches de la plus récente à la plus ancienne"""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id):
+        """Demander l'arrêt d'une tâche ; les annonces déjà récupérées sont conservées"""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_event.set()
+        if job.status == PENDING:
+            job._set_status(CANCELLED)
+        return True
+
+    def remove(self, job_id):
+        """Oublier une tâche terminée"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+                return True
+        return False
+
+    def _prune(self):
+        # Ne garder que les max_history tâches terminées les plus récentes
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def _run(self, job):
+        if job.cancel_event.is_set():
+            job._set_status(CANCELLED)
+            return
+        job._set_status(RUNNING)
+        try:
+            results = scrape_categories(
+                job.urls, job.pages,
+                workers=job.options['workers'], rate=job.options['rate'], retries=job.options['retries'],
+                extractor=job.options.get('extractor'), cache=job.options.get('cache'),
+                progress_callback=job._set_progress,
+                page_callback=job._add_page,
+                cancel_event=job.cancel_event,
+            )
+        except Exception as e:
+            job._set_status(FAILED, error=str(e))
+            return
+
+        with job._lock:
+            for name, (_, errors) in results.items():
+                job.errors[name] = [(page, str(error)) for page, error in errors]
+        job._set_status(CANCELLED if job.cancel_event.is_set() else DONE)
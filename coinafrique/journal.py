@@ -0,0 +1,110 @@
+"""Journal de scraping sur disque : point de reprise après chaque page
+
+Le journal est un fichier JSON Lines. La première ligne décrit le scraping
+(URL, catégorie, nombre de pages), chaque ligne suivante contient les
+annonces d'une page terminée, et une dernière ligne marque la fin du
+scraping. Une coupure (réseau, redémarrage, rerun) ne fait perdre que les
+pages en cours : le scraping peut reprendre à partir des pages manquantes.
+"""
+import json
+import os
+import time
+
+JOURNAL_DIR = os.path.join('data', '.journal')
+
+
+class ScrapeJournal:
+    """Journal append-only des pages scrapées pour une catégorie"""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.finished = False
+        self._offsets = {}
+        self._valid_size = 0
+        if os.path.exists(path):
+            self._scan()
+
+    @classmethod
+    def path_for(cls, file_name, directory=JOURNAL_DIR):
+        return os.path.join(directory, f"{file_name}.jsonl")
+
+    @classmethod
+    def start(cls, path, url_base, category_name, pages, **extra):
+        """Créer un nouveau journal (écrase un éventuel journal précédent)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        header = {
+            'url': url_base,
+            'category': category_name,
+            'pages': pages,
+            'started_at': time.time(),
+            **extra
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'header': header}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        return cls(path)
+
+    @classmethod
+    def load(cls, path):
+        """Ouvrir un journal existant, ou None s'il n'existe pas"""
+        if not os.path.exists(path):
+            return None
+        journal = cls(path)
+        return journal if journal.header is not None else None
+
+    def _scan(self):
+        # Indexer la position de chaque page ; une dernière ligne tronquée
+        # (coupure pendant l'écriture) est ignorée
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if 'header' in entry:
+                    self.header = entry['header']
+                elif 'page' in entry:
+                    self._offsets[entry['page']] = offset
+                elif entry.get('finished'):
+                    self.finished = True
+                offset += len(line)
+            self._valid_size = offset
+
+    @property
+    def pages(self):
+        return self.header['pages'] if self.header else 0
+
+    def completed_pages(self):
+        return set(self._offsets)
+
+    def record_page(self, page, records):
+        """Écrire les annonces d'une page terminée et forcer l'écriture sur disque"""
+        self._append({'page': page, 'records': records})
+
+    def mark_finished(self):
+        self._append({'finished': True, 'finished_at': time.time()})
+        self.finished = True
+
+    def _append(self, entry):
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.path, 'r+b') as f:
+            # Écraser une éventuelle ligne tronquée laissée par une coupure
+            f.seek(self._valid_size)
+            f.truncate()
+            offset = f.tell()
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._valid_size = offset + len(line)
+        if 'page' in entry:
+            self._offsets[entry['page']] = offset
+
+    def iter_records(self):
+        """Relire les annonces dans l'ordre des pages, sans tout charger d'un coup"""
+        with open(self.path, 'rb') as f:
+            for page in sorted(self._offsets):
+                f.seek(self._offsets[page])
+                yield from json.loads(f.readline())['records']
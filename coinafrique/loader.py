@@ -0,0 +1,87 @@
+"""Chargement des fichiers d'annonces : CSV de l'application et exports Web Scraper
+
+Les exports Web Scraper (extension de navigateur) ne suivent pas le format
+de l'application : BOM, séparateur ';' ou ',', ligne d'en-tête factice
+(Column1;Column2;...) avant le vrai en-tête, colonnes nommées d'après les
+sélecteurs (Type_Habits, Prix, Image_Lien-href...). Le format est détecté
+sur les premières lignes, puis le fichier est lu par blocs de taille fixe :
+seules les colonnes utiles sont analysées et chaque bloc est converti au
+schéma typé avant le suivant, ce qui borne la mémoire même pour de très
+gros exports.
+"""
+import csv
+from collections import namedtuple
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from .schema import apply_schema, concat_listings
+from .settings import URLS
+
+CHUNK_ROWS = 50_000
+EXPORT_MARKER = 'web-scraper-order'
+START_URL_COLUMN = 'web-scraper-start-url'
+DUMMY_HEADER_PREFIX = 'Column1'
+LISTING_COLUMNS = ['categorie', 'type', 'prix', 'adresse', 'image_lien', 'lien_annonce']
+
+# Colonnes des exports Web Scraper -> schéma de l'application
+# (Image_Lien-href est le lien de l'annonce, pas celui de son image)
+EXPORT_COLUMNS = {
+    'Type_Habits': 'type', 'Type_Chaussures': 'type', 'Type_Habit': 'type', 'Type_Chaussure': 'type',
+    'Prix': 'prix', 'Adresse': 'adresse', 'Image_lien-src': 'image_lien', 'Image_Lien-href': 'lien_annonce',
+}
+
+# Slug de l'URL de départ (/categorie/vetements-homme) -> nom de catégorie
+CATEGORY_SLUGS = {url.rstrip('/').rsplit('/', 1)[-1]: name for name, url in URLS.items()}
+
+CsvFormat = namedtuple('CsvFormat', ['sep', 'skiprows', 'columns', 'export'])
+
+
+def sniff_format(path):
+    """Détecter séparateur, en-tête factice et type de fichier (export ou CSV de l'app)"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        lines = [f.readline(), f.readline()]
+    first = lines[0]
+    sep = ';' if first.count(';') > first.count(',') else ','
+    skiprows = 1 if first.startswith(DUMMY_HEADER_PREFIX) else 0
+    columns = next(csv.reader([lines[skiprows]], delimiter=sep), [])
+    return CsvFormat(sep, skiprows, columns, EXPORT_MARKER in columns)
+
+
+def category_from_start_url(url):
+    """Nom de catégorie d'après le slug de l'URL de départ du scraping"""
+    slug = urlparse(str(url)).path.rstrip('/').rsplit('/', 1)[-1]
+    return CATEGORY_SLUGS.get(slug, slug.replace('-', ' ').title())
+
+
+def _export_chunk(chunk):
+    chunk = chunk.rename(columns=EXPORT_COLUMNS)
+    if START_URL_COLUMN in chunk.columns:
+        # Une poignée d'URL de départ : catégorie calculée une fois par valeur distincte
+        codes, urls = pd.factorize(chunk[START_URL_COLUMN])
+        name_codes, categories = pd.factorize(pd.Index([category_from_start_url(url) for url in urls]), sort=True)
+        # Le -1 ajouté en fin de tableau propage les URL manquantes (code -1)
+        codes = np.append(name_codes, -1)[codes]
+        chunk['categorie'] = pd.Categorical.from_codes(codes, categories=categories)
+    return chunk[[column for column in LISTING_COLUMNS if column in chunk.columns]]
+
+
+def iter_listing_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Lire un fichier d'annonces par blocs, chacun au schéma typé de l'application"""
+    fmt = sniff_format(path)
+    options = {}
+    if fmt.export:
+        options['usecols'] = [column for column in fmt.columns if column in EXPORT_COLUMNS or column == START_URL_COLUMN]
+        options['dtype'] = str
+    reader = pd.read_csv(
+        path, sep=fmt.sep, skiprows=fmt.skiprows, encoding='utf-8-sig', chunksize=chunk_rows, **options
+    )
+    with reader:
+        for chunk in reader:
+            yield apply_schema(_export_chunk(chunk) if fmt.export else chunk)
+
+
+def read_listings(path, chunk_rows=CHUNK_ROWS):
+    """Charger un fichier d'annonces complet (CSV de l'app ou export Web Scraper)"""
+    return concat_listings(list(iter_listing_chunks(path, chunk_rows)))
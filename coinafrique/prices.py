@@ -0,0 +1,142 @@
+"""Analyse des prix bruts des annonces
+
+Formats reconnus :
+
+- montants avec séparateurs de milliers (espace, espace insécable, point,
+  virgule) : "12 000CFA", "1.500.000 F", "12,000" ;
+- décimales (1 ou 2 chiffres) : "12,5k", "45.99 €" ;
+- multiplicateurs : "15k", "20 mille", "1,2 million" ;
+- devises : FCFA / CFA / F / XOF (par défaut) et euro, converti au taux
+  fixe de la parité FCFA-euro ;
+- fourchettes : "12 000CFA - 15 000CFA", "10 à 15k" (le multiplicateur de
+  la borne haute s'applique à la borne basse s'il manque, à condition que
+  la borne basse reste inférieure). Une fourchette n'est retenue que si
+  ses deux bornes ressemblent à des montants (devise ou multiplicateur
+  des deux côtés, ou borne basse d'au moins un dixième de la borne
+  haute) ; sinon la borne basse est une taille ou une quantité et seule
+  la borne haute compte : "Taille 42 - 10 000 F", "Lot de 3 à 10 000F",
+  "500 à 15k" valent 10 000, 10 000 et 15 000 ;
+- "Prix sur demande", "à débattre" : pas de prix ;
+- mesures (nombre suivi de m2 / m² / cm / kg / h, ou de m sans devise
+  derrière : "45 m2", "24h", "2m") : pas un prix.
+
+Si le texte contient plusieurs nombres, le premier suivi d'une devise est
+retenu ("2 pièces 5000F"), à défaut le premier nombre.
+
+Le prix retenu pour une fourchette est son milieu. L'expression régulière
+est compilée une fois et appliquée aux seules valeurs distinctes de la
+colonne (quelques centaines au plus, analysées par une simple boucle
+finditer), les résultats sont redistribués aux lignes.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+from .schema import to_int64
+
+EUR_TO_FCFA = 655.957
+
+NUMBER = r'\d{1,3}(?:[ \u00a0\u202f.,]\d{3})+(?!\d)(?:[.,]\d{1,2}(?!\d))?|\d+(?:[.,]\d{1,2}(?!\d))?'
+MULTIPLIER = r'millions?|mille|k(?![a-z])|m(?![a-z0-9²])'
+CURRENCY = r'f\s?cfa|cfa|xof|frs?(?![a-z])|f(?![a-z])|€|eur(?:os?)?(?![a-z])'
+RANGE_SEPARATOR = r'-|–|—|à|a|au'
+# "2m F" est un multiplicateur (2 millions), "2m" seul une longueur
+MEASURE = rf'm2(?!\d)|m²|cm(?![a-z])|kg(?![a-z])|h(?![a-z])|m(?![a-z0-9²])(?!\s*(?:{CURRENCY}))'
+
+PRICE_RE = re.compile(rf'''
+    (?P<low>{NUMBER})\s*(?:(?P<measure>{MEASURE})|
+    (?P<low_unit>{MULTIPLIER})?\s*(?P<low_currency>{CURRENCY})?\s*
+    (?:(?:{RANGE_SEPARATOR})\s*(?P<high>{NUMBER})(?!\d|\s*(?:{MEASURE}))
+    \s*(?P<high_unit>{MULTIPLIER})?\s*(?P<high_currency>{CURRENCY})?)?)
+''', re.IGNORECASE | re.VERBOSE)
+EURO_RE = re.compile(r'€|\beur(?:os?)?\b', re.IGNORECASE)
+ON_REQUEST_RE = re.compile(r'sur\s+demande|[àa]\s+d[ée]battre', re.IGNORECASE)
+THOUSANDS_RE = re.compile(r'[ \u00a0\u202f.,](?=\d{3}(?!\d))')
+
+MULTIPLIERS = {'k': 1e3, 'mille': 1e3, 'm': 1e6, 'million': 1e6, 'millions': 1e6}
+
+
+def _amount(number, unit):
+    """Montant (float) d'un nombre extrait et de son multiplicateur, NaN si absent"""
+    if number is None:
+        return np.nan
+    value = float(THOUSANDS_RE.sub('', number).replace(',', '.'))
+    return value * MULTIPLIERS.get(unit.lower(), 1.0) if unit else value
+
+
+def _bounds(text):
+    """(min, max) d'un prix brut, hors devise : premier montant suivi d'une devise, sinon premier montant"""
+    match = None
+    for candidate in PRICE_RE.finditer(text):
+        if candidate['measure']:
+            continue
+        if candidate['low_currency'] or candidate['high_currency']:
+            match = candidate
+            break
+        match = match or candidate
+    if match is None:
+        return np.nan, np.nan
+
+    low = _amount(match['low'], match['low_unit'])
+    high = _amount(match['high'], match['high_unit'])
+    if np.isnan(high):
+        return low, low
+    # Multiplicateur de la borne haute reporté sur la borne basse ("10 à 15k"),
+    # sauf s'il la rendrait plus grande que la borne haute ("500 à 15k")
+    if not match['low_unit'] and match['high_unit']:
+        carried = _amount(match['low'], match['high_unit'])
+        if carried <= high:
+            low = carried
+    # Taille ou quantité devant un montant ("Taille 42 - 10 000 F") : seule la borne haute compte
+    marked = all(match[f'{side}_unit'] or match[f'{side}_currency'] for side in ('low', 'high'))
+    if not marked and low < high / 10:
+        return high, high
+    return min(low, high), max(low, high)
+
+
+def _price_bounds(values):
+    """(min, max, euro, sur_demande) de prix bruts distincts, montants en FCFA (NaN si absents)"""
+    texts = [str(value) for value in values]
+    bounds = np.array([_bounds(text) for text in texts], dtype='float64').reshape(-1, 2)
+    on_request = np.array([ON_REQUEST_RE.search(text) is not None for text in texts], dtype=bool)
+    euro = np.array([EURO_RE.search(text) is not None for text in texts], dtype=bool)
+
+    rate = np.where(euro, EUR_TO_FCFA, 1.0)
+    low, high = np.round(bounds[:, 0] * rate), np.round(bounds[:, 1] * rate)
+    low[on_request] = np.nan
+    high[on_request] = np.nan
+    return low, high, euro, on_request
+
+
+def price_table(values):
+    """Analyse de prix bruts distincts : table [prix_min, prix_max, devise, sur_demande]
+
+    Les montants sont en FCFA (entiers, NA si le prix est absent ou
+    illisible) ; devise est la devise d'origine.
+    """
+    low, high, euro, on_request = _price_bounds(values)
+    currency = np.where(np.isnan(low), None, np.where(euro, 'EUR', 'FCFA'))
+    return pd.DataFrame({
+        'prix_min': to_int64(low).array,
+        'prix_max': to_int64(high).array,
+        'devise': pd.Categorical(currency, categories=['FCFA', 'EUR']),
+        'sur_demande': on_request,
+    })
+
+
+def price_values(values):
+    """Prix retenus (Int64, FCFA) de prix bruts distincts : milieu de la fourchette"""
+    low, high, _, _ = _price_bounds(values)
+    return to_int64(np.round((low + high) / 2)).array
+
+
+def parse_prices(series):
+    """Prix numériques (Int64, FCFA) d'une colonne de prix bruts, une analyse par valeur distincte"""
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return pd.Series(pd.NA, index=series.index, name=series.name, dtype='Int64')
+    return pd.Series(
+        take(price_values(uniques), codes, allow_fill=True), index=series.index, name=series.name
+    )
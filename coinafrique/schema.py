@@ -0,0 +1,89 @@
+"""Schéma typé de la table des annonces
+
+- catégoriels pour le texte à faible cardinalité (categorie, adresse, type,
+  quartier, ville, pays)
+- entier nullable (Int64) pour le prix numérique
+- booléens pour les indicateurs a_prix / a_image
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+CATEGORY_COLUMNS = ['categorie', 'adresse', 'type', 'quartier', 'ville', 'pays']
+INTEGER_COLUMNS = ['prix_numerique']
+BOOL_COLUMNS = ['a_prix', 'a_image']
+NO_IMAGE = "Image non disponible"
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def to_int64(values):
+    """Convertir en Int64 nullable ; valeurs non entières ou hors bornes -> NA"""
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+        # Tableau de flottants (prix analysés) : masque calculé directement, sans to_numeric
+        valid = np.isfinite(values) & (np.abs(values) < INT64_MAX) & (values == np.floor(values))
+        return pd.Series(pd.arrays.IntegerArray(np.where(valid, values, 0).astype(np.int64), ~valid))
+    numbers = pd.to_numeric(pd.Series(values), errors='coerce')
+    if pd.api.types.is_integer_dtype(numbers):
+        return numbers.astype('Int64')
+    numbers = numbers.astype('float64')
+    valid = numbers.notna() & (numbers.abs() < INT64_MAX) & (numbers == np.floor(numbers))
+    return numbers.where(valid).astype('Int64')
+
+
+def to_bool(values):
+    """Convertir en booléen, y compris depuis les chaînes 'True' / 'False' d'un CSV"""
+    if pd.api.types.is_bool_dtype(values):
+        return values.astype(bool)
+    return values.astype(str).str.strip().str.lower().isin(['true', '1'])
+
+
+def apply_schema(df):
+    """Appliquer le schéma typé aux colonnes présentes (et dériver les indicateurs manquants)"""
+    if df.empty:
+        return df
+
+    df = df.copy(deep=False)
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    for column in INTEGER_COLUMNS:
+        if column in df.columns and df[column].dtype != 'Int64':
+            df[column] = to_int64(df[column]).array
+    for column in BOOL_COLUMNS:
+        if column in df.columns and df[column].dtype != bool:
+            df[column] = to_bool(df[column])
+
+    if 'a_prix' not in df.columns and 'prix_numerique' in df.columns:
+        df['a_prix'] = df['prix_numerique'].notna()
+    if 'a_image' not in df.columns and 'image_lien' in df.columns:
+        df['a_image'] = df['image_lien'] != NO_IMAGE
+
+    return df
+
+
+def concat_listings(frames):
+    """Concaténer des tables d'annonces en conservant les colonnes catégorielles
+
+    pd.concat retombe sur des chaînes dès que les catégories diffèrent d'un
+    fichier à l'autre ; on unit donc les catégories au préalable.
+    """
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    categorical = [
+        column for column in CATEGORY_COLUMNS
+        if all(column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype) for df in frames)
+    ]
+    unions = {
+        column: union_categoricals([df[column] for df in frames], sort_categories=True).categories
+        for column in categorical
+    }
+    frames = [
+        df.assign(**{column: df[column].cat.set_categories(categories) for column, categories in unions.items()})
+        for df in frames
+    ]
+    return pd.concat(frames, ignore_index=True)
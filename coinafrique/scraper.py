@@ -0,0 +1,219 @@
+"""Scraping concurrent des pages d'annonces CoinAfrique"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from .extract import get_extractor
+from .session import DEFAULT_RETRIES, shared_session
+from .settings import DEFAULT_RATE, DEFAULT_WORKERS
+
+REQUEST_TIMEOUT = 10
+
+
+class HostRateLimiter:
+    """Limiter le nombre de requêtes par seconde vers chaque hôte"""
+
+    def __init__(self, rate=DEFAULT_RATE):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """Attendre le prochain créneau libre pour l'hôte de l'URL"""
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def page_url(url_base, page):
+    """Construire l'URL d'une page de catégorie"""
+    return f"{url_base}?page={page}"
+
+
+def fetch_page(session, url, limiter=None, timeout=REQUEST_TIMEOUT, cache=None):
+    """Télécharger une page via la session en respectant le limiteur de débit
+
+    Avec un cache (coinafrique.httpcache.ResponseCache), les pages fraîches
+    sont servies depuis le disque et les autres sont revalidées.
+    """
+    if cache is not None:
+        return cache.fetch(session, url, limiter=limiter, timeout=timeout)
+    if limiter is not None:
+        limiter.wait(url)
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def iter_pages(url_base, page_numbers, fetch, workers=DEFAULT_WORKERS):
+    """Télécharger les pages en parallèle et les restituer dans l'ordre
+
+    Génère des tuples (page, html, erreur). Au plus 2 x workers pages sont
+    soumises à l'avance ; l'arrêt du générateur annule les pages en attente.
+    """
+    workers = max(1, int(workers))
+    page_numbers = iter(page_numbers)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scraper')
+
+    def submit_next():
+        for page in page_numbers:
+            pending.append((page, executor.submit(fetch, page_url(url_base, page))))
+            return
+
+    try:
+        for _ in range(2 * workers):
+            submit_next()
+
+        while pending:
+            page, future = pending.popleft()
+            submit_next()
+            try:
+                yield page, future.result(), None
+            except Exception as e:
+                yield page, None, e
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def scrape_category(url_base, category_name, pages, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                    retries=DEFAULT_RETRIES, session=None, extractor=None, limiter=None,
+                    progress_callback=None, page_callback=None, cancel_event=None, stop_when=None,
+                    journal=None, cache=None):
+    """Scraper une catégorie page par page avec un pool de requêtes concurrentes
+
+    Retourne la liste des annonces (dans l'ordre des pages) et la liste des
+    erreurs sous forme de tuples (page, exception) pour les pages perdues
+    malgré les relances. progress_callback(page, pages) et
+    page_callback(page, annonces_de_la_page) sont appelés dans le thread
+    appelant après chaque page traitée. extractor choisit le moteur
+    d'extraction (voir coinafrique.extract), le plus rapide disponible par défaut.
+    Un limiteur partagé peut être fourni pour plafonner le débit de plusieurs
+    scrapings simultanés vers le même hôte. Si cancel_event (threading.Event)
+    est levé, le scraping s'arrête après la page en cours. stop_when(annonces)
+    permet d'arrêter la pagination après une page (mode incrémental).
+
+    Avec un journal (coinafrique.journal.ScrapeJournal), chaque page terminée
+    est écrite sur disque, les pages déjà présentes dans le journal sont
+    sautées (reprise) et les annonces retournées sont relues depuis le
+    journal au lieu d'être gardées en mémoire. cache est un éventuel cache
+    disque des réponses HTTP (voir fetch_page).
+    """
+    extract = get_extractor(extractor)
+    if session is None:
+        session = shared_session(pool_size=workers, retries=retries)
+    if limiter is None:
+        limiter = HostRateLimiter(rate)
+    data = []
+    errors = []
+
+    def fetch(url):
+        return fetch_page(session, url, limiter=limiter, cache=cache)
+
+    page_numbers = range(1, pages + 1)
+    done = 0
+    if journal is not None:
+        completed = journal.completed_pages()
+        page_numbers = [page for page in page_numbers if page not in completed]
+        done = pages - len(page_numbers)
+
+    interrupted = False
+    for page, html, error in iter_pages(url_base, page_numbers, fetch, workers):
+        done += 1
+        records = []
+        if error is None:
+            try:
+                records = extract(html, category_name)
+            except Exception as e:
+                error = e
+        if error is not None:
+            errors.append((page, error))
+        elif journal is not None:
+            journal.record_page(page, records)
+        if journal is None:
+            data.extend(records)
+        if page_callback is not None:
+            page_callback(page, records)
+        if progress_callback is not None:
+            progress_callback(done, pages)
+        if cancel_event is not None and cancel_event.is_set():
+            interrupted = True
+            break
+        if stop_when is not None and error is None and stop_when(records):
+            break
+
+    if journal is not None:
+        if not errors and not interrupted:
+            journal.mark_finished()
+        data = journal.iter_records()
+
+    return data, errors
+
+
+def scrape_categories(urls, pages, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, retries=DEFAULT_RETRIES,
+                      extractor=None, progress_callback=None, page_callback=None, cancel_event=None,
+                      stop_when=None, journals=None, cache=None):
+    """Scraper plusieurs catégories en même temps
+
+    urls associe chaque nom de catégorie à son URL de base. Chaque catégorie
+    dispose de son propre pool de workers requêtes ; le débit par hôte reste
+    plafonné globalement à rate requêtes par seconde. progress_callback
+    (categorie, page, pages) et page_callback(categorie, page, annonces) sont
+    appelés dans le thread appelant. stop_when(categorie, annonces) est évalué
+    dans le thread de la catégorie pour arrêter sa pagination. journals associe
+    éventuellement à chaque catégorie son journal de reprise.
+
+    Retourne un dictionnaire categorie -> (annonces, erreurs).
+    """
+    session = shared_session(pool_size=workers * len(urls), retries=retries)
+    limiter = HostRateLimiter(rate)
+    updates = queue.Queue()
+
+    def run(category_name, url_base):
+        def on_page(page, records):
+            updates.put((category_name, 'page', (page, records)))
+
+        def report(done, total):
+            updates.put((category_name, 'progress', (done, total)))
+
+        def stop(records):
+            return stop_when(category_name, records)
+
+        return scrape_category(
+            url_base, category_name, pages, workers=workers, session=session,
+            extractor=extractor, limiter=limiter, progress_callback=report,
+            page_callback=on_page, cancel_event=cancel_event,
+            stop_when=stop if stop_when is not None else None,
+            journal=(journals or {}).get(category_name), cache=cache
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, len(urls)), thread_name_prefix='categorie') as executor:
+        futures = {name: executor.submit(run, name, url) for name, url in urls.items()}
+
+        # Relayer la progression dans le thread appelant (Streamlit n'accepte
+        # pas les mises à jour depuis les threads du pool)
+        while not all(future.done() for future in futures.values()) or not updates.empty():
+            try:
+                category_name, kind, args = updates.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            callback = page_callback if kind == 'page' else progress_callback
+            if callback is not None:
+                callback(category_name, *args)
+
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = ([], [(0, e)])
+        return results
@@ -0,0 +1,126 @@
+"""Index persistant des annonces déjà collectées (scraping incrémental)
+
+Chaque annonce est identifiée par l'ID présent dans son lien d'annonce ou
+dans le nom de son image (thumb_<id>_...), à défaut par l'URL de l'image,
+à défaut par son texte (type, prix, adresse). L'index est un simple fichier
+texte, une clé par ligne, complété au fil des scrapings.
+"""
+import csv
+import os
+import re
+import threading
+
+SEEN_DIR = os.path.join('data', '.seen')
+
+ANNONCE_ID_RE = re.compile(r'/annonce/.*?-(\d+)(?:[/?#]|$)')
+IMAGE_ID_RE = re.compile(r'thumb_(\d+)_')
+NO_IMAGE = "Image non disponible"
+# Colonnes lues par listing_key
+KEY_COLUMNS = ['lien_annonce', 'image_lien', 'type', 'prix', 'adresse']
+
+
+def listing_key(record):
+    """Clé stable d'une annonce (dictionnaire ou ligne CSV)"""
+    lien = record.get('lien_annonce') or ''
+    match = ANNONCE_ID_RE.search(lien)
+    if match:
+        return f"annonce:{match.group(1)}"
+
+    image = (record.get('image_lien') or '').strip()
+    if image and image != NO_IMAGE:
+        match = IMAGE_ID_RE.search(image)
+        if match:
+            return f"image:{match.group(1)}"
+        return f"url:{image}"
+
+    texte = '|'.join(str(record.get(col) or '').strip().lower() for col in ('type', 'prix', 'adresse'))
+    return f"texte:{texte}"
+
+
+def frame_records(df):
+    """Lignes d'un DataFrame d'annonces pour listing_key (valeurs manquantes -> None)"""
+    records = df[[column for column in KEY_COLUMNS if column in df.columns]].astype(object)
+    return records.where(records.notna(), None).to_dict('records')
+
+
+class SeenIndex:
+    """Ensemble de clés d'annonces persisté dans un fichier texte"""
+
+    def __init__(self, path):
+        self.path = path
+        self._keys = set()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._keys.update(line.rstrip('\n') for line in f if line.strip())
+
+    @classmethod
+    def for_category(cls, file_prefix, seed_files=(), directory=SEEN_DIR):
+        """Index d'une catégorie, initialisé depuis les CSV existants au premier usage
+
+        L'index doit ensuite suivre chaque sauvegarde du CSV, complète ou
+        incrémentale (add), sans quoi un scraping incrémental ajouterait à
+        nouveau des annonces déjà écrites par un scraping complet.
+        """
+        index = cls(os.path.join(directory, f"{file_prefix}.txt"))
+        if not os.path.exists(index.path):
+            for path in seed_files:
+                index.seed_from_csv(path)
+            index.save()
+        return index
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def is_known(self, record):
+        return listing_key(record) in self._keys
+
+    def page_is_known(self, records):
+        """Vrai si toutes les annonces de la page sont déjà connues"""
+        return all(listing_key(record) in self._keys for record in records)
+
+    def new_records(self, records):
+        """Annonces jamais vues (sans doublon au sein du lot)"""
+        new, keys = [], set()
+        for record in records:
+            key = listing_key(record)
+            if key not in self._keys and key not in keys:
+                keys.add(key)
+                new.append(record)
+        return new
+
+    def seed_from_csv(self, path):
+        """Ajouter les annonces d'un CSV existant (raw ou cleaned) à l'index"""
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            keys = {listing_key(row) for row in csv.DictReader(f)}
+        with self._lock:
+            before = len(self._keys)
+            self._keys.update(keys)
+            return len(self._keys) - before
+
+    def add(self, records):
+        """Enregistrer des annonces dans l'index et sur disque"""
+        keys = {listing_key(record) for record in records}
+        with self._lock:
+            keys -= self._keys
+            if not keys:
+                return 0
+            self._keys.update(keys)
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(f"{key}\n" for key in sorted(keys))
+        return len(keys)
+
+    def save(self):
+        """Réécrire entièrement le fichier d'index"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(f"{key}\n" for key in sorted(self._keys))
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,58 @@
+"""Session HTTP partagée pour le scraping (keep-alive, pool et relances)"""
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .settings import DEFAULT_RETRIES
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+HEADERS = {'User-Agent': USER_AGENT}
+
+# Relances sur 429/5xx : attente backoff * 2^n + aléa, ou Retry-After si fourni
+DEFAULT_BACKOFF = 0.5
+DEFAULT_JITTER = 0.5
+MAX_BACKOFF = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_retry(retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, jitter=DEFAULT_JITTER):
+    """Construire la politique de relance (backoff exponentiel avec aléa)"""
+    options = dict(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        respect_retry_after_header=True,
+        raise_on_status=True,
+    )
+    try:
+        return Retry(backoff_jitter=jitter, backoff_max=MAX_BACKOFF, **options)
+    except TypeError:
+        # urllib3 < 2 : pas d'aléa ni de plafond configurable
+        return Retry(**options)
+
+
+def create_session(pool_size=10, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, jitter=DEFAULT_JITTER):
+    """Créer une session avec pool de connexions, en-têtes communs et relances"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=max(1, int(pool_size)),
+        max_retries=build_retry(retries, backoff, jitter),
+        pool_block=True,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@lru_cache(maxsize=8)
+def shared_session(pool_size=10, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, jitter=DEFAULT_JITTER):
+    """Session partagée entre les scrapings ayant les mêmes réglages"""
+    return create_session(pool_size, retries, backoff, jitter)
@@ -0,0 +1,33 @@
+"""Catégories scrapées et réglages par défaut du scraping
+
+Module sans dépendance : l'application et le chargement des fichiers
+l'importent sans charger requests ni les moteurs d'extraction HTML, qui ne
+sont utiles qu'au moment de scraper (voir scraper.py et session.py).
+"""
+
+# Valeurs par défaut : 4 requêtes simultanées, 4 requêtes par seconde et par hôte
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 4.0
+# Relances d'une page en erreur (voir session.build_retry)
+DEFAULT_RETRIES = 3
+
+# URLs de base pour chaque catégorie
+URLS = {
+    'Vêtements Homme': 'https://sn.coinafrique.com/categorie/vetements-homme',
+    'Chaussures Homme': 'https://sn.coinafrique.com/categorie/chaussures-homme',
+    'Vêtements Enfants': 'https://sn.coinafrique.com/categorie/vetements-enfants',
+    'Chaussures Enfants': 'https://sn.coinafrique.com/categorie/chaussures-enfants'
+}
+
+# Préfixes des fichiers CSV de chaque catégorie
+FILE_PREFIXES = {
+    'Vêtements Homme': 'vetements_homme',
+    'Chaussures Homme': 'chaussures_homme',
+    'Vêtements Enfants': 'vetements_enfants',
+    'Chaussures Enfants': 'chaussures_enfants'
+}
+
+
+def category_file_name(category_name, clean_data=True):
+    """Nom du fichier CSV d'une catégorie, ex. vetements_homme_cleaned"""
+    return f"{FILE_PREFIXES[category_name]}_{'cleaned' if clean_data else 'raw'}"
@@ -0,0 +1,321 @@
+"""Statistiques de prix incrémentales (ingestion au fil de l'eau)
+
+Les statistiques sont mises à jour par lots de lignes (une page scrapée,
+un bloc de fichier, les lignes ajoutées à un CSV) sans jamais relire les
+données déjà vues :
+
+- effectif, moyenne et variance : algorithme de Welford, fusion de lots
+  par la formule de Chan ;
+- quantiles approchés : sketch à classes logarithmiques (type DDSketch),
+  erreur relative bornée (1 % par défaut) et fusionnable ;
+- histogramme : les classes du sketch.
+
+Les statistiques sont tenues globalement, par catégorie et par ville (les
+lignes brutes sans colonne ville sont découpées à la volée), et
+sauvegardées en JSON dans data/.stats entre deux exécutions.
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .address import address_levels
+from .prices import parse_prices
+
+STATS_DIR = os.path.join('data', '.stats')
+STATS_VERSION = 2
+DEFAULT_ACCURACY = 0.01
+GROUP_COLUMNS = ('categorie', 'ville')
+
+PriceMetrics = namedtuple('PriceMetrics', [
+    'total', 'price_count', 'price_mean', 'price_std', 'price_median', 'n_categories', 'n_cities',
+])
+
+
+class RunningStats:
+    """Effectif, moyenne, variance (Welford / Chan), minimum et maximum"""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, minimum=None, maximum=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = minimum
+        self.max = maximum
+
+    def update(self, values):
+        """Ajouter un lot de valeurs (tableau numpy sans NaN)"""
+        if len(values) == 0:
+            return
+        batch = RunningStats(
+            len(values), float(values.mean()), float(((values - values.mean()) ** 2).sum()),
+            float(values.min()), float(values.max())
+        )
+        self.merge(batch)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['count'], data['mean'], data['m2'], data['min'], data['max'])
+
+
+class QuantileSketch:
+    """Quantiles approchés à erreur relative bornée, sur des classes logarithmiques"""
+
+    def __init__(self, relative_accuracy=DEFAULT_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero = 0
+        self.count = 0
+
+    def update(self, values):
+        """Ajouter un lot de valeurs (tableau numpy sans NaN)"""
+        positive = values[values > 0]
+        self.zero += len(values) - len(positive)
+        self.count += len(values)
+        if len(positive) == 0:
+            return
+        indexes = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        keys, counts = np.unique(indexes, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Impossible de fusionner des sketches de précisions différentes")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero += other.zero
+        self.count += other.count
+
+    def _value(self, key):
+        # Représentant de la classe ]gamma^(k-1), gamma^k] à erreur relative minimale
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.buckets))
+
+    def histogram(self):
+        """Classes non vides : table [debut, fin, count]"""
+        keys = sorted(self.buckets)
+        rows = [(0.0, 0.0, self.zero)] if self.zero else []
+        rows += [(self.gamma ** (key - 1), self.gamma ** key, self.buckets[key]) for key in keys]
+        return pd.DataFrame(rows, columns=['debut', 'fin', 'count'])
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'zero': self.zero,
+            'buckets': {str(key): count for key, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'])
+        sketch.zero = data['zero']
+        sketch.buckets = {int(key): count for key, count in data['buckets'].items()}
+        sketch.count = sketch.zero + sum(sketch.buckets.values())
+        return sketch
+
+
+class GroupStats:
+    """Statistiques d'un groupe d'annonces : lignes, moments et quantiles des prix"""
+
+    def __init__(self, relative_accuracy=DEFAULT_ACCURACY):
+        self.rows = 0
+        self.prices = RunningStats()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def update(self, prices):
+        """Ajouter un lot de lignes (prix en float, NaN pour les annonces sans prix)"""
+        self.rows += len(prices)
+        values = prices[~np.isnan(prices)]
+        self.prices.update(values)
+        self.sketch.update(values)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.prices.merge(other.prices)
+        self.sketch.merge(other.sketch)
+
+    def quantile(self, q):
+        value = self.sketch.quantile(q)
+        if value is None:
+            return None
+        # Le représentant de classe peut sortir de [min, max] observés
+        return min(max(value, self.prices.min), self.prices.max)
+
+    def to_dict(self):
+        return {'rows': self.rows, 'prices': self.prices.to_dict(), 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        group = cls(data['sketch']['relative_accuracy'])
+        group.rows = data['rows']
+        group.prices = RunningStats.from_dict(data['prices'])
+        group.sketch = QuantileSketch.from_dict(data['sketch'])
+        return group
+
+
+def _price_array(df):
+    if 'prix_numerique' in df.columns:
+        prices = df['prix_numerique']
+    elif 'prix' in df.columns:
+        prices = parse_prices(df['prix'])
+    else:
+        return np.full(len(df), np.nan)
+    return prices.astype('float64').to_numpy(na_value=np.nan)
+
+
+class PriceStats:
+    """Statistiques de prix globales, par catégorie et par ville, mises à jour par lots"""
+
+    def __init__(self, relative_accuracy=DEFAULT_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.overall = GroupStats(relative_accuracy)
+        self.groups = {column: {} for column in GROUP_COLUMNS}
+
+    @property
+    def total(self):
+        return self.overall.rows
+
+    def update(self, data):
+        """Ajouter des annonces (DataFrame ou liste de dictionnaires, prix brut ou numérique)"""
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame.from_records(list(data))
+        if df.empty:
+            return
+        prices = _price_array(df)
+        self.overall.update(prices)
+        for column in GROUP_COLUMNS:
+            if column == 'ville' and column not in df.columns and 'adresse' in df.columns:
+                series = address_levels(df['adresse'])['ville']
+            elif column in df.columns:
+                series = df[column]
+            else:
+                continue
+            codes, values = pd.factorize(series)
+            order = np.argsort(codes, kind='stable')
+            starts = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            groups = self.groups[column]
+            for code, value in enumerate(values):
+                if starts[code] == starts[code + 1]:
+                    continue
+                group = groups.setdefault(str(value), GroupStats(self.relative_accuracy))
+                group.update(prices[order[starts[code]:starts[code + 1]]])
+
+    def merge(self, other):
+        self.overall.merge(other.overall)
+        for column, groups in other.groups.items():
+            for value, group in groups.items():
+                self.groups[column].setdefault(value, GroupStats(self.relative_accuracy)).merge(group)
+
+    @property
+    def nbytes(self):
+        """Taille mémoire approximative (classes des sketches et groupes)"""
+        groups = [self.overall] + [group for groups in self.groups.values() for group in groups.values()]
+        return sum(200 + 64 * len(group.sketch.buckets) for group in groups)
+
+    def group(self, column, value):
+        return self.groups[column].get(value)
+
+    def metrics(self):
+        """Indicateurs du dashboard, en temps constant"""
+        prices = self.overall.prices
+        return PriceMetrics(
+            total=self.total,
+            price_count=prices.count,
+            price_mean=prices.mean if prices.count else None,
+            price_std=prices.std if prices.count else None,
+            price_median=self.overall.quantile(0.5),
+            n_categories=len(self.groups['categorie']),
+            n_cities=len(self.groups['ville']),
+        )
+
+    def histogram(self):
+        return self.overall.sketch.histogram()
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'overall': self.overall.to_dict(),
+            'groups': {
+                column: {value: group.to_dict() for value, group in groups.items()}
+                for column, groups in self.groups.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data['relative_accuracy'])
+        stats.overall = GroupStats.from_dict(data['overall'])
+        for column, groups in data['groups'].items():
+            stats.groups[column] = {value: GroupStats.from_dict(group) for value, group in groups.items()}
+        return stats
+
+    def save(self, path, sources=None):
+        """Sauvegarder (écriture atomique) avec la signature des fichiers sources"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATS_VERSION, 'sources': sources, 'stats': self.to_dict()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Statistiques sauvegardées et signature de leurs sources, ou (None, None)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        if data.get('version') != STATS_VERSION:
+            return None, None
+        return cls.from_dict(data['stats']), data.get('sources')
+
+
+def stats_path(sources, directory=STATS_DIR):
+    """Fichier de statistiques d'un fichier de données ou d'une sélection de fichiers"""
+    paths = sorted(os.path.abspath(source) for source in sources)
+    key = hashlib.sha1('\n'.join(paths).encode('utf-8')).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(paths[0]))[0] if len(paths) == 1 else 'selection'
+    return os.path.join(directory, f"{stem}-{key}.json")
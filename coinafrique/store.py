@@ -0,0 +1,138 @@
+"""Stockage colonne (Feather / Arrow IPC) des fichiers CSV de données
+
+Chaque CSV lu par l'application est doublé d'une copie binaire colonne
+non compressée dans data/.store, accompagnée d'une signature de la source
+(mtime, taille, empreinte SHA-256). La copie est reconstruite seulement si
+le contenu du CSV change : un mtime modifié sans changement de contenu ne
+déclenche qu'une mise à jour de la signature. Les lectures passent par un
+fichier mappé en mémoire, sans analyse du texte CSV ni conversion de types.
+Sans pyarrow, le stockage est désactivé et les CSV sont lus directement.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from .loader import read_listings
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow est optionnel
+    pa = feather = None
+
+STORE_DIR = os.path.join('data', '.store')
+# 2 : lien de l'annonce des exports Web Scraper lu dans lien_annonce (plus image_lien)
+STORE_VERSION = 2
+HASH_CHUNK = 1024 * 1024
+
+
+def reader_key(reader):
+    """Identifiant du lecteur ayant produit une copie (un autre lecteur impose une reconstruction)"""
+    return f"{STORE_VERSION}:{reader.__module__}.{reader.__qualname__}"
+
+
+def file_digest(path):
+    """Empreinte SHA-256 d'un fichier, lu par blocs"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetStore:
+    """Copies binaires des CSV, reconstruites quand la source change"""
+
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return feather is not None
+
+    def _paths(self, source):
+        key = hashlib.sha1(os.path.abspath(source).encode('utf-8')).hexdigest()[:12]
+        stem = os.path.splitext(os.path.basename(source))[0]
+        base = os.path.join(self.directory, f"{stem}-{key}")
+        return base + '.feather', base + '.json'
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path, meta):
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def is_current(self, source, reader=read_listings):
+        """La copie binaire correspond-elle au contenu actuel du CSV (et au lecteur) ?"""
+        data_path, meta_path = self._paths(source)
+        meta = self._read_meta(meta_path)
+        if meta is None or meta.get('reader') != reader_key(reader) or not os.path.exists(data_path):
+            return False
+        stat = os.stat(source)
+        if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+            return True
+        if meta['size'] != stat.st_size or meta['sha256'] != file_digest(source):
+            return False
+        # Fichier touché mais contenu identique : on garde la copie
+        self._write_meta(meta_path, dict(meta, mtime_ns=stat.st_mtime_ns))
+        return True
+
+    def load(self, source, reader=read_listings):
+        """Charger un CSV via sa copie binaire (reconstruite si nécessaire)"""
+        if not self.enabled:
+            return reader(source)
+        if self.is_current(source, reader):
+            try:
+                return self._read(source)
+            except (OSError, pa.ArrowException):
+                pass
+        stat = os.stat(source)
+        digest = file_digest(source)
+        df = reader(source)
+        self._write(source, df, stat, digest, reader_key(reader))
+        return df
+
+    def _read(self, source):
+        data_path, _ = self._paths(source)
+        table = feather.read_table(data_path, memory_map=True)
+        return table.to_pandas()
+
+    def _write(self, source, df, stat, digest, reader):
+        data_path, meta_path = self._paths(source)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{data_path}.{threading.get_ident()}.tmp"
+        try:
+            # Non compressé pour que la lecture mappée en mémoire évite toute copie
+            feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        except (pa.ArrowException, TypeError, ValueError):
+            # Colonnes de types mélangés : pas de copie binaire, lecture CSV à chaque fois
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            os.replace(tmp_path, data_path)
+            self._write_meta(meta_path, {
+                'source': os.path.abspath(source),
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha256': digest,
+                'reader': reader,
+            })
+
+    def invalidate(self, source):
+        """Oublier la copie binaire d'un CSV (après une sauvegarde par exemple)"""
+        with self._lock:
+            for path in self._paths(source):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,141 @@
+"""Tables agrégées du dashboard
+
+Les graphiques n'ont besoin que de quelques dizaines de valeurs : effectifs
+par catégorie, lieux les plus fréquents (quartier, ville ou pays),
+quartiles de prix par catégorie et histogramme à classes fixes. Ces tables
+sont calculées une fois par version du jeu de données ; la taille des
+graphiques envoyés au navigateur ne dépend plus du nombre d'annonces.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .address import LEVELS
+
+TOP_CITIES = 10
+HIST_BINS = 30
+WHISKER = 1.5
+MAX_OUTLIERS = 2000
+SUMMARY_COLUMNS = ['categorie', *LEVELS, 'prix_numerique']
+
+DashboardSummary = namedtuple('DashboardSummary', [
+    'total', 'price_count', 'price_mean', 'n_categories', 'n_cities',
+    'category_counts', 'top_places', 'price_box', 'price_outliers', 'price_hist',
+])
+
+
+def value_counts_table(series, top_n=None):
+    """Effectifs (valeurs observées seulement) sous forme de table [valeur, count]"""
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    if top_n is not None:
+        counts = counts.head(top_n)
+    return counts.rename_axis(series.name).reset_index(name='count')
+
+
+def _sorted_groups(categories, prices):
+    """(catégorie, prix triés) pour chaque catégorie ayant au moins un prix"""
+    categories = pd.Categorical(categories)
+    codes = categories.codes
+    valid = (codes >= 0) & ~np.isnan(prices)
+    codes, values = codes[valid], prices[valid]
+
+    # Tri par (catégorie, prix) : chaque catégorie devient une tranche triée
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    starts = np.searchsorted(codes, np.arange(len(categories.categories) + 1))
+    for code, name in enumerate(categories.categories):
+        group = values[starts[code]:starts[code + 1]]
+        if len(group):
+            yield name, group
+
+
+def price_box_stats(categories, prices, max_outliers=MAX_OUTLIERS):
+    """Statistiques de boîte à moustaches par catégorie (quartiles, moustaches de Tukey)
+
+    Retourne aussi les valeurs hors moustaches, table [categorie,
+    prix_numerique] réduite à max_outliers points au plus (répartis entre
+    les catégories, extrêmes conservés).
+    """
+    columns = ['categorie', 'count', 'mean', 'min', 'q1', 'median', 'q3', 'max', 'lowerfence', 'upperfence']
+    rows = []
+    outliers = []
+    for name, group in _sorted_groups(categories, prices):
+        q1, median, q3 = np.quantile(group, [0.25, 0.5, 0.75])
+        # Moustaches : valeurs extrêmes comprises dans [q1 - 1.5 IQR, q3 + 1.5 IQR]
+        iqr = q3 - q1
+        start = np.searchsorted(group, q1 - WHISKER * iqr, side='left')
+        end = np.searchsorted(group, q3 + WHISKER * iqr, side='right')
+        rows.append((name, len(group), group.mean(), group[0], q1, median, q3, group[-1], group[start], group[end - 1]))
+        outliers.append((name, np.concatenate([group[:start], group[end:]])))
+
+    total = sum(len(values) for _, values in outliers)
+    tables = []
+    for name, values in outliers:
+        if total > max_outliers:
+            # Points régulièrement espacés dans l'ordre des prix (minimum et maximum inclus)
+            keep = max(int(max_outliers * len(values) / total), min(len(values), 2))
+            values = values[np.unique(np.linspace(0, len(values) - 1, keep).round().astype(np.intp))]
+        tables.append(pd.DataFrame({'categorie': name, 'prix_numerique': values}))
+    if not tables:
+        tables = [pd.DataFrame({'categorie': pd.Series(dtype=str), 'prix_numerique': pd.Series(dtype='float64')})]
+    return pd.DataFrame(rows, columns=columns), pd.concat(tables, ignore_index=True)
+
+
+def price_histogram(prices, bins=HIST_BINS):
+    """Histogramme à classes de largeur fixe : table [debut, fin, milieu, count]"""
+    values = prices[~np.isnan(prices)]
+    if len(values) == 0:
+        return pd.DataFrame(columns=['debut', 'fin', 'milieu', 'count'])
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({
+        'debut': edges[:-1],
+        'fin': edges[1:],
+        'milieu': (edges[:-1] + edges[1:]) / 2,
+        'count': counts,
+    })
+
+
+def _column(df, name):
+    if name in df.columns:
+        return df[name]
+    return pd.Series(pd.Categorical([np.nan] * len(df)), index=df.index, name=name)
+
+
+def summarize(df, top_n=TOP_CITIES, bins=HIST_BINS, rows=None):
+    """Calculer les tables agrégées du dashboard à partir des annonces nettoyées
+
+    rows (masque booléen) restreint le calcul à une sélection de lignes, sans
+    copier les colonnes inutiles au dashboard.
+    """
+    if rows is not None:
+        df = df.loc[rows, [column for column in SUMMARY_COLUMNS if column in df.columns]]
+    categories = _column(df, 'categorie')
+    if 'prix_numerique' in df.columns:
+        prices = df['prix_numerique'].astype('float64').to_numpy(na_value=np.nan)
+    else:
+        prices = np.full(len(df), np.nan)
+
+    valid = ~np.isnan(prices)
+    price_count = int(valid.sum())
+    price_box, price_outliers = price_box_stats(categories.array, prices)
+    return DashboardSummary(
+        total=len(df),
+        price_count=price_count,
+        price_mean=float(prices[valid].mean()) if price_count else None,
+        n_categories=categories.nunique(),
+        n_cities=_column(df, 'ville').nunique(),
+        category_counts=value_counts_table(categories),
+        top_places={level: value_counts_table(_column(df, level), top_n) for level in LEVELS},
+        price_box=price_box,
+        price_outliers=price_outliers,
+        price_hist=price_histogram(prices, bins),
+    )
+
+
+def summary_size(summary):
+    """Taille mémoire approximative d'un résumé (pour le cache des jeux de données)"""
+    tables = [table for table in summary if isinstance(table, pd.DataFrame)]
+    tables += list(summary.top_places.values())
+    return sum(int(table.memory_usage(index=True, deep=True).sum()) for table in tables)
@@ -1,19 +1,26 @@
 import streamlit as st
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-import base64
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import streamlit.components.v1 as components
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
-import matplotlib as mp
-import re
 import os
-import time
+import hashlib
+# Modules légers seulement : le scraping (requests, BeautifulSoup / lxml), les
+# graphiques (plotly.express) et la détection des doublons (scipy) sont
+# importés dans les fonctions des vues qui les utilisent
+from coinafrique.settings import category_file_name, URLS, FILE_PREFIXES, DEFAULT_WORKERS, DEFAULT_RATE, DEFAULT_RETRIES
+from coinafrique.seen import SeenIndex, frame_records
+from coinafrique.journal import ScrapeJournal
+from coinafrique.cleaning import clean_scraped_data, drop_existing_duplicates, DEDUP_COLUMNS
+from coinafrique.schema import concat_listings
+from coinafrique.store import DatasetStore
+from coinafrique.datacache import DatasetCache
+from coinafrique.summary import summarize, summary_size
+from coinafrique.index import ListingIndex
+from coinafrique.stats import PriceStats, stats_path
+from coinafrique.datacache import file_signature, frame_size
+from coinafrique.loader import iter_listing_chunks
+from coinafrique.address import LEVELS, LEVEL_LABELS
 
 # Palette de couleurs
 COLOR_PRIMARY = "#1976D2"
@@ -59,78 +66,112 @@ st.markdown(f"""
     </div>
 """, unsafe_allow_html=True)
 
+# Index des annonces déjà collectées, partagé entre les sessions
+@st.cache_resource
+def get_seen_index(category_name, clean_data=True):
+    """Index persistant des annonces déjà vues pour un fichier de catégorie (cleaned ou raw)"""
+    file_name = category_file_name(category_name, clean_data)
+    seed_files = [f'{file_name}.csv', f'data/{file_name}.csv']
+    return SeenIndex.for_category(file_name, seed_files=seed_files)
+
+def seen_index_for_file(filename):
+    """Index des annonces déjà vues associé à un CSV de catégorie (None pour un autre fichier)"""
+    file_name = os.path.splitext(os.path.basename(filename))[0]
+    for category_name in URLS:
+        for clean_data in (True, False):
+            if category_file_name(category_name, clean_data) == file_name:
+                return get_seen_index(category_name, clean_data)
+    return None
+
+# Fonction de filtrage des annonces déjà vues (mode incrémental)
+def keep_new_listings(data, category_name, clean_data, pages_scraped):
+    """Ne garder que les annonces jamais vues et les enregistrer dans l'index
+
+    Le lot complet est d'abord ajouté à l'archive historique, pour que
+    last_seen avance aussi pour les annonces déjà connues.
+    """
+    archive_listings(pd.DataFrame.from_records(data))
+    seen_index = get_seen_index(category_name, clean_data)
+    new_data = seen_index.new_records(data)
+    seen_index.add(new_data)
+    st.info(f'🔁 {category_name} : {len(new_data)} nouvelle(s) annonce(s) sur {len(data)} '
+            f'({pages_scraped} page(s) parcourue(s))')
+    return new_data
+
+# Résumé des statistiques de prix tenues pendant le scraping
+def format_live_stats(stats):
+    """Texte court : annonces reçues, prix moyen et médiane approchée"""
+    metrics = stats.metrics()
+    if not metrics.price_count:
+        return f'{metrics.total} annonces'
+    return (f'{metrics.total} annonces, prix moyen {metrics.price_mean:,.0f} FCFA, '
+            f'médiane ≈ {metrics.price_median:,.0f} FCFA')
+
 # Fonction de scraping avec BeautifulSoup (avec nettoyage)
-def scrape_with_beautifulsoup(url_base, category_name, pages, clean_data=True):
-    """Scraper avec BeautifulSoup et nettoyage optionnel"""
-    data = []
+def scrape_with_beautifulsoup(url_base, category_name, pages, clean_data=True,
+                              workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, retries=DEFAULT_RETRIES,
+                              incremental=False, resume=False, cache=None):
+    """Scraper avec BeautifulSoup et nettoyage optionnel
+
+    En mode incrémental, la pagination s'arrête à la première page dont toutes
+    les annonces sont déjà connues et seules les nouvelles annonces sont retournées.
+    Chaque page est journalisée sur disque ; resume=True reprend le dernier
+    scraping interrompu de la catégorie au lieu de repartir de la page 1.
+    cache est le cache disque des réponses HTTP (None pour le désactiver).
+    """
+    import requests
+    from coinafrique.scraper import scrape_category
     
+    journal_path = ScrapeJournal.path_for(category_file_name(category_name, clean_data))
+    journal = ScrapeJournal.load(journal_path) if resume else None
+    if journal is None:
+        journal = ScrapeJournal.start(journal_path, url_base, category_name, pages)
+    else:
+        pages = journal.pages
+
     # Créer une barre de progression
     progress_bar = st.progress(0)
     status_text = st.empty()
-    
-    for page in range(1, pages + 1):
-        status_text.text(f'Scraping page {page}/{pages} - {category_name}...')
-        progress_bar.progress(page / pages)
-        
-        url = f"{url_base}?page={page}"
-        
-        try:
-            # Ajouter un délai pour éviter de surcharger le serveur
-            time.sleep(1)
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            annonces = soup.find_all('div', class_='ad__card')
-            
-            for annonce in annonces:
-                try:
-                    # Extraire le type (vêtement ou chaussure)
-                    type_element = annonce.find('p', class_='ad__card-description')
-                    type_item = type_element.get_text(strip=True) if type_element else "Non spécifié"
-                    
-                    # Extraire le prix
-                    prix_element = annonce.find('p', class_='ad__card-price')
-                    prix = prix_element.get_text(strip=True) if prix_element else "Prix non spécifié"
-                    
-                    # Extraire l'adresse
-                    location_element = annonce.find('p', class_='ad__card-location')
-                    if location_element:
-                        span_element = location_element.find('span')
-                        adresse = span_element.get_text(strip=True) if span_element else "Adresse non spécifiée"
-                    else:
-                        adresse = "Adresse non spécifiée"
-                    
-                    # Extraire le lien de l'image
-                    img_element = annonce.find('img', class_='ad__card-img')
-                    image_lien = img_element['src'] if img_element and 'src' in img_element.attrs else "Image non disponible"
-                    
-                    data.append({
-                        "categorie": category_name,
-                        "type": type_item,
-                        "prix": prix,
-                        "adresse": adresse,
-                        "image_lien": image_lien
-                    })
-                    
-                except Exception as e:
-                    continue
-                    
-        except requests.exceptions.RequestException as e:
-            st.error(f"Erreur lors du scraping de la page {page}: {str(e)}")
-            continue
-        except Exception as e:
-            st.error(f"Erreur inattendue page {page}: {str(e)}")
-            continue
-    
+    pages_scraped = 0
+    live_stats = PriceStats()
+
+    def update_progress(done, total):
+        nonlocal pages_scraped
+        pages_scraped = done
+        status_text.text(f'Scraping page {done}/{total} - {category_name}... {format_live_stats(live_stats)}')
+        progress_bar.progress(done / total)
+
+    def update_stats(page, records):
+        live_stats.update(records)
+
+    stop_when = None
+    if incremental:
+        stop_when = get_seen_index(category_name, clean_data).page_is_known
+
+    data, errors = scrape_category(
+        url_base, category_name, pages,
+        workers=workers, rate=rate, retries=retries, progress_callback=update_progress,
+        page_callback=update_stats, stop_when=stop_when, journal=journal, cache=cache
+    )
+
+    for page, error in errors:
+        if isinstance(error, requests.exceptions.RequestException):
+            st.error(f"Erreur lors du scraping de la page {page} après {retries} tentative(s): {str(error)}")
+        else:
+            st.error(f"Erreur inattendue page {page}: {str(error)}")
+
+    if errors:
+        pages_perdues = ', '.join(str(page) for page, _ in errors)
+        st.warning(f"⚠️ {len(errors)} page(s) non récupérée(s) pour {category_name} : {pages_perdues}")
+
     progress_bar.empty()
     status_text.empty()
+
+    if incremental:
+        data = keep_new_listings(list(data), category_name, clean_data, pages_scraped)
     
-    df = pd.DataFrame(data)
+    # Assembler le DataFrame depuis le journal
+    df = pd.DataFrame.from_records(data)
     
     # Nettoyer les données si demandé
     if clean_data and not df.empty:
@@ -138,43 +179,226 @@ def scrape_with_beautifulsoup(url_base, category_name, pages, clean_data=True):
     
     return df
 
-# Fonction de nettoyage des données
-def clean_scraped_data(df):
-    """Nettoyer les données scrapées avec vérification des colonnes"""
-    if df.empty:
-        return df
+# Fonction de scraping de toutes les catégories en parallèle
+def scrape_all_categories(pages, clean_data=True, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                          retries=DEFAULT_RETRIES, incremental=False, cache=None):
+    """Scraper les quatre catégories simultanément avec une progression par catégorie"""
+    from coinafrique.scraper import scrape_categories
+    
+    progress = {}
+    pages_scraped = {}
+    live_stats = {category_name: PriceStats() for category_name in URLS}
+    for category_name in URLS:
+        st.caption(category_name)
+        progress[category_name] = (st.progress(0), st.empty())
 
-    df_clean = df.copy()
+    def update_progress(category_name, done, total):
+        pages_scraped[category_name] = done
+        progress_bar, status_text = progress[category_name]
+        status_text.text(f'Scraping page {done}/{total} - {category_name}... '
+                         f'{format_live_stats(live_stats[category_name])}')
+        progress_bar.progress(done / total)
 
-    if 'prix' in df_clean.columns:
-        df_clean['prix_brut'] = df_clean['prix']
-        df_clean['prix_numerique'] = df_clean['prix'].str.replace(r'[^\d]', '', regex=True)
-        df_clean['prix_numerique'] = pd.to_numeric(df_clean['prix_numerique'], errors='coerce')
-        df_clean['a_prix'] = df_clean['prix_numerique'].notna()
-    else:
-        df_clean['prix_brut'] = "Inconnu"
-        df_clean['prix_numerique'] = np.nan
-        df_clean['a_prix'] = False
+    def update_stats(category_name, page, records):
+        live_stats[category_name].update(records)
 
-    if 'adresse' in df_clean.columns:
-        df_clean['adresse'] = df_clean['adresse'].str.strip().str.title()
-    else:
-        df_clean['adresse'] = "Adresse inconnue"
+    stop_when = None
+    if incremental:
+        seen_indexes = {name: get_seen_index(name, clean_data) for name in URLS}
 
-    if 'type' in df_clean.columns:
-        df_clean['type'] = df_clean['type'].str.strip().str.title()
-    else:
-        df_clean['type'] = "Type inconnu"
+        def _all_known(category_name, records):
+            return seen_indexes[category_name].page_is_known(records)
 
-    if 'image_lien' in df_clean.columns:
-        df_clean['a_image'] = df_clean['image_lien'] != "Image non disponible"
-    else:
-        df_clean['a_image'] = False
+        stop_when = _all_known
+
+    journals = {
+        name: ScrapeJournal.start(ScrapeJournal.path_for(category_file_name(name, clean_data)), url, name, pages)
+        for name, url in URLS.items()
+    }
+
+    results = scrape_categories(
+        URLS, pages, workers=workers, rate=rate, retries=retries,
+        progress_callback=update_progress, page_callback=update_stats, stop_when=stop_when,
+        journals=journals, cache=cache
+    )
+
+    frames = {}
+    for category_name, (data, errors) in results.items():
+        progress_bar, status_text = progress[category_name]
+        progress_bar.empty()
+        status_text.empty()
+
+        if errors:
+            pages_perdues = ', '.join(str(page) for page, _ in errors)
+            st.warning(f"⚠️ {len(errors)} page(s) non récupérée(s) pour {category_name} : {pages_perdues}")
+
+        if incremental:
+            data = keep_new_listings(list(data), category_name, clean_data, pages_scraped.get(category_name, 0))
+
+        df = pd.DataFrame.from_records(data)
+        if clean_data and not df.empty:
+            df = clean_scraped_data(df)
+        frames[category_name] = df
+
+    return frames
+
+# Fonction de reprise des scrapings interrompus
+def show_interrupted_scrapes(clean_data=True, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                             retries=DEFAULT_RETRIES, incremental=False, cache=None):
+    """Proposer de reprendre les scrapings dont le journal n'est pas terminé"""
+    interrupted = []
+    for category_name in URLS:
+        journal = ScrapeJournal.load(ScrapeJournal.path_for(category_file_name(category_name, clean_data)))
+        if journal is not None and not journal.finished:
+            interrupted.append((category_name, journal))
+
+    if not interrupted:
+        return
+
+    st.markdown("### ⏯️ Scrapings interrompus")
+    for category_name, journal in interrupted:
+        file_name = category_file_name(category_name, clean_data)
+        done = len(journal.completed_pages())
+        if st.button(f'⏯️ Reprendre {category_name} ({done}/{journal.pages} pages déjà récupérées)',
+                     key=f'resume_{file_name}', use_container_width=True):
+            with st.spinner('Reprise du scraping...'):
+                df = scrape_with_beautifulsoup(journal.header['url'], category_name, journal.pages,
+                                               clean_data=clean_data, workers=workers, rate=rate,
+                                               retries=retries, incremental=incremental, resume=True,
+                                               cache=cache)
+                if not df.empty:
+                    st.success(f'✅ {len(df)} articles récupérés après reprise!')
+                    st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
+                    st.dataframe(df.head(), use_container_width=True)
+
+                    if save_data_to_csv(df, f'{file_name}.csv', append=incremental):
+                        st.success(f'💾 Données sauvegardées dans {file_name}.csv')
+
+                    csv = convert_df_to_csv(df)
+                    st.download_button(
+                        label="📥 Télécharger CSV",
+                        data=csv,
+                        file_name=f'{file_name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+                        mime='text/csv',
+                        key=f'download_resume_{file_name}'
+                    )
+                else:
+                    st.warning('⚠️ Aucune donnée récupérée.')
+
+# Cache disque des pages téléchargées, partagé entre les sessions
+@st.cache_resource
+def get_response_cache(ttl_minutes, offline=False):
+    """Cache HTTP des pages d'annonces (TTL en minutes, mode hors ligne optionnel)"""
+    from coinafrique.httpcache import ResponseCache
+    return ResponseCache(ttl=ttl_minutes * 60, offline=offline)
 
-    df_clean = df_clean.drop_duplicates(subset=['type', 'prix_brut', 'adresse'])
+# File de tâches en arrière-plan partagée par toutes les sessions
+@st.cache_resource
+def get_job_manager():
+    """Gestionnaire de tâches de scraping commun au serveur Streamlit"""
+    from coinafrique.jobs import JobManager
+    return JobManager(max_running=2)
 
-    return df_clean
+# Fonction d'affichage des tâches en arrière-plan
+def show_background_jobs(key_suffix=''):
+    """Afficher les tâches en arrière-plan, rafraîchies toutes les 2 s tant qu'une tâche tourne"""
+    manager = get_job_manager()
+    polling = any(not job.finished for job in manager.list_jobs())
+    st.fragment(render_background_jobs, run_every=2 if polling else None)(manager, polling, key_suffix)
 
+def render_background_jobs(manager, polling, key_suffix):
+    """Progression, annulation et résultats partiels de chaque tâche"""
+    jobs = manager.list_jobs()
+    if polling and all(job.finished for job in jobs):
+        # Plus rien ne tourne : relancer le script complet pour arrêter le rafraîchissement
+        st.rerun()
+
+    if not jobs:
+        st.info('ℹ️ Aucune tâche en arrière-plan.')
+        return
+
+    for job in jobs:
+        state = job.snapshot()
+        started = datetime.fromtimestamp(state['created_at']).strftime('%H:%M:%S')
+        with st.expander(f"Tâche {state['id']} — {state['status']} ({state['pages']} pages, lancée à {started})",
+                         expanded=not job.finished):
+            for category_name, done in state['progress'].items():
+                st.progress(done / state['pages'], text=f"{category_name} : {done}/{state['pages']} pages")
+
+            if state['error']:
+                st.error(f"❌ {state['error']}")
+            for category_name, errors in state['errors'].items():
+                if errors:
+                    pages_perdues = ', '.join(str(page) for page, _ in errors)
+                    st.warning(f"⚠️ {len(errors)} page(s) non récupérée(s) pour {category_name} : {pages_perdues}")
+
+            if not job.finished:
+                if st.button('⏹️ Annuler la tâche', key=f"cancel_{state['id']}{key_suffix}"):
+                    manager.cancel(state['id'])
+                    st.rerun(scope='fragment')
+
+            frames = {name: pd.DataFrame(records) for name, records in state['records'].items() if records}
+            if not frames:
+                continue
+            if state['options'].get('clean_data'):
+                frames = {name: clean_scraped_data(df) for name, df in frames.items()}
+            combined_df = concat_listings(frames.values())
+
+            if job.finished:
+                st.success(f'✅ {len(combined_df)} articles récupérés')
+            else:
+                st.info(f'⏳ {len(combined_df)} articles récupérés jusqu\'ici (résultats partiels)')
+            st.dataframe(combined_df.head(20), use_container_width=True)
+
+            if job.finished:
+                suffix = 'cleaned' if state['options'].get('clean_data') else 'raw'
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button('💾 Sauvegarder par catégorie', key=f"save_{state['id']}{key_suffix}"):
+                        for category_name, df in frames.items():
+                            filename = f'{FILE_PREFIXES[category_name]}_{suffix}.csv'
+                            if save_data_to_csv(df, filename):
+                                st.success(f'💾 {category_name} : données sauvegardées dans {filename}')
+                with col2:
+                    st.download_button(
+                        label="📥 Télécharger CSV",
+                        data=convert_df_to_csv(combined_df),
+                        file_name=f'coinafrique_{suffix}_{state["id"]}.csv',
+                        mime='text/csv',
+                        key=f"download_{state['id']}{key_suffix}"
+                    )
+
+@st.cache_resource
+def get_dataset_store():
+    """Copies binaires (Feather) des CSV de data/, partagées entre les sessions"""
+    return DatasetStore()
+
+@st.cache_resource
+def get_dataset_cache():
+    """Jeux de données chargés et nettoyés, gardés en mémoire entre reruns et sessions"""
+    return DatasetCache()
+
+def invalidate_dataset(filename):
+    """Oublier les copies binaires et en mémoire d'un fichier qui vient d'être écrit"""
+    get_dataset_store().invalidate(filename)
+    get_dataset_cache().invalidate(filename)
+
+# Archive historique des scrapings (Parquet, partitions par catégorie et par jour)
+@st.cache_resource
+def get_archive():
+    """Archive append-only des annonces sauvegardées, partagée entre les sessions"""
+    from coinafrique.archive import ListingArchive
+    return ListingArchive()
+
+def archive_listings(df):
+    """Ajouter les annonces sauvegardées à l'archive (nettoyées au préalable si brutes)"""
+    archive = get_archive()
+    if not archive.enabled:
+        return
+    try:
+        archive.append(df if 'prix_numerique' in df.columns else clean_scraped_data(df))
+    except Exception as e:
+        st.warning(f"⚠️ Archive historique non mise à jour : {str(e)}")
 
 # Fonction pour convertir le DataFrame en CSV
 def convert_df_to_csv(df):
@@ -182,19 +406,74 @@ def convert_df_to_csv(df):
     return df.to_csv(index=False).encode('utf-8')
 
 # Fonction pour sauvegarder les données
-def save_data_to_csv(df, filename):
-    """Sauvegarder les données dans un fichier CSV"""
+def save_data_to_csv(df, filename, append=False):
+    """Sauvegarder les données dans un fichier CSV (ou les ajouter à la fin du fichier)"""
     if not df.empty:
-        df.to_csv(filename, index=False)
+        # L'index des annonces déjà vues suit chaque sauvegarde, complète ou incrémentale
+        seen_index = seen_index_for_file(filename)
+        if seen_index is not None:
+            seen_index.add(frame_records(df))
+        previous = None
+        if append and os.path.exists(filename):
+            previous = file_signature(filename)
+            columns = pd.read_csv(filename, nrows=0).columns
+            if set(DEDUP_COLUMNS) <= set(columns):
+                # Même dédoublonnage que le nettoyage, étendu aux lignes déjà présentes dans le fichier
+                existing = pd.read_csv(filename, usecols=DEDUP_COLUMNS, dtype=str)
+                kept = drop_existing_duplicates(df, existing)
+                if len(kept) < len(df):
+                    st.info(f'🔁 {len(df) - len(kept)} annonce(s) déjà présente(s) dans {filename} ignorée(s)')
+                if kept.empty:
+                    return False
+                df = kept
+            df.reindex(columns=columns).to_csv(filename, mode='a', header=False, index=False)
+        else:
+            df.to_csv(filename, index=False)
+        invalidate_dataset(filename)
+        update_file_stats(df, filename, previous)
+        if not append:
+            # En ajout (mode incrémental), le lot complet a déjà été archivé par keep_new_listings
+            archive_listings(df)
         return True
     return False
 
+# Statistiques de prix persistées d'un fichier, mises à jour avec les lignes écrites
+def update_file_stats(df, filename, previous=None):
+    """Ajouter les lignes écrites aux statistiques du fichier (previous : signature avant ajout)
+
+    Les statistiques ne sont recalculées depuis le fichier entier que si elles
+    ne correspondent pas à son état avant l'ajout.
+    """
+    path = stats_path([filename])
+    stats, sources = PriceStats.load(path) if previous is not None else (None, None)
+    if stats is not None and sources == [list(previous)]:
+        stats.update(df)
+    else:
+        # Fichier complet relu par blocs (statistiques absentes ou périmées)
+        stats = PriceStats()
+        for chunk in iter_listing_chunks(filename) if previous is not None else [df]:
+            stats.update(chunk)
+    stats.save(path, sources=[list(file_signature(filename))])
+    return stats
+
+# Statistiques de prix d'une sélection de fichiers (persistées entre les exécutions)
+def selection_stats(filepaths, cleaned_df):
+    """Statistiques des données nettoyées d'une sélection, relues du disque si les fichiers n'ont pas changé"""
+    path = stats_path(filepaths)
+    signatures = [list(file_signature(filepath)) for filepath in filepaths]
+    stats, sources = PriceStats.load(path)
+    if stats is None or sources != signatures:
+        stats = PriceStats()
+        stats.update(cleaned_df)
+        stats.save(path, sources=signatures)
+    return stats
+
 # Fonction pour charger les données depuis un fichier CSV
 def load_data_from_csv(filepath):
-    """Charger les données depuis un fichier CSV avec gestion des erreurs"""
+    """Charger les données d'un fichier CSV (via sa copie binaire, schéma typé) avec gestion des erreurs"""
     try:
         if os.path.exists(filepath):
-            return pd.read_csv(filepath, encoding='utf-8')
+            return get_dataset_cache().load(filepath, get_dataset_store().load)
         else:
             st.warning(f"📂 Fichier introuvable : {filepath}")
             return pd.DataFrame()
@@ -206,99 +485,180 @@ def load_data_from_csv(filepath):
         return pd.DataFrame()
 
 
-# Fonction pour créer le dashboard
-def create_dashboard(df):
-    """Créer un dashboard interactif"""
-    if df.empty:
-        st.warning('⚠️ Aucune donnée disponible pour le dashboard.')
-        return
-    
-    st.markdown("""
-        <h2 style='text-align: center; color: #2E86AB; margin: 2rem 0;'>
-            📊 DASHBOARD ANALYTIQUE
-        </h2>
-    """, unsafe_allow_html=True)
+# Filtres du dashboard (servis par l'index, sans parcourir les colonnes texte)
+def dashboard_filters(index):
+    """Afficher les filtres et retourner le masque des lignes retenues (None si aucun filtre)"""
+    with st.expander('🔎 Filtres', expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            categories = index.values('categorie')
+            selected_categories = st.multiselect(
+                'Catégories', categories, key=f"filtre_categories_{hash(tuple(categories))}"
+            )
+        with col2:
+            cities = index.values('ville')
+            selected_cities = st.multiselect(
+                'Villes', cities, key=f"filtre_villes_{hash(tuple(cities))}"
+            )
+        with col3:
+            districts = index.values('quartier')
+            selected_districts = st.multiselect(
+                'Quartiers', districts, key=f"filtre_quartiers_{hash(tuple(districts))}"
+            )
+        
+        price_range = None
+        bounds = index.price_bounds()
+        if bounds is not None and bounds[1] > bounds[0]:
+            low, high = int(bounds[0]), int(np.ceil(bounds[1]))
+            selected_range = st.slider(
+                'Prix (FCFA)', min_value=low, max_value=high, value=(low, high),
+                key=f"filtre_prix_{low}_{high}"
+            )
+            if selected_range != (low, high):
+                price_range = selected_range
+        
+        query = st.text_input('Recherche dans le type', key='filtre_recherche', placeholder='ex. : basket nike')
     
-    # Métriques principales
+    return index.filter(
+        categories=selected_categories, cities=selected_cities, price_range=price_range, query=query,
+        districts=selected_districts
+    )
+
+# Périodes proposées pour le dashboard de l'archive (None : tout l'historique)
+ARCHIVE_PERIODS = {
+    '7 derniers jours': 7,
+    '30 derniers jours': 30,
+    '90 derniers jours': 90,
+    '365 derniers jours': 365,
+    'Tout l\'historique': None,
+}
+
+# Sections du dashboard : seul l'onglet ouvert est exécuté
+DASHBOARD_SECTIONS = ['📌 Indicateurs', '🏷️ Catégories', '🏙️ Lieux', '💰 Prix']
+
+def cached_figure(name, summary, build, *key):
+    """Figure d'une section, reconstruite seulement si son résumé ou ses options ont changé"""
+    figures = st.session_state.setdefault('dashboard_figures', {})
+    entry = figures.get(name)
+    if entry is None or entry[0] is not summary or entry[1] != key:
+        entry = (summary, key, build())
+        figures[name] = entry
+    return entry[2]
+
+def filtered_summary(df, rows):
+    """Résumé des lignes filtrées, gardé en session tant que le jeu de données et le filtre ne changent pas"""
+    key = hashlib.sha1(np.packbits(rows).tobytes()).hexdigest()
+    cached = st.session_state.get('dashboard_filtered')
+    if cached is None or cached[0] is not df or cached[1] != key:
+        cached = (df, key, summarize(df, rows=rows))
+        st.session_state['dashboard_filtered'] = cached
+    return cached[2]
+
+@st.fragment
+def metrics_section(metrics):
+    """Indicateurs principaux"""
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📝 Total articles", len(df))
+        st.metric("📝 Total articles", metrics.total)
     
     with col2:
-        if 'prix_numerique' in df.columns:
-            prix_valides = df['prix_numerique'].dropna()
-            if not prix_valides.empty:
-                prix_moyen = prix_valides.mean()
-                st.metric("💰 Prix moyen", f"{prix_moyen:,.0f} FCFA")
-            else:
-                st.metric("💰 Prix moyen", "N/A")
+        if metrics.price_mean is not None:
+            st.metric("💰 Prix moyen", f"{metrics.price_mean:,.0f} FCFA")
         else:
             st.metric("💰 Prix moyen", "N/A")
     
     with col3:
-        nb_categories = df['categorie'].nunique()
-        st.metric("🏷️ Catégories", nb_categories)
+        st.metric("🏷️ Catégories", metrics.n_categories)
     
     with col4:
-        nb_villes = df['adresse'].nunique()
-        st.metric("🏙️ Villes", nb_villes)
+        st.metric("🏙️ Villes", metrics.n_cities)
+
+@st.fragment
+def categories_section(summary):
+    """Distribution par catégorie"""
+    from coinafrique import charts
+    fig_cat = cached_figure('categories', summary, lambda: charts.category_pie(summary))
+    st.plotly_chart(fig_cat, use_container_width=True)
+
+@st.fragment
+def places_section(summary):
+    """Top 10 des lieux, au niveau choisi : changer de niveau ne relance que cette section"""
+    from coinafrique import charts
+    level = st.radio(
+        'Regrouper les lieux par', LEVELS, index=LEVELS.index('ville'),
+        format_func=LEVEL_LABELS.get, horizontal=True, key='niveau_lieux'
+    )
+    fig_places = cached_figure(
+        'places', summary, lambda: charts.top_places_bar(summary, level, LEVEL_LABELS[level]), level
+    )
+    st.plotly_chart(fig_places, use_container_width=True)
+
+@st.fragment
+def prices_section(df, summary, rows):
+    """Analyse des prix si disponible"""
+    from coinafrique import charts
+    if not summary.price_count:
+        st.info('💰 Aucun prix disponible pour ces annonces.')
+        return
+    
+    def build_box():
+        # Petits jeux de données : tous les prix ; sinon quartiles précalculés
+        prices = None
+        if charts.detailed_mode(summary) and 'categorie' in df.columns:
+            prices = df.loc[rows if rows is not None else slice(None), ['categorie', 'prix_numerique']]
+        return charts.price_box(summary, prices)
     
-    # Graphiques
     col1, col2 = st.columns(2)
     
     with col1:
-        # Distribution par catégorie
-        fig_cat = px.pie(
-            df, 
-            names='categorie', 
-            title='Distribution par Catégorie',
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_cat.update_layout(height=400)
-        st.plotly_chart(fig_cat, use_container_width=True)
+        st.plotly_chart(cached_figure('price_box', summary, build_box), use_container_width=True)
     
     with col2:
-        # Top 10 des villes
-        top_villes = df['adresse'].value_counts().head(10)
-        fig_villes = px.bar(
-            x=top_villes.values,
-            y=top_villes.index,
-            orientation='h',
-            title='Top 10 des Villes',
-            labels={'x': 'Nombre d\'articles', 'y': 'Ville'}
-        )
-        fig_villes.update_layout(height=400)
-        st.plotly_chart(fig_villes, use_container_width=True)
-    
-    # Analyse des prix si disponible
-    if 'prix_numerique' in df.columns:
-        prix_valides = df.dropna(subset=['prix_numerique'])
-        if not prix_valides.empty:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Distribution des prix par catégorie
-                fig_prix = px.box(
-                    prix_valides, 
-                    x='categorie', 
-                    y='prix_numerique',
-                    title='Distribution des Prix par Catégorie'
-                )
-                fig_prix.update_layout(height=400)
-                fig_prix.update_xaxes(tickangle=45)
-                st.plotly_chart(fig_prix, use_container_width=True)
-            
-            with col2:
-                # Histogramme des prix
-                fig_hist = px.histogram(
-                    prix_valides, 
-                    x='prix_numerique',
-                    title='Distribution des Prix',
-                    nbins=30
-                )
-                fig_hist.update_layout(height=400)
-                st.plotly_chart(fig_hist, use_container_width=True)
+        fig_hist = cached_figure('price_hist', summary, lambda: charts.price_histogram(summary))
+        st.plotly_chart(fig_hist, use_container_width=True)
+
+# Fonction pour créer le dashboard
+def create_dashboard(df, summary=None, index=None, stats=None):
+    """Créer un dashboard interactif à partir des tables agrégées (calculées si absentes)
+
+    stats (statistiques de prix incrémentales) fournit les indicateurs en
+    temps constant tant qu'aucun filtre n'est actif. Chaque section est un
+    onglet exécuté seulement lorsqu'il est ouvert, et ses figures ne sont
+    reconstruites que si les données affichées ont changé.
+    """
+    if df.empty:
+        st.warning('⚠️ Aucune donnée disponible pour le dashboard.')
+        return
+    if index is None:
+        index = ListingIndex(df)
+    rows = dashboard_filters(index)
+    if rows is not None:
+        summary = filtered_summary(df, rows)
+        if summary.total == 0:
+            st.info('🔎 Aucune annonce ne correspond aux filtres sélectionnés.')
+            return
+    elif summary is None:
+        summary = summarize(df)
+    
+    st.markdown("""
+        <h2 style='text-align: center; color: #2E86AB; margin: 2rem 0;'>
+            📊 DASHBOARD ANALYTIQUE
+        </h2>
+    """, unsafe_allow_html=True)
+    
+    metrics = stats.metrics() if stats is not None and rows is None else summary
+    sections = [
+        lambda: metrics_section(metrics),
+        lambda: categories_section(summary),
+        lambda: places_section(summary),
+        lambda: prices_section(df, summary, rows),
+    ]
+    tabs = st.tabs(DASHBOARD_SECTIONS, key='dashboard_section', on_change='rerun')
+    for tab, render in zip(tabs, sections):
+        if tab.open:
+            with tab:
+                render()
 
 # Sidebar pour les paramètres
 st.sidebar.header('🔧 Paramètres de Configuration')
@@ -312,6 +672,57 @@ pages = st.sidebar.selectbox(
     help="Sélectionnez le nombre de pages à scraper pour chaque catégorie"
 )
 
+# Réglages du scraping concurrent
+workers = st.sidebar.slider(
+    '⚡ Requêtes simultanées',
+    min_value=1,
+    max_value=16,
+    value=DEFAULT_WORKERS,
+    help="Nombre de pages téléchargées en parallèle"
+)
+
+rate = st.sidebar.number_input(
+    '🐢 Requêtes par seconde (par hôte)',
+    min_value=0.5,
+    max_value=20.0,
+    value=DEFAULT_RATE,
+    step=0.5,
+    help="Limite de débit pour éviter de surcharger le serveur"
+)
+
+retries = st.sidebar.number_input(
+    '🔁 Nouvelles tentatives par page',
+    min_value=0,
+    max_value=10,
+    value=DEFAULT_RETRIES,
+    help="Nombre de relances (backoff exponentiel) sur erreur réseau, 429 ou 5xx"
+)
+
+cache_mode = st.sidebar.selectbox(
+    '🗄️ Cache HTTP des pages',
+    options=['Désactivé', 'Activé', 'Hors ligne (rejouer le cache)'],
+    help="Réutiliser les pages déjà téléchargées (revalidation ETag/Last-Modified). "
+         "Le mode hors ligne rejoue uniquement les pages en cache, sans réseau."
+)
+
+response_cache = None
+if cache_mode != 'Désactivé':
+    cache_ttl = st.sidebar.number_input(
+        '⏱️ Durée de validité du cache (minutes)',
+        min_value=1,
+        max_value=7 * 24 * 60,
+        value=60,
+        help="En deçà, une page en cache est réutilisée sans requête"
+    )
+    response_cache = get_response_cache(cache_ttl, offline=cache_mode.startswith('Hors ligne'))
+
+incremental = st.sidebar.checkbox(
+    '🔁 Mode incrémental',
+    value=False,
+    help="S'arrêter à la première page ne contenant que des annonces déjà collectées "
+         "et n'ajouter que les nouvelles annonces aux fichiers CSV"
+)
+
 # Options principales
 choices = st.sidebar.selectbox(
     '🎯 Choisissez une option',
@@ -339,7 +750,7 @@ if choices == 'Télécharger données pré-scrapées':
     
     chaussures_homme_path = st.sidebar.text_input(
         'Chaussures Homme CSV',
-        value='data/chaussures_homme.csv',
+        value='data/chaussures_hommes.csv',
         help='Chemin vers le fichier CSV des chaussures homme'
     )
     
@@ -351,7 +762,7 @@ if choices == 'Télécharger données pré-scrapées':
     
     chaussures_enfants_path = st.sidebar.text_input(
         'Chaussures Enfants CSV',
-        value='data/chaussures_enfants.csv',
+        value='data/chaussures_enfant.csv',
         help='Chemin vers le fichier CSV des chaussures enfants'
     )
 
@@ -373,12 +784,7 @@ if choices == 'Scraper avec BeautifulSoup (nettoyage)':
     """, unsafe_allow_html=True)
     
     # URLs de base pour chaque catégorie
-    urls = {
-        'Vêtements Homme': 'https://sn.coinafrique.com/categorie/vetements-homme',
-        'Chaussures Homme': 'https://sn.coinafrique.com/categorie/chaussures-homme',
-        'Vêtements Enfants': 'https://sn.coinafrique.com/categorie/vetements-enfants',
-        'Chaussures Enfants': 'https://sn.coinafrique.com/categorie/chaussures-enfants'
-    }
+    urls = URLS
     
     # Créer les colonnes pour les boutons
     col1, col2 = st.columns(2)
@@ -388,14 +794,14 @@ if choices == 'Scraper avec BeautifulSoup (nettoyage)':
         st.markdown("### 👔 Vêtements Homme")
         if st.button('🚀 Scraper Vêtements Homme', key='scrape_vh', use_container_width=True):
             with st.spinner('Scraping en cours...'):
-                df = scrape_with_beautifulsoup(urls['Vêtements Homme'], 'Vêtements Homme', pages, clean_data=True)
+                df = scrape_with_beautifulsoup(urls['Vêtements Homme'], 'Vêtements Homme', pages, clean_data=True, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
                 if not df.empty:
                     st.success(f'✅ {len(df)} articles récupérés et nettoyés!')
                     st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
                     st.dataframe(df.head(), use_container_width=True)
                     
                     # Sauvegarder automatiquement
-                    if save_data_to_csv(df, 'vetements_homme_cleaned.csv'):
+                    if save_data_to_csv(df, 'vetements_homme_cleaned.csv', append=incremental):
                         st.success('💾 Données sauvegardées dans vetements_homme_cleaned.csv')
                     
                     # Bouton de téléchargement
@@ -414,14 +820,14 @@ if choices == 'Scraper avec BeautifulSoup (nettoyage)':
         st.markdown("### 👶 Vêtements Enfants")
         if st.button('🚀 Scraper Vêtements Enfants', key='scrape_ve', use_container_width=True):
             with st.spinner('Scraping en cours...'):
-                df = scrape_with_beautifulsoup(urls['Vêtements Enfants'], 'Vêtements Enfants', pages, clean_data=True)
+                df = scrape_with_beautifulsoup(urls['Vêtements Enfants'], 'Vêtements Enfants', pages, clean_data=True, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
                 if not df.empty:
                     st.success(f'✅ {len(df)} articles récupérés et nettoyés!')
                     st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
                     st.dataframe(df.head(), use_container_width=True)
                     
                     # Sauvegarder automatiquement
-                    if save_data_to_csv(df, 'vetements_enfants_cleaned.csv'):
+                    if save_data_to_csv(df, 'vetements_enfants_cleaned.csv', append=incremental):
                         st.success('💾 Données sauvegardées dans vetements_enfants_cleaned.csv')
                     
                     # Bouton de téléchargement
@@ -441,14 +847,14 @@ if choices == 'Scraper avec BeautifulSoup (nettoyage)':
         st.markdown("### 👞 Chaussures Homme")
         if st.button('🚀 Scraper Chaussures Homme', key='scrape_ch', use_container_width=True):
             with st.spinner('Scraping en cours...'):
-                df = scrape_with_beautifulsoup(urls['Chaussures Homme'], 'Chaussures Homme', pages, clean_data=True)
+                df = scrape_with_beautifulsoup(urls['Chaussures Homme'], 'Chaussures Homme', pages, clean_data=True, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
                 if not df.empty:
                     st.success(f'✅ {len(df)} articles récupérés et nettoyés!')
                     st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
                     st.dataframe(df.head(), use_container_width=True)
                     
                     # Sauvegarder automatiquement
-                    if save_data_to_csv(df, 'chaussures_homme_cleaned.csv'):
+                    if save_data_to_csv(df, 'chaussures_homme_cleaned.csv', append=incremental):
                         st.success('💾 Données sauvegardées dans chaussures_homme_cleaned.csv')
                     
                     # Bouton de téléchargement
@@ -467,14 +873,14 @@ if choices == 'Scraper avec BeautifulSoup (nettoyage)':
         st.markdown("### 👟 Chaussures Enfants")
         if st.button('🚀 Scraper Chaussures Enfants', key='scrape_ce', use_container_width=True):
             with st.spinner('Scraping en cours...'):
-                df = scrape_with_beautifulsoup(urls['Chaussures Enfants'], 'Chaussures Enfants', pages, clean_data=True)
+                df = scrape_with_beautifulsoup(urls['Chaussures Enfants'], 'Chaussures Enfants', pages, clean_data=True, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
                 if not df.empty:
                     st.success(f'✅ {len(df)} articles récupérés et nettoyés!')
                     st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
                     st.dataframe(df.head(), use_container_width=True)
                     
                     # Sauvegarder automatiquement
-                    if save_data_to_csv(df, 'chaussures_enfants_cleaned.csv'):
+                    if save_data_to_csv(df, 'chaussures_enfants_cleaned.csv', append=incremental):
                         st.success('💾 Données sauvegardées dans chaussures_enfants_cleaned.csv')
                     
                     # Bouton de téléchargement
@@ -489,6 +895,46 @@ if choices == 'Scraper avec BeautifulSoup (nettoyage)':
                 else:
                     st.warning('⚠️ Aucune donnée récupérée.')
 
+    # Reprendre les scrapings interrompus
+    show_interrupted_scrapes(clean_data=True, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
+
+    # Scraper toutes les catégories en parallèle
+    st.markdown("---")
+    st.markdown("### 🌐 Toutes les catégories")
+    if st.button('🚀 Scraper toutes les catégories', key='scrape_all', use_container_width=True):
+        with st.spinner('Scraping des 4 catégories en parallèle...'):
+            frames = scrape_all_categories(pages, clean_data=True, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
+
+        for category_name, df in frames.items():
+            if df.empty:
+                st.warning(f'⚠️ {category_name}: Aucune donnée récupérée.')
+                continue
+            filename = f'{FILE_PREFIXES[category_name]}_cleaned.csv'
+            if save_data_to_csv(df, filename, append=incremental):
+                st.success(f'✅ {category_name}: {len(df)} articles récupérés et nettoyés, sauvegardés dans {filename}')
+
+        all_data = [df for df in frames.values() if not df.empty]
+        if all_data:
+            combined_df = concat_listings(all_data)
+            st.success(f'🎉 Total combiné: {len(combined_df)} articles de {len(all_data)} catégories')
+            st.dataframe(combined_df.head(20), use_container_width=True)
+
+            csv_all = convert_df_to_csv(combined_df)
+            st.download_button(
+                label="📥 Télécharger toutes les données (CSV)",
+                data=csv_all,
+                file_name=f'coinafrique_all_cleaned_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+                mime='text/csv',
+                key='download_all'
+            )
+
+    # Tâches en arrière-plan (survivent aux reruns et sont partagées entre sessions)
+    st.markdown("### ⏳ Tâches en arrière-plan")
+    if st.button('🕒 Lancer toutes les catégories en arrière-plan', key='background_all', use_container_width=True):
+        job_id = get_job_manager().submit(URLS, pages, workers=workers, rate=rate, retries=retries, cache=response_cache, clean_data=True)
+        st.success(f'🕒 Tâche {job_id} lancée en arrière-plan')
+    show_background_jobs(key_suffix='')
+
 elif choices == 'Scraper avec Web Scraper (données brutes)':
     st.markdown("""
         <div style='background-color: #fff3cd; padding: 1rem; border-radius: 10px; margin: 1rem 0;'>
@@ -498,12 +944,7 @@ elif choices == 'Scraper avec Web Scraper (données brutes)':
     """, unsafe_allow_html=True)
     
     # URLs de base pour chaque catégorie
-    urls = {
-        'Vêtements Homme': 'https://sn.coinafrique.com/categorie/vetements-homme',
-        'Chaussures Homme': 'https://sn.coinafrique.com/categorie/chaussures-homme',
-        'Vêtements Enfants': 'https://sn.coinafrique.com/categorie/vetements-enfants',
-        'Chaussures Enfants': 'https://sn.coinafrique.com/categorie/chaussures-enfants'
-    }
+    urls = URLS
     
     # Créer les colonnes pour les boutons
     col1, col2 = st.columns(2)
@@ -513,14 +954,14 @@ elif choices == 'Scraper avec Web Scraper (données brutes)':
         st.markdown("### 👔 Vêtements Homme")
         if st.button('🚀 Scraper Vêtements Homme (Brut)', key='scrape_vh_raw', use_container_width=True):
             with st.spinner('Scraping en cours...'):
-                df = scrape_with_beautifulsoup(urls['Vêtements Homme'], 'Vêtements Homme', pages, clean_data=False)
+                df = scrape_with_beautifulsoup(urls['Vêtements Homme'], 'Vêtements Homme', pages, clean_data=False, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
                 if not df.empty:
                     st.success(f'✅ {len(df)} articles récupérés (données brutes)!')
                     st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
                     st.dataframe(df.head(), use_container_width=True)
                     
                     # Sauvegarder automatiquement
-                    if save_data_to_csv(df, 'vetements_homme_raw.csv'):
+                    if save_data_to_csv(df, 'vetements_homme_raw.csv', append=incremental):
                         st.success('💾 Données sauvegardées dans vetements_homme_raw.csv')
                     
                     # Bouton de téléchargement
@@ -539,14 +980,14 @@ elif choices == 'Scraper avec Web Scraper (données brutes)':
         st.markdown("### 👶 Vêtements Enfants")
         if st.button('🚀 Scraper Vêtements Enfants (Brut)', key='scrape_ve_raw', use_container_width=True):
             with st.spinner('Scraping en cours...'):
-                df = scrape_with_beautifulsoup(urls['Vêtements Enfants'], 'Vêtements Enfants', pages, clean_data=False)
+                df = scrape_with_beautifulsoup(urls['Vêtements Enfants'], 'Vêtements Enfants', pages, clean_data=False, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
                 if not df.empty:
                     st.success(f'✅ {len(df)} articles récupérés (données brutes)!')
                     st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
                     st.dataframe(df.head(), use_container_width=True)
                     
                     # Sauvegarder automatiquement
-                    if save_data_to_csv(df, 'vetements_enfants_raw.csv'):
+                    if save_data_to_csv(df, 'vetements_enfants_raw.csv', append=incremental):
                         st.success('💾 Données sauvegardées dans vetements_enfants_raw.csv')
                     
                     # Bouton de téléchargement
@@ -566,14 +1007,14 @@ elif choices == 'Scraper avec Web Scraper (données brutes)':
         st.markdown("### 👞 Chaussures Homme")
         if st.button('🚀 Scraper Chaussures Homme (Brut)', key='scrape_ch_raw', use_container_width=True):
             with st.spinner('Scraping en cours...'):
-                df = scrape_with_beautifulsoup(urls['Chaussures Homme'], 'Chaussures Homme', pages, clean_data=False)
+                df = scrape_with_beautifulsoup(urls['Chaussures Homme'], 'Chaussures Homme', pages, clean_data=False, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
                 if not df.empty:
                     st.success(f'✅ {len(df)} articles récupérés (données brutes)!')
                     st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
                     st.dataframe(df.head(), use_container_width=True)
                     
                     # Sauvegarder automatiquement
-                    if save_data_to_csv(df, 'chaussures_homme_raw.csv'):
+                    if save_data_to_csv(df, 'chaussures_homme_raw.csv', append=incremental):
                         st.success('💾 Données sauvegardées dans chaussures_homme_raw.csv')
                     
                     # Bouton de téléchargement
@@ -592,14 +1033,14 @@ elif choices == 'Scraper avec Web Scraper (données brutes)':
         st.markdown("### 👟 Chaussures Enfants")
         if st.button('🚀 Scraper Chaussures Enfants (Brut)', key='scrape_ce_raw', use_container_width=True):
             with st.spinner('Scraping en cours...'):
-                df = scrape_with_beautifulsoup(urls['Chaussures Enfants'], 'Chaussures Enfants', pages, clean_data=False)
+                df = scrape_with_beautifulsoup(urls['Chaussures Enfants'], 'Chaussures Enfants', pages, clean_data=False, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
                 if not df.empty:
                     st.success(f'✅ {len(df)} articles récupérés (données brutes)!')
                     st.info(f'📊 Dimensions: {df.shape[0]} lignes et {df.shape[1]} colonnes')
                     st.dataframe(df.head(), use_container_width=True)
                     
                     # Sauvegarder automatiquement
-                    if save_data_to_csv(df, 'chaussures_enfants_raw.csv'):
+                    if save_data_to_csv(df, 'chaussures_enfants_raw.csv', append=incremental):
                         st.success('💾 Données sauvegardées dans chaussures_enfants_raw.csv')
                     
                     # Bouton de téléchargement
@@ -614,6 +1055,46 @@ elif choices == 'Scraper avec Web Scraper (données brutes)':
                 else:
                     st.warning('⚠️ Aucune donnée récupérée.')
 
+    # Reprendre les scrapings interrompus
+    show_interrupted_scrapes(clean_data=False, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
+
+    # Scraper toutes les catégories en parallèle
+    st.markdown("---")
+    st.markdown("### 🌐 Toutes les catégories")
+    if st.button('🚀 Scraper toutes les catégories (Brut)', key='scrape_all_raw', use_container_width=True):
+        with st.spinner('Scraping des 4 catégories en parallèle...'):
+            frames = scrape_all_categories(pages, clean_data=False, workers=workers, rate=rate, retries=retries, incremental=incremental, cache=response_cache)
+
+        for category_name, df in frames.items():
+            if df.empty:
+                st.warning(f'⚠️ {category_name}: Aucune donnée récupérée.')
+                continue
+            filename = f'{FILE_PREFIXES[category_name]}_raw.csv'
+            if save_data_to_csv(df, filename, append=incremental):
+                st.success(f'✅ {category_name}: {len(df)} articles récupérés (données brutes), sauvegardés dans {filename}')
+
+        all_data = [df for df in frames.values() if not df.empty]
+        if all_data:
+            combined_df = concat_listings(all_data)
+            st.success(f'🎉 Total combiné: {len(combined_df)} articles de {len(all_data)} catégories')
+            st.dataframe(combined_df.head(20), use_container_width=True)
+
+            csv_all = convert_df_to_csv(combined_df)
+            st.download_button(
+                label="📥 Télécharger toutes les données (CSV)",
+                data=csv_all,
+                file_name=f'coinafrique_all_raw_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+                mime='text/csv',
+                key='download_all_raw'
+            )
+
+    # Tâches en arrière-plan (survivent aux reruns et sont partagées entre sessions)
+    st.markdown("### ⏳ Tâches en arrière-plan")
+    if st.button('🕒 Lancer toutes les catégories en arrière-plan (Brut)', key='background_all_raw', use_container_width=True):
+        job_id = get_job_manager().submit(URLS, pages, workers=workers, rate=rate, retries=retries, cache=response_cache, clean_data=False)
+        st.success(f'🕒 Tâche {job_id} lancée en arrière-plan')
+    show_background_jobs(key_suffix='_raw')
+
 elif choices == 'Télécharger données pré-scrapées':
     st.markdown("""
         <div style='background-color: #d1ecf1; padding: 1rem; border-radius: 10px; margin: 1rem 0;'>
@@ -733,7 +1214,7 @@ elif choices == 'Télécharger données pré-scrapées':
                 st.warning(f'⚠️ {category}: Aucune donnée trouvée')
         
         if all_data:
-            combined_df = pd.concat(all_data, ignore_index=True)
+            combined_df = concat_listings(all_data)
             st.success(f'🎉 Total combiné: {len(combined_df)} articles de {len(all_data)} catégories')
             st.dataframe(combined_df.head(20), use_container_width=True)
             
@@ -761,7 +1242,8 @@ elif choices == 'Dashboard des données nettoyées':
         options=[
             'Charger depuis fichiers CSV',
             'Utiliser données d\'exemple',
-            'Combiner toutes les sources'
+            'Combiner toutes les sources',
+            'Archive historique (par période)'
         ],
         help="Sélectionnez la source des données pour le dashboard"
     )
@@ -775,34 +1257,44 @@ elif choices == 'Dashboard des données nettoyées':
         use_ve = st.checkbox('Vêtements Enfants', value=True)
         use_ce = st.checkbox('Chaussures Enfants', value=True)
         
+        # Le clic est gardé en session : cocher / décocher un fichier met à jour le
+        # dashboard, servi depuis le cache mémoire
         if st.button('🚀 Générer Dashboard', key='generate_dashboard'):
-            dashboard_data = []
-            
-            if use_vh:
-                df_vh = load_data_from_csv('data/vetements_homme.csv')
-                if not df_vh.empty:
-                    dashboard_data.append(df_vh)
-            
-            if use_ch:
-                df_ch = load_data_from_csv('data/chaussures_homme.csv')
-                if not df_ch.empty:
-                    dashboard_data.append(df_ch)
-            
-            if use_ve:
-                df_ve = load_data_from_csv('data/vetements_enfants.csv')
-                if not df_ve.empty:
-                    dashboard_data.append(df_ve)
-            
-            if use_ce:
-                df_ce = load_data_from_csv('data/chaussures_enfants.csv')
-                if not df_ce.empty:
-                    dashboard_data.append(df_ce)
+            st.session_state['dashboard_csv'] = True
+        
+        if st.session_state.get('dashboard_csv'):
+            selected_files = [
+                path for path, use in (
+                    ('data/vetements_homme.csv', use_vh),
+                    ('data/chaussures_hommes.csv', use_ch),
+                    ('data/vetements_enfants.csv', use_ve),
+                    ('data/chaussures_enfant.csv', use_ce)
+                ) if use
+            ]
+            dashboard_data = {}
+            for path in selected_files:
+                df = load_data_from_csv(path)
+                if not df.empty:
+                    dashboard_data[path] = df
             
             if dashboard_data:
-                combined_df = pd.concat(dashboard_data, ignore_index=True)
-                # Nettoyer les données avant de créer le dashboard
-                cleaned_df = clean_scraped_data(combined_df)
-                create_dashboard(cleaned_df)
+                # Nettoyer les données avant de créer le dashboard (une fois par version des fichiers)
+                cache = get_dataset_cache()
+                cleaned_df = cache.get_or_compute(
+                    'cleaned', list(dashboard_data),
+                    lambda: clean_scraped_data(concat_listings(dashboard_data.values()))
+                )
+                summary = cache.get_or_compute(
+                    'summary', list(dashboard_data), lambda: summarize(cleaned_df), sizeof=summary_size
+                )
+                index = cache.get_or_compute(
+                    'index', list(dashboard_data), lambda: ListingIndex(cleaned_df), sizeof=lambda index: index.nbytes
+                )
+                stats = cache.get_or_compute(
+                    'stats', list(dashboard_data), lambda: selection_stats(list(dashboard_data), cleaned_df),
+                    sizeof=lambda stats: stats.nbytes
+                )
+                create_dashboard(cleaned_df, summary, index, stats)
             else:
                 st.warning('⚠️ Aucune donnée trouvée dans les fichiers sélectionnés.')
     
@@ -826,141 +1318,97 @@ elif choices == 'Dashboard des données nettoyées':
         cleaned_sample = clean_scraped_data(sample_data)
         create_dashboard(cleaned_sample)
     
-    else:  # Combiner toutes les sources
+    elif data_source == 'Combiner toutes les sources':
         st.markdown("### 📊 Dashboard combiné")
-        def create_dashboard(df):
-            """Créer un dashboard interactif adapté à l'application CoinAfrique"""
-            if df.empty:
-                st.warning('⚠️ Aucune donnée disponible pour le dashboard.')
-                return
-
-            st.markdown("""
-                <h2 style='text-align: center; color: #2E86AB; margin: 2rem 0;'>
-                    📊 DASHBOARD ANALYTIQUE
-                </h2>
-            """, unsafe_allow_html=True)
-
-            # 🔢 Métriques principales
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                st.metric("📝 Total articles", len(df))
-
-            with col2:
-                if 'prix_numerique' in df.columns and df['prix_numerique'].notna().any():
-                    st.metric("💰 Prix moyen", f"{df['prix_numerique'].mean():,.0f} FCFA")
-                else:
-                    st.metric("💰 Prix moyen", "N/A")
-
-            with col3:
-                if 'categorie' in df.columns:
-                    st.metric("🏷️ Catégories", df['categorie'].nunique())
-                else:
-                    st.metric("🏷️ Catégories", "N/A")
-
-            with col4:
-                if 'adresse' in df.columns:
-                    st.metric("🏙️ Villes", df['adresse'].nunique())
-                else:
-                    st.metric("🏙️ Villes", "N/A")
-
-            # 📈 Graphiques
+        
+        # Fichiers possibles : exports Web Scraper et données déjà nettoyées
+        possible_files = [
+            ("data/vetements_homme.csv", "Vêtements Homme"),
+            ("data/chaussures_hommes.csv", "Chaussures Homme"),
+            ("data/vetements_enfants.csv", "Vêtements Enfants"),
+            ("data/chaussures_enfant.csv", "Chaussures Enfants"),
+            ("data/vetements_homme_cleaned.csv", "Vêtements Homme (Nettoyées)"),
+            ("data/chaussures_homme_cleaned.csv", "Chaussures Homme (Nettoyées)"),
+            ("data/vetements_enfants_cleaned.csv", "Vêtements Enfants (Nettoyées)"),
+            ("data/chaussures_enfants_cleaned.csv", "Chaussures Enfants (Nettoyées)")
+        ]
+        
+        all_sources = {}
+        for filepath, category in possible_files:
+            if not os.path.exists(filepath):
+                continue
+            df = load_data_from_csv(filepath)
+            if not df.empty:
+                all_sources[filepath] = df
+                st.info(f'✅ {category}: {len(df)} articles chargés')
+        
+        if all_sources:
+            # Une même annonce figure souvent dans plusieurs sources : doublons exacts
+            # (ID d'annonce, image) et quasi-doublons (titre retouché) regroupés
+            from coinafrique.dedup import drop_duplicate_listings
+            cache = get_dataset_cache()
+            cleaned_combined, clusters = cache.get_or_compute(
+                'combined', list(all_sources),
+                lambda: drop_duplicate_listings(clean_scraped_data(concat_listings(all_sources.values()))),
+                sizeof=lambda result: sum(frame_size(frame) for frame in result)
+            )
+            
+            st.success(f'🎉 Dashboard généré avec {len(cleaned_combined)} articles uniques')
+            if not clusters.empty:
+                removed = int(clusters['taille'].sum()) - len(clusters)
+                with st.expander(f'🧬 {len(clusters)} groupes de doublons ({removed} annonces retirées)'):
+                    st.dataframe(clusters, use_container_width=True)
+            create_dashboard(cleaned_combined)
+        else:
+            st.warning('⚠️ Aucune donnée trouvée. Veuillez d\'abord scraper des données.')
+    
+    elif data_source == 'Archive historique (par période)':
+        from coinafrique.archive import last_days, latest_observations, price_trend
+        from coinafrique import charts
+        
+        archive = get_archive()
+        categories = archive.categories() if archive.enabled else []
+        if not archive.enabled:
+            st.warning('⚠️ Archive indisponible : pyarrow n\'est pas installé.')
+        elif not categories:
+            st.warning('⚠️ Archive vide : chaque scraping sauvegardé y est ajouté automatiquement.')
+        else:
             col1, col2 = st.columns(2)
-
             with col1:
-                if 'categorie' in df.columns:
-                    fig_cat = px.pie(
-                        df,
-                        names='categorie',
-                        title='Répartition par catégorie',
-                        color_discrete_sequence=px.colors.qualitative.Set3
-                    )
-                    fig_cat.update_layout(height=400)
-                    st.plotly_chart(fig_cat, use_container_width=True)
-
+                selected_categories = st.multiselect(
+                    'Catégories', categories, default=categories, key='archive_categories'
+                )
             with col2:
-                if 'adresse' in df.columns:
-                    top_villes = df['adresse'].value_counts().head(10)
-                    fig_villes = px.bar(
-                        x=top_villes.values,
-                        y=top_villes.index,
-                        orientation='h',
-                        title='Top 10 des villes',
-                        labels={'x': 'Nombre d\'articles', 'y': 'Ville'}
-                    )
-                    fig_villes.update_layout(height=400)
-                    st.plotly_chart(fig_villes, use_container_width=True)
-
-            # 📊 Analyse des prix
-            if 'prix_numerique' in df.columns and df['prix_numerique'].notna().any():
-                prix_valides = df.dropna(subset=['prix_numerique'])
-
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    if 'categorie' in df.columns:
-                        fig_box = px.box(
-                            prix_valides,
-                            x='categorie',
-                            y='prix_numerique',
-                            title='Distribution des prix par catégorie'
-                        )
-                        fig_box.update_layout(height=400)
-                        fig_box.update_xaxes(tickangle=45)
-                        st.plotly_chart(fig_box, use_container_width=True)
-
-                with col2:
-                    fig_hist = px.histogram(
-                        prix_valides,
-                        x='prix_numerique',
-                        nbins=30,
-                        title='Distribution des prix'
-                    )
-                    fig_hist.update_layout(height=400)
-                    st.plotly_chart(fig_hist, use_container_width=True)
-            if all_sources:
-                combined_df = pd.concat(all_sources, ignore_index=True).drop_duplicates()
-                cleaned_df = clean_scraped_data(combined_df)
-
-        if 'categorie' not in cleaned_df.columns:
-            st.warning("⚠️ La colonne 'categorie' est absente. Le dashboard ne peut pas être généré.")
-            st.dataframe(cleaned_df.head())
-        else:
-            create_dashboard(cleaned_df)  # 
-            
-
-            
-            # Fichiers possibles
-            base_path = "C:/Users/ZAGRE/OneDrive/Desktop/ZAGRE-Emmanuel-DC/data"
-
-            possible_files = [
-                (f"{base_path}/vetements_homme.csv", "Vêtements Homme"),
-                (f"{base_path}/chaussures_homme.csv", "Chaussures Homme"),
-                (f"{base_path}/vetements_enfants.csv", "Vêtements Enfants"),
-                (f"{base_path}/chaussures_enfants.csv", "Chaussures Enfants"),
-                (f"{base_path}/vetements_homme_cleaned.csv", "Vêtements Homme (Nettoyées)"),
-                (f"{base_path}/chaussures_homme_cleaned.csv", "Chaussures Homme (Nettoyées)"),
-                (f"{base_path}/vetements_enfants_cleaned.csv", "Vêtements Enfants (Nettoyées)"),
-                (f"{base_path}/chaussures_enfants_cleaned.csv", "Chaussures Enfants (Nettoyées)")
-            ]
-
+                period = st.selectbox('Période', list(ARCHIVE_PERIODS), index=1, key='archive_period')
+            days = ARCHIVE_PERIODS[period]
+            start, end = last_days(days) if days else (None, None)
             
-            for filepath, category in possible_files:
-                df = load_data_from_csv(filepath)
-                if not df.empty:
-                    all_sources.append(df)
-                    st.info(f'✅ {category}: {len(df)} articles chargés')
-            
-            if all_sources:
-                combined_df = pd.concat(all_sources, ignore_index=True)
-                # Supprimer les doublons
-                combined_df = combined_df.drop_duplicates()
-                cleaned_combined = clean_scraped_data(combined_df)
-                
-                st.success(f'🎉 Dashboard généré avec {len(cleaned_combined)} articles uniques')
-                create_dashboard(cleaned_combined)
+            # Seules les partitions des catégories et des jours choisis sont lues ;
+            # un nouveau scraping ajoute un fichier, donc une nouvelle clé de cache
+            files = [path for _, _, path in archive.partitions(selected_categories, start, end)]
+            if not files:
+                st.warning('⚠️ Aucun scraping archivé pour ces catégories sur cette période.')
             else:
-                st.warning('⚠️ Aucune donnée trouvée. Veuillez d\'abord scraper des données.')
+                paths = files + archive.index_files(selected_categories)
+                cache = get_dataset_cache()
+                history = cache.get_or_compute(
+                    'archive', paths, lambda: archive.read(selected_categories, start, end)
+                )
+                latest = cache.get_or_compute('archive_latest', paths, lambda: latest_observations(history))
+                summary = cache.get_or_compute(
+                    'archive_summary', paths, lambda: summarize(latest), sizeof=summary_size
+                )
+                index = cache.get_or_compute(
+                    'archive_index', paths, lambda: ListingIndex(latest), sizeof=lambda index: index.nbytes
+                )
+                
+                new_listings = int((latest['first_seen'] >= pd.Timestamp(start)).sum()) if start else len(latest)
+                st.info(f'🗂️ {len(files)} fichier(s) d\'archive lu(s) : {len(history)} observations, '
+                        f'{len(latest)} annonces distinctes dont {new_listings} apparue(s) sur la période')
+                trend = price_trend(history)
+                if trend['prix_median'].notna().any():
+                    st.plotly_chart(charts.price_trend(trend), use_container_width=True)
+                create_dashboard(latest, summary, index)
 
 else:  # Formulaire d'évaluation
     st.markdown("""
@@ -0,0 +1 @@
+"""Tests du paquet coinafrique (python -m pytest)"""
@@ -0,0 +1,19 @@
+"""Modules lourds absents au démarrage (voir benchmarks.bench_imports)
+
+Chaque cible est importée dans un interpréteur neuf : ni streamlit ni
+plotly pour la ligne de commande, ni graphiques ni scraping au premier
+chargement de l'application.
+"""
+import pytest
+
+from benchmarks.bench_imports import FORBIDDEN, forbidden_modules, run_target
+
+
+@pytest.mark.parametrize('target', sorted(FORBIDDEN))
+def test_no_forbidden_modules(target):
+    if target == 'app':
+        pytest.importorskip('streamlit')
+    _, modules, loaded = run_target(target)
+
+    assert modules
+    assert forbidden_modules(target, loaded) == []
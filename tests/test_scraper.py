@@ -0,0 +1,91 @@
+"""Scraping concurrent contre le serveur de pages de test (benchmarks.fixtures)"""
+import threading
+import time
+
+import pytest
+
+from benchmarks.fixtures import FixtureServer, build_pages
+from coinafrique.extract import get_extractor
+from coinafrique.scraper import iter_pages, page_url, scrape_category
+
+PAGES = 6
+CATEGORY = 'Fixtures'
+
+
+@pytest.fixture(scope='module')
+def pages():
+    return build_pages(PAGES)
+
+
+@pytest.fixture
+def server(pages):
+    with FixtureServer(pages, latency=0.02) as server:
+        yield server
+
+
+def expected_records(pages, count=PAGES):
+    """Annonces attendues des count premières pages, dans l'ordre des pages"""
+    extract = get_extractor()
+    return [record for html in pages[:count] for record in extract(html, CATEGORY)]
+
+
+def test_iter_pages_yields_in_page_order():
+    """Les pages sont restituées dans l'ordre même si les premières arrivent en dernier"""
+    finished = []
+    lock = threading.Lock()
+
+    def fetch(url):
+        page = int(url.rsplit('=', 1)[1])
+        time.sleep(0.02 * (PAGES - page))
+        with lock:
+            finished.append(page)
+        return url
+
+    results = list(iter_pages('http://fixtures', range(1, PAGES + 1), fetch, workers=PAGES))
+
+    assert [page for page, _, _ in results] == list(range(1, PAGES + 1))
+    assert [html for _, html, _ in results] == [page_url('http://fixtures', page) for page in range(1, PAGES + 1)]
+    assert finished != sorted(finished)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_scrape_category_keeps_page_order(server, pages, workers):
+    data, errors = scrape_category(server.url, CATEGORY, PAGES, workers=workers, rate=0)
+
+    assert errors == []
+    assert data == expected_records(pages)
+
+
+def test_progress_callbacks_once_per_page(server):
+    progress = []
+    seen_pages = []
+
+    scrape_category(
+        server.url, CATEGORY, PAGES, workers=4, rate=0,
+        progress_callback=lambda done, total: progress.append((done, total)),
+        page_callback=lambda page, records: seen_pages.append((page, len(records))),
+    )
+
+    assert progress == [(done, PAGES) for done in range(1, PAGES + 1)]
+    assert [page for page, _ in seen_pages] == list(range(1, PAGES + 1))
+    assert all(count > 0 for _, count in seen_pages)
+
+
+def test_stop_when_stops_pagination(server, pages):
+    progress = []
+    checked = []
+
+    def stop_when(records):
+        checked.append(len(records))
+        return len(checked) == 2
+
+    data, errors = scrape_category(
+        server.url, CATEGORY, PAGES, workers=1, rate=0, stop_when=stop_when,
+        progress_callback=lambda done, total: progress.append(done),
+    )
+
+    assert errors == []
+    assert data == expected_records(pages, count=2)
+    assert progress == [1, 2]
+    # Seules les pages soumises à l'avance (2 x workers) ont pu être demandées
+    assert len(server.requests) < PAGES